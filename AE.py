@@ -1,44 +1,67 @@
 # amplitude_estimation.py
-from qiskit import QuantumCircuit
-from qiskit.circuit.library import QFT
-from math import pi
+import sys
+
+from qiskit import transpile
+from qiskit_aer import AerSimulator
+
+from grover.builders import create_grover_diffuser, create_multi_target_oracle
+from grover import estimation
+from grover.store import NO_CACHE_FLAG, disable_store
 
 # Parámetros
 n = 4 # Qubits de búsqueda (registro de amplitud)
 t = 5 # Qubits de conteo (precisión)
 total_qubits = n + t
 
-def get_grover_operator(n):
-    # En AE, Q es el operador de Grover (Q = -Os * Oi)
-    # Por simplicidad, se usará el operador Q definido en el ejemplo de Grover
-    qc = QuantumCircuit(n)
-    # ... (Implementación del operador de Grover Q) ...
-    # Placeholder:
-    qc.z(0) 
-    return qc
-
-def ae_circuit(n, t):
-    qc = QuantumCircuit(n + t, t)
-    
-    # 1. Inicialización de los registros
-    qc.h(range(n)) # Superposición en el registro de búsqueda
-    qc.h(range(n, n + t)) # Superposición en el registro de conteo
-    
-    # 2. Aplicar Q^k controladamente
-    Q = get_grover_operator(n).to_instruction()
-    for k in range(t):
-        exponent = 2**k
-        for _ in range(exponent):
-            qc.append(Q.control(), [k + n] + list(range(n))) # Aplicar Q^k controlado por el qubit k+n
-
-    # 3. QFT Inversa
-    qc.append(QFT(t, inverse=True), range(n, n + t))
-
-    # 4. Medición del registro de conteo (t qubits)
-    qc.measure(range(n, n + t), range(t))
-    return qc
-
-circuit = ae_circuit(n, t)
-# Después de la medición, el valor 'y' medido se mapea a la amplitud α:
-# α ≈ sin(θ/2) donde θ = (2 * pi * y) / (2^t)
-# Ejecución similar al ejemplo anterior
+# Contraseñas marcadas por el oráculo: AE estima cuántas hay (M)
+target_states_decimal = [3, 5, 10]
+
+def get_grover_operator(n, targets=None):
+    # En AE, Q es el operador de Grover (Q = -Os * Oi): oráculo seguido del
+    # difusor, con la fase global -1 (ver grover.estimation)
+    if targets is None:
+        targets = target_states_decimal
+    oracle = create_multi_target_oracle(n, [x % 2**n for x in targets])
+    return estimation.grover_operator(oracle, create_grover_diffuser(n))
+
+def ae_circuit(n, t, targets=None, method='auto'):
+    # Estimación de fase de Q: las potencias Q^(2^k) controladas se arman por
+    # cuadrados sucesivos (o repitiendo Q controlado si Q es muy ancho)
+    return estimation.ae_circuit(get_grover_operator(n, targets), n, t, method)
+
+def estimate_mlae(n, targets=None, shots=256, seed=None):
+    # Alternativa sin qubits de conteo ni QFT: circuitos de Grover de n qubits
+    # con 0, 1, 2, 4, ... iteraciones (un solo trabajo) y ajuste clásico de M.
+    # Las claves medidas se verifican clásicamente contra las contraseñas.
+    if targets is None:
+        targets = target_states_decimal
+    targets = [x % 2**n for x in targets]
+    good = {format(x, f'0{n}b') for x in targets}
+    return estimation.mlae(n, good.__contains__, create_multi_target_oracle(n, targets),
+                           create_grover_diffuser(n), shots=shots, seed=seed)
+
+if __name__ == "__main__":
+    # --no-cache: simular de nuevo en lugar de usar el almacén en disco (grover.store)
+    if NO_CACHE_FLAG in sys.argv[1:]:
+        disable_store()
+    circuit = ae_circuit(n, t)
+    # Después de la medición, el valor 'y' medido se mapea a la amplitud:
+    # a = sin^2(pi * y / 2^t) y el número de soluciones es M = N * a
+    simulator = AerSimulator()
+    counts = simulator.run(transpile(circuit, simulator), shots=1024).result().get_counts()
+    estimate = estimation.decode_counts(counts, n, t)
+
+    print(f"Contraseñas marcadas: {target_states_decimal} (M real = {len(target_states_decimal)})")
+    print(f"y más frecuente: {estimate['y']} -> a = {estimate['amplitude']:.4f}")
+    print(f"M estimado: {estimate['num_solutions']:.2f} (± {estimate['error_bound']:.2f}), "
+          f"redondeado {estimate['num_solutions_rounded']}")
+
+    # Misma distribución sin simular el circuito (backend analítico)
+    analytic = estimation.decode_counts(
+        estimation.sample_ae_counts(n, len(target_states_decimal), t, seed=1), n, t)
+    print(f"M estimado (analítico): {analytic['num_solutions']:.2f}")
+
+    # MLAE: n qubits en lugar de n + t (memoria 2^t veces menor)
+    mlae_estimate = estimate_mlae(n)
+    print(f"M estimado (MLAE, esquema {mlae_estimate['schedule']}): "
+          f"{mlae_estimate['num_solutions']:.2f} (± {mlae_estimate['num_solutions_std']:.2f})")
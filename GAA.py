@@ -1,10 +1,14 @@
- GAA.py
-from qiskit import QuantumCircuit, transpile
-from qiskit_aer import AerSimulator
-from qiskit.visualization import plot_histogram
-import numpy as np
-import matplotlib.pyplot as plt
-from math import pi, floor, asin
+# GAA.py
+from qiskit import QuantumCircuit
+import sys
+
+from grover.builders import create_grover_diffuser, create_multi_target_oracle
+from grover.aggregate import ShotAggregator
+from grover.cache import default_cache, grover_iterate
+from grover.estimation import count_solutions, counted_iterations
+from grover.noise import get_simulator
+from grover.report import Reporter
+from grover.store import NO_CACHE_FLAG, disable_store
 
 # ======================================================================
 # 1. PARÁMETROS GLOBALES
@@ -12,63 +16,57 @@ from math import pi, floor, asin
 n = 4 # 4 qubits (N = 16 estados)
 target_decimal = 10 
 target_state_binary = format(target_decimal, f'0{n}b') # Target: 1010
-target_subspace = [target_state_binary]
+# Subespacio objetivo: todas las claves (binario, como las mide Qiskit) que marca el oráculo
+target_subspace = [target_state_binary, format(6, f'0{n}b'), format(15, f'0{n}b')]
 
 N = 2**n
-# Calculamos las iteraciones óptimas para Grover/GAA con superposición uniforme
-R = floor((pi / 4) * np.sqrt(N)) 
-
-print(f"Espacio de búsqueda (N): {N} estados")
-print(f"Contraseña objetivo (binario): {target_state_binary}")
-print(f"Iteraciones óptimas (R): {R}")
+# R ≈ (π/4)·sqrt(N/M): con M desconocido se estima antes con conteo cuántico
+# (ver get_iterations); floor((π/4)·sqrt(N)) solo vale para M = 1.
 
 # ======================================================================
 # 2. FUNCIONES: ORÁCULO DE OBJETIVO (O_G) y REFLEXIÓN INICIAL (O_chi)
 # ======================================================================
 
 def get_target_oracle(n, target_subspace):
-    """Oráculo de Fase (O_G): Marca el estado objetivo |target> con una fase de -1."""
-    qc = QuantumCircuit(n)
-    
-    # Target: 1010. Qubits 1 y 3 son '0', necesitan X. (Asumiendo orden q0q1q2q3)
-    qc.x([1, 3]) 
-    
-    # Apply MCZ (implementado como H + MCX + H)
-    control_qubits = list(range(n))
-    qc.h(n-1)
-    qc.mcx(control_qubits[:-1], n-1)
-    qc.h(n-1)
-    
-    # Deshacer las X
-    qc.x([1, 3])
-    return qc
+    """Oráculo de Fase (O_G): marca con una fase de -1 cada estado de `target_subspace`."""
+    # Una MCZ por clave del subespacio (con X sobre los qubits que son '0');
+    # grover.builders invierte el orden de bits para que coincida con la clave medida
+    return create_multi_target_oracle(n, [int(key, 2) for key in target_subspace])
 
 def get_initial_reflection_oracle(n):
     """
     Oráculo de Reflexión (O_chi): Refleja sobre el estado inicial |chi>.
     Para la inicialización con Hadamard, |chi> = |s>, y O_chi es el Difusor de Grover.
     """
-    qc_diffuser = QuantumCircuit(n)
-    
-    qc_diffuser.h(range(n))
-    qc_diffuser.x(range(n))
-    
-    # Apply MCZ for the state |11...1>
-    qc_diffuser.h(n-1)
-    qc_diffuser.mcx(list(range(n-1)), n-1)
-    qc_diffuser.h(n-1)
-    
-    qc_diffuser.x(range(n))
-    qc_diffuser.h(range(n))
-    
-    return qc_diffuser
+    return create_grover_diffuser(n)
+
+def get_iterations(n, target_subspace, shots=256, seed=None):
+    """
+    Conteo previo: estima M con estimación de fase sobre Q (sin usar el
+    contenido de target_subspace) y devuelve (R, estimación).
+    """
+    estimate = count_solutions(get_target_oracle(n, target_subspace),
+                               get_initial_reflection_oracle(n), n, shots=shots, seed=seed)
+    return counted_iterations(n, estimate), estimate
 
 # ======================================================================
 #  3. CONSTRUCCIÓN Y EJECUCIÓN DEL ALGORITMO
 # ======================================================================
 
-def gaa_circuit(n, target_subspace, iterations):
-    """Construye el circuito GAA (Q = - O_chi * O_G)"""
+def gaa_circuit(n, target_subspace, iterations, backend=None):
+    """
+    Construye el circuito GAA (Q = - O_chi * O_G)
+
+    Si se pasa `backend`, devuelve el circuito ya compilado: la iteración GAA
+    se transpila una sola vez (caché) y se compone `iterations` veces.
+    """
+    if backend is not None:
+        return default_cache.grover_circuit(
+            n, ('gaa', tuple(target_subspace)),
+            lambda: grover_iterate(get_target_oracle(n, target_subspace),
+                                   get_initial_reflection_oracle(n)),
+            iterations, backend)
+
     qc = QuantumCircuit(n, n)
     
     # Inicialización: Estado inicial |chi> = |s>
@@ -88,29 +86,40 @@ def gaa_circuit(n, target_subspace, iterations):
     qc.measure(range(n), range(n))
     return qc
 
-# --- Ejecución ---
-circuit = gaa_circuit(n, target_subspace, R)
-backend = AerSimulator()
-shots = 1024 
+if __name__ == "__main__":
+    # --no-cache: simular de nuevo en lugar de usar el almacén en disco (grover.store)
+    if NO_CACHE_FLAG in sys.argv[1:]:
+        disable_store()
+    print(f"Espacio de búsqueda (N): {N} estados")
+    print(f"Subespacio objetivo (binario): {target_subspace}")
+
+    R, estimate = get_iterations(n, target_subspace)
+    print(f"Conteo cuántico (t={estimate['t']}): M ≈ {estimate['num_solutions']:.2f} "
+          f"-> {estimate['num_solutions_rounded']} soluciones")
+    print(f"Iteraciones óptimas (R): {R}")
 
-t_circuit = transpile(circuit, backend)
-job = backend.run(t_circuit, shots=shots)
-result = job.result()
-counts = result.get_counts()
+    # --- Ejecución ---
+    backend = get_simulator('ideal')
+    t_circuit = gaa_circuit(n, target_subspace, R, backend)
+    shots = 1024 
 
-# --- Análisis de Resultados ---
-measured_key_binary = max(counts, key=counts.get)
-measured_key_decimal = int(measured_key_binary, 2)
-probability_of_target = counts.get(target_state_binary, 0) / shots
+    job = backend.run(t_circuit, shots=shots)
+    result = job.result()
+    tally = ShotAggregator(n, [int(key, 2) for key in target_subspace]).add_result(result)
 
-print("\n" + "="*40)
-print("Resultados de la Amplificación de Amplitud Generalizada (GAA):")
-print("="*40)
-print(f"Contraseña objetivo (Decimal): **{target_decimal}**")
-print(f"Clave más probable medida (Binario): **{measured_key_binary}**")
-print(f"Clave más probable medida (Decimal): **{measured_key_decimal}**")
-print(f"Probabilidad de éxito: {probability_of_target*100:.2f}%")
+    # --- Análisis de Resultados ---
+    measured_key_decimal = tally.most_frequent()
+    measured_key_binary = tally.key(measured_key_decimal)
+    probability_of_target = tally.target_probability()
 
-plot_histogram(counts, title='Resultados de GAA (Target: 1010)')
-plt.show()
+    print("\n" + "="*40)
+    print("Resultados de la Amplificación de Amplitud Generalizada (GAA):")
+    print("="*40)
+    print(f"Contraseñas objetivo (Decimal): **{[int(key, 2) for key in target_subspace]}**")
+    print(f"Clave más probable medida (Binario): **{measured_key_binary}**")
+    print(f"Clave más probable medida (Decimal): **{measured_key_decimal}**")
+    print(f"Probabilidad de medir el subespacio objetivo: {probability_of_target*100:.2f}%")
 
+    # Histograma opcional (GROVER_REPORT), guardado en segundo plano
+    with Reporter() as report:
+        report.histogram('gaa_histograma', tally, title=f'Resultados de GAA (Targets: {target_subspace})')
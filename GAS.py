@@ -1,8 +1,19 @@
 # GAS.py
-from qiskit import QuantumCircuit, transpile
 from qiskit_aer import AerSimulator
 import numpy as np
-from math import floor, pi
+from math import ceil, floor, pi, sqrt
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import multiprocessing
+import sys
+import time
+
+from grover.aggregate import ShotAggregator
+from grover.batch import iterate_key
+from grover.builders import create_grover_diffuser, create_oracle, oracle_bits
+from grover.cache import default_cache, grover_iterate
+from grover.exact import exact_run
+from grover.sequential import SequentialSampler, backend_draw, sequential_run
+from grover.store import NO_CACHE_FLAG, disable_store
 
 # ======================================================================
 # 1. PARÁMETROS GLOBALES
@@ -13,59 +24,20 @@ target_state_decimal = 73
 target_state_binary = format(target_state_decimal, f'0{n}b')
 
 # ======================================================================
-#  2. FUNCIONES: ORÁCULO Y DIFUSOR (Incluidas para evitar errores de importación)
-# ======================================================================
-
-def create_oracle(n, target_state_binary):
-    """Crea un oráculo que aplica una fase de -1 al estado objetivo."""
-    qc_oracle = QuantumCircuit(n)
-    
-    # 1. Aplicar X a los qubits que son '0' en el estado objetivo.
-    for i, bit in enumerate(target_state_binary):
-        if bit == '0':
-            qc_oracle.x(i)
-
-    # 2. Aplicar la compuerta Z controlada por todos los qubits (MCZ)
-    control_qubits = list(range(n))
-    qc_oracle.h(n-1)
-    qc_oracle.mcx(control_qubits[:-1], n-1)
-    qc_oracle.h(n-1)
-
-    # 3. Deshacer la aplicación de X.
-    for i, bit in enumerate(target_state_binary):
-        if bit == '0':
-            qc_oracle.x(i)
-
-    return qc_oracle
-
-def create_grover_diffuser(n):
-    """Crea el operador de difusión de Grover (inversión alrededor de la media)."""
-    qc_diffuser = QuantumCircuit(n)
-    
-    # D = H^n * O_0 * H^n
-    qc_diffuser.h(range(n))
-    qc_diffuser.x(range(n))
-    
-    # Aplicar MCZ para el estado |11...1>
-    qc_diffuser.h(n-1)
-    qc_diffuser.mcx(list(range(n-1)), n-1)
-    qc_diffuser.h(n-1)
-    
-    qc_diffuser.x(range(n))
-    qc_diffuser.h(range(n))
-    
-    return qc_diffuser
-
-# ======================================================================
-# 3. ALGORITMO DE BÚSQUEDA ADAPTATIVA
+# 2. ALGORITMO DE BÚSQUEDA ADAPTATIVA
 # ======================================================================
 
-def grover_adaptive_search(n, target_state_binary):
+def grover_adaptive_search(n, target_state_binary, exact=False):
     """
     Implementa el Algoritmo de Búsqueda Adaptativa de Grover (GAS).
     Utiliza una secuencia creciente de iteraciones (2^k) hasta encontrar la solución.
+    Con exact=True cada intento es una sola evolución sin shots (grover.exact):
+    P(target) exacta en lugar de estimada.
     """
-    oracle = create_oracle(n, target_state_binary)
+    # El bit i de la cadena del oráculo es el qubit i: oracle_bits la invierte
+    # para que marque el entero `target` (la clave medida target_state_binary)
+    target = int(target_state_binary, 2)
+    oracle = create_oracle(n, oracle_bits(target, n))
     diffuser = create_grover_diffuser(n)
     
     # Convertimos los circuitos a instrucciones una sola vez
@@ -77,6 +49,9 @@ def grover_adaptive_search(n, target_state_binary):
     max_k = 12 # Límite de intentos (2^12 > 4*sqrt(128))
     
     print(f"Iniciando Búsqueda Adaptativa para la contraseña: {target_state_binary} (Decimal: {target_state_decimal})")
+
+    # Un solo simulador para todos los intentos
+    backend = AerSimulator()
     
     while k < max_k:
         # R_k: Número de iteraciones en este paso. Usamos 2^k.
@@ -85,34 +60,35 @@ def grover_adaptive_search(n, target_state_binary):
         # El número óptimo de iteraciones es R ≈ 11.
         # Si R_k es mucho mayor que 11, la probabilidad caerá.
 
-        # Construir el circuito para R_k iteraciones
-        qc = QuantumCircuit(n, n)
-        qc.h(range(n))
-
-        for _ in range(R_k):
-            qc.append(oracle_inst, range(n))
-            qc.append(diffuser_inst, range(n))
+        # Construir el circuito para R_k iteraciones. La iteración se
+        # transpila una sola vez (caché) y se compone R_k veces.
+        qc = default_cache.grover_circuit(
+            n, iterate_key(create_oracle, create_grover_diffuser, oracle_bits(target, n), n),
+            lambda: grover_iterate(oracle_inst, diffuser_inst),
+            R_k, backend)
 
-        qc.measure(range(n), range(n))
-
-        # Ejecutar y verificar
-        backend = AerSimulator()
-        # Solo necesitamos 1 shot para verificar, pero usamos 100 para estabilidad del simulador
-        shots = 100 
-
-        job = backend.run(transpile(qc, backend), shots=shots) 
-        result = job.result()
-        counts = result.get_counts()
+        if exact:
+            # Una evolución: la decisión P(target) > 0.5 es determinista
+            tally, = exact_run(backend, [qc], n, [[target]])
+            run = {'decision': tally.target_probability() > 0.5, 'shots': 0}
+        else:
+            # Ejecutar y verificar: shots en tandas (8, 8, 16, ...) hasta que la
+            # cota de confianza decide si P(target) > 0.5, con 100 como máximo
+            run = sequential_run(backend, qc, n, [target],
+                                 rule='threshold', threshold=0.5, max_shots=100)
+            tally = run['aggregator']
 
         # La solución se considera "encontrada" si es la más probable
-        measured_state = max(counts, key=counts.get)
-        probability_of_target = counts.get(target_state_binary, 0) / shots
+        measured = tally.most_frequent()
+        measured_state = tally.key(measured)
+        probability_of_target = tally.target_probability()
 
-        print(f"Intento k={k}, R={R_k} iteraciones. Más probable: {measured_state}. Probabilidad de Target: {probability_of_target:.2f}")
+        print(f"Intento k={k}, R={R_k} iteraciones. Más probable: {measured_state}. "
+              f"Probabilidad de Target: {probability_of_target:.2f} ({run['shots']} shots)")
 
         # La condición de éxito en un simulador perfecto es si la probabilidad es alta
         # Usamos la condición original de GAS: si la medición fue la target
-        if measured_state == target_state_binary and probability_of_target > 0.5:
+        if run['decision'] or (measured == target and probability_of_target > 0.5):
              print(f"\n Solución encontrada en la iteración adaptativa k={k} con R={R_k}!")
              return measured_state
 
@@ -121,6 +97,190 @@ def grover_adaptive_search(n, target_state_binary):
     print("\n Límite de intentos alcanzado sin encontrar la solución con alta probabilidad.")
     return None 
 
+# ======================================================================
+# 3. BÚSQUEDA ADAPTATIVA EN PARALELO CON CANCELACIÓN TEMPRANA
+# ======================================================================
+
+# Simulador "caliente" de cada proceso del pool (se crea una sola vez)
+_backend = None
+# Evento compartido por el pool: se enciende cuando un intento tuvo éxito
+_cancelled = None
+
+class AttemptCancelled(Exception):
+    """Otro intento ya encontró la solución."""
+
+def _init_attempt_worker(cancelled):
+    global _cancelled
+    _cancelled = cancelled
+
+def _check_cancelled():
+    if _cancelled is not None and _cancelled.is_set():
+        raise AttemptCancelled
+
+def _run_attempt(n, target_state_binary, R_k, shots, seed):
+    """
+    Ejecuta un intento con R_k iteraciones (dentro de un proceso del pool).
+    Con shots=0 el intento es exacto: una evolución sin muestreo (grover.exact).
+    Si otro intento ya tuvo éxito se abandona antes de simular y entre tandas
+    del muestreo secuencial, y devuelve {'cancelled': True, ...}.
+    """
+    start = time.perf_counter()
+    try:
+        return _attempt(n, target_state_binary, R_k, shots, seed, start)
+    except AttemptCancelled:
+        return {'R': R_k, 'measured': None, 'measured_binary': None, 'oracle_calls': 0,
+                'cancelled': True, 'wall_time': time.perf_counter() - start}
+
+def _attempt(n, target_state_binary, R_k, shots, seed, start):
+    global _backend
+    _check_cancelled()
+    if _backend is None:
+        _backend = AerSimulator()
+
+    target = int(target_state_binary, 2)
+    qc = default_cache.grover_circuit(
+        n, iterate_key(create_oracle, create_grover_diffuser, oracle_bits(target, n), n),
+        lambda: grover_iterate(create_oracle(n, oracle_bits(target, n)), create_grover_diffuser(n)),
+        R_k, _backend)
+    _check_cancelled()
+    if shots == 0:
+        tally, = exact_run(_backend, [qc], n, [[target]])
+    elif shots > 1:
+        # Muestreo secuencial: se corta en cuanto se decide P(target) > 0.5 (o
+        # en cuanto otro intento tuvo éxito, antes de la tanda siguiente)
+        draw = backend_draw(_backend, qc, seed)
+        def cancellable_draw(aggregator, batch, look):
+            _check_cancelled()
+            draw(aggregator, batch, look)
+        run = SequentialSampler(cancellable_draw, n, [target],
+                                max_shots=shots).run(rule='threshold', threshold=0.5)
+        tally, shots = run['aggregator'], run['shots']
+    else:
+        result = _backend.run(qc, shots=shots, seed_simulator=seed).result()
+        tally = ShotAggregator(n, [target]).add_result(result)
+
+    return {
+        'R': R_k,
+        'shots': shots,
+        'measured': tally.most_frequent(),
+        'measured_binary': tally.key(tally.most_frequent()),
+        'probability': tally.target_probability(),
+        'oracle_calls': R_k * max(shots, 1),
+        'wall_time': time.perf_counter() - start,
+    }
+
+def iteration_schedule(n, schedule, rng, max_attempts):
+    """
+    Genera los R de cada intento.
+
+    - 'doubling': 1, 2, 4, 8, ... (la estrategia original de GAS).
+    - 'bbht': esquema aleatorio de Boyer-Brassard-Høyer-Tapp para un número
+      desconocido de soluciones: R uniforme en [0, m) con m creciendo un
+      factor 6/5 después de cada intento, acotado por sqrt(N).
+    """
+    if schedule == 'doubling':
+        for k in range(max_attempts):
+            yield 2**k
+    elif schedule == 'bbht':
+        m, lam, limit = 1.0, 6 / 5, sqrt(2**n)
+        for _ in range(max_attempts):
+            yield int(rng.integers(0, ceil(m)))
+            m = min(lam * m, limit)
+    else:
+        raise ValueError(f"Estrategia desconocida: {schedule}")
+
+def grover_adaptive_search_parallel(n, target_state_binary, workers=4, schedule='bbht',
+                                    shots=None, max_attempts=None, seed=None):
+    """
+    Búsqueda adaptativa que lanza varios R candidatos a la vez en un pool de
+    procesos y cancela el trabajo pendiente en cuanto uno tiene éxito: los
+    intentos en curso ven un evento compartido y se abandonan antes de su
+    próxima tanda (un backend.run ya lanzado termina esa tanda).
+
+    Con 'bbht' basta 1 shot por intento: el resultado medido se comprueba
+    clásicamente contra el objetivo. Con 'doubling' se mantiene la condición
+    original (más probable y probabilidad > 0.5), con muestreo secuencial
+    de hasta `shots` shots por intento, o exacta con shots=0.
+    """
+    if shots is None:
+        shots = 1 if schedule == 'bbht' else 100
+    if max_attempts is None:
+        max_attempts = 64 if schedule == 'bbht' else 12
+
+    rng = np.random.default_rng(seed)
+    pending_R = iteration_schedule(n, schedule, rng, max_attempts)
+
+    target = int(target_state_binary, 2)
+
+    def succeeded(attempt):
+        if attempt.get('cancelled'):
+            return False
+        if schedule == 'bbht':
+            return attempt['measured'] == target
+        return attempt['measured'] == target and attempt['probability'] > 0.5
+
+    start = time.perf_counter()
+    attempts = []
+    solution = None
+    # 'spawn': hacer fork de un proceso que ya usó Aer (OpenMP) puede bloquearse
+    context = multiprocessing.get_context('spawn')
+    cancelled = context.Event()
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                               initializer=_init_attempt_worker, initargs=(cancelled,))
+    try:
+        running = set()
+
+        def submit_next():
+            R_k = next(pending_R, None)
+            if R_k is not None:
+                attempt_seed = int(rng.integers(2**31))
+                running.add(pool.submit(_run_attempt, n, target_state_binary, R_k, shots, attempt_seed))
+
+        for _ in range(workers):
+            submit_next()
+
+        while running and solution is None:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                attempt = future.result()
+                attempt['success'] = succeeded(attempt)
+                attempts.append(attempt)
+                print(f"Intento {len(attempts)}: R={attempt['R']}, medido {attempt['measured_binary']}, "
+                      f"llamadas al oráculo {attempt['oracle_calls']}, {attempt['wall_time']*1000:.1f} ms")
+                if attempt['success']:
+                    solution = attempt['measured_binary']
+                else:
+                    submit_next()
+    finally:
+        # Cancelación temprana: los intentos en curso ven el evento antes de
+        # su próxima simulación y los que aún no empezaron se descartan
+        cancelled.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    report = {
+        'solution': solution,
+        'attempts': attempts,
+        'oracle_calls': sum(a['oracle_calls'] for a in attempts),
+        'wall_time': time.perf_counter() - start,
+    }
+    if solution is None:
+        print("\n Límite de intentos alcanzado sin encontrar la solución.")
+    else:
+        print(f"\n Solución {solution} encontrada tras {len(attempts)} intentos, "
+              f"{report['oracle_calls']} llamadas al oráculo y {report['wall_time']:.2f} s.")
+    return report
+
 # --- Ejecución ---
-solution = grover_adaptive_search(n, target_state_binary)
-print(f"\nResultado final: Contraseña {target_state_decimal} (Binario: {solution})")
+if __name__ == "__main__":
+    # --no-cache: simular de nuevo en lugar de usar el almacén en disco (grover.store)
+    if NO_CACHE_FLAG in sys.argv[1:]:
+        disable_store()
+    solution = grover_adaptive_search(n, target_state_binary)
+    print(f"\nResultado final: Contraseña {target_state_decimal} (Binario: {solution})")
+
+    # Mismo recorrido con probabilidades exactas (sin shots)
+    solution = grover_adaptive_search(n, target_state_binary, exact=True)
+    print(f"\nResultado final: Contraseña {target_state_decimal} (Binario: {solution})")
+
+    report = grover_adaptive_search_parallel(n, target_state_binary, workers=4, schedule='bbht', seed=7)
+    print(f"\nResultado final (paralelo, BBHT): Contraseña {target_state_decimal} (Binario: {report['solution']})")
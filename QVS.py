@@ -1,9 +1,10 @@
 from qiskit import QuantumCircuit, transpile
 from qiskit.circuit import ParameterVector, Parameter
 from qiskit_aer import AerSimulator
-from qiskit.quantum_info import Pauli, SparsePauliOp
+from qiskit.quantum_info import Pauli, SparsePauliOp, Statevector
 import numpy as np
-import matplotlib.pyplot as plt
+
+from grover.variational import VariationalSearch, adam, target_projector
 
 # PARÁMETROS GLOBALES
 
@@ -41,10 +42,28 @@ def vqs_implementation(n, num_params):
     theta = ParameterVector('θ', num_params)
     ansatz = create_ansatz(n, theta)
 
-    target_op = SparsePauliOp(Pauli('I' * n), coeffs=[1])
+    # 2. Observable: proyector sobre el estado objetivo (costo = 1 - <Π>)
+    target_op = target_projector(n, target_decimal)
 
     print(f"Ansatz VQS creado con {num_params} parámetros.")
     return ansatz, target_op
 
-# --- Inicialización del VQS ---
-ansatz, hamiltonian = vqs_implementation(n, num_params)
+def vqs_search(n, shots=1024, optimizer=adam, seed=None):
+    # El ansatz se transpila una vez; el costo y los puntos del gradiente
+    # (parameter-shift) se evalúan asignando parámetros en un solo trabajo
+    ansatz, target_op = vqs_implementation(n, num_params)
+    search = VariationalSearch(ansatz, target_decimal, shots=shots, seed=seed)
+    result = search.run(optimizer=optimizer)
+    # Verificación exacta con el observable
+    bound = ansatz.assign_parameters(dict(zip(search.parameters, result['x'])))
+    result['exact_probability'] = float(Statevector(bound).expectation_value(target_op).real)
+    return result
+
+if __name__ == "__main__":
+    # --- Inicialización y optimización del VQS ---
+    result = vqs_search(n, seed=7)
+
+    print(f"Objetivo: {target_state_binary} ({target_decimal})")
+    print(f"Iteraciones del optimizador: {result['nit']}, trabajos: {result['jobs']}, "
+          f"circuitos evaluados: {result['circuit_evaluations']} (transpilado una vez)")
+    print(f"P(objetivo) medida: {result['probability']:.4f}, exacta: {result['exact_probability']:.4f}")
@@ -1,43 +1,96 @@
 # quantum_walk.py
-from qiskit import QuantumCircuit
-# QWS requiere la definición de un grafo y un coin operator.
-# Aquí solo definimos la estructura del circuito.
+import sys
+import time
+
+from qiskit import transpile
+
+from grover.aggregate import ShotAggregator
+from grover.iterations import plan_iterations
+from grover.noise import get_simulator
+from grover.runner import run as grover_run
+from grover.store import NO_CACHE_FLAG, disable_store
+from grover.walk import coin_step, hitting_time, make_graph, walk_circuit
+# QWS requiere la definición de un grafo y un coin operator: los grafos
+# (hipercubo y ciclo), la moneda y el desplazamiento viven en grover.walk.
 
 # Parámetros
-n_nodes = 3 # Qubits para los nodos (8 nodos)
-n_coin = 1  # Qubit para la moneda (Hadamard coin)
-total_qubits = n_nodes + n_coin
-
-def coin_operator(qc, n_nodes):
-    # Ejemplo de Hadamard coin en el qubit auxiliar
-    qc.h(n_nodes) 
-    return qc
-
-def shift_operator(qc, n_nodes, n_coin):
-    # Depende de la estructura del grafo. 
-    # Para una línea, es un CNOT controlado por la moneda.
-    # Aquí, una implementación placeholder:
-    # Si coin=0, mueve a un lado. Si coin=1, mueve al otro.
-    qc.cx(n_coin, 0)
-    # Más complejas compuertas controladas se usarían para grafos 
-    # más grandes (requiere Toffolis, etc.)
-    return qc
-
-def qws_circuit(n_nodes, n_coin, steps):
-    qc = QuantumCircuit(n_nodes + n_coin, n_nodes)
-    
-    # Inicialización del espacio de búsqueda y la moneda
-    qc.h(range(n_nodes)) # Superposición inicial de nodos
-    qc.x(n_nodes) # Inicializa la moneda en |1> (o H en |0> si es Hadamard)
-    qc.h(n_nodes)
-    
-    for _ in range(steps):
-        coin_operator(qc, n_nodes)
-        shift_operator(qc, n_nodes, n_coin)
-
-    qc.measure(range(n_nodes), range(n_nodes))
-    return qc
-
-# steps = Número de pasos (análogo a R en Grover)
-circuit = qws_circuit(n_nodes, n_coin, steps=10)
-# Ejecución similar al ejemplo anterior
+n_nodes = 4 # Qubits para los nodos (hipercubo de dimensión 4: 16 nodos)
+n_coin = 2  # Qubits para la moneda (4 direcciones)
+target_decimal = 11 # Nodo marcado
+num_ancillas = 2 # Ancillas limpias para las MCX del paso
+total_qubits = n_nodes + n_coin + num_ancillas
+
+def coin_operator(qc, graph, nodes, coin, target, ancillas):
+    # Moneda de Grover (o Hadamard en el ciclo) en los nodos no marcados y
+    # -I en el marcado
+    return coin_step(qc, graph, nodes, coin, target, ancillas)
+
+def shift_operator(qc, graph, nodes, coin, ancillas):
+    # Depende de la estructura del grafo: en el hipercubo la moneda elige qué
+    # bit del nodo se invierte; en el ciclo suma o resta 1 (incremento con MCX)
+    return graph.shift(qc, nodes, coin, ancillas)
+
+def qws_circuit(n_nodes, n_coin, steps, graph=None, target=None, num_ancillas=num_ancillas):
+    # Con 1 qubit de moneda el grafo por defecto es el ciclo; si no, el hipercubo
+    if graph is None:
+        graph = 'cycle' if n_coin == 1 else 'hypercube'
+    graph = make_graph(graph, n_nodes)
+    if graph.coin_qubits != n_coin:
+        raise ValueError(f"{graph} necesita {graph.coin_qubits} qubits de moneda, no {n_coin}")
+    if target is None:
+        target = target_decimal % graph.num_nodes
+    return walk_circuit(graph, target, steps, num_ancillas)
+
+def compare_with_grover(dimensions=(2, 4, 8), shots=1024):
+    # Hipercubos de dimensión d frente a Grover con la misma cantidad de
+    # qubits (nodos + moneda + ancillas) y Grover sobre los mismos 2^d nodos
+    backend = get_simulator('ideal')
+    print(f"{'grafo':>30} {'qubits':>6} {'pasos':>6} {'P(walk)':>8} {'t walk':>8}"
+          f" | {'R':>4} {'P(Grover)':>9} {'t Grover':>8} | {'R (2^d)':>7}")
+    for d in dimensions:
+        graph = make_graph('hypercube', d)
+        target = target_decimal % graph.num_nodes
+        hit = hitting_time(graph, target)
+
+        start = time.perf_counter()
+        qc = walk_circuit(graph, target, hit['steps'], num_ancillas)
+        tally = ShotAggregator(d, [target]).add_result(
+            backend.run(transpile(qc, backend), shots=shots, seed_simulator=7).result())
+        walk_time = time.perf_counter() - start
+
+        # Grover con la misma cantidad de qubits (búsqueda = nodos + moneda)
+        search_qubits = d + graph.coin_qubits
+        start = time.perf_counter()
+        row = grover_run(search_qubits, target, shots=shots, num_ancillas=num_ancillas, seed=7)
+        grover_time = time.perf_counter() - start
+
+        print(f"{str(graph):>30} {qc.num_qubits:>6} {hit['steps']:>6} {tally.target_probability():>8.3f}"
+              f" {walk_time:>7.2f}s | {row['iterations']:>4} {row['probability']:>9.3f} {grover_time:>7.2f}s"
+              f" | {plan_iterations(d)['iterations']:>7}")
+
+if __name__ == "__main__":
+    # --no-cache: simular de nuevo en lugar de usar el almacén en disco (grover.store)
+    if NO_CACHE_FLAG in sys.argv[1:]:
+        disable_store()
+    # steps = Número de pasos (análogo a R en Grover): el tiempo de impacto
+    # se calcula con el backend analítico (scipy.sparse), sin simular circuitos
+    graph = make_graph('hypercube', n_nodes)
+    hit = hitting_time(graph, target_decimal)
+    print(f"{graph}: nodo marcado {target_decimal}, tiempo de impacto {hit['steps']} pasos "
+          f"(P = {hit['probability']:.3f})")
+
+    circuit = qws_circuit(n_nodes, n_coin, steps=hit['steps'])
+    backend = get_simulator('ideal')
+    result = backend.run(transpile(circuit, backend), shots=1024).result()
+    tally = ShotAggregator(n_nodes, [target_decimal]).add_result(result)
+    print(f"Nodo más frecuente: {tally.most_frequent()}, P(marcado) medida: {tally.target_probability():.3f}")
+
+    # Grafos grandes solo con el backend analítico
+    for d in (10, 12, 14):
+        start = time.perf_counter()
+        big = hitting_time(make_graph('hypercube', d), 0)
+        print(f"Hipercubo d={d} (analítico): {big['steps']} pasos, P = {big['probability']:.3f}, "
+              f"{time.perf_counter() - start:.2f} s")
+
+    print()
+    compare_with_grover()
@@ -0,0 +1,302 @@
+# benchmark.py
+"""
+Benchmark de los algoritmos de búsqueda del repo (main, GAS, GAA, AE, QWS).
+
+Barre n, objetivos, shots y ruido; para cada caso mide el tiempo de
+construcción del circuito, de transpilación y de simulación, el pico de
+memoria (RSS), la profundidad, el número de CX y la probabilidad de éxito.
+
+    python benchmark.py run --n 4 6 8 10 --algorithms main gas gaa --noise off on -o base.json
+    python benchmark.py compare base.json nuevo.json --threshold 0.2
+
+Cada caso corre en un proceso nuevo (spawn), así el pico de RSS es el del
+caso y un caso que se pasa de --timeout se corta sin frenar el barrido.
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import platform
+import sys
+import time
+from itertools import product
+
+import numpy as np
+
+FIELDS = [
+    'algorithm', 'n', 'target', 'shots', 'noise', 'status', 'iterations', 'num_qubits',
+    'build_time', 'transpile_time', 'simulate_time', 'aer_time', 'peak_rss_mb',
+    'depth', 'cx', 'success_probability', 'error',
+]
+# Métricas que se comparan entre corridas (más alto = peor)
+COMPARED = ['build_time', 'transpile_time', 'simulate_time', 'peak_rss_mb', 'depth', 'cx']
+# Diferencias absolutas menores a estas se consideran ruido de medición
+MIN_DELTA = {'build_time': 0.05, 'transpile_time': 0.05, 'simulate_time': 0.05, 'peak_rss_mb': 10}
+# Profundidad y CX se miden sobre esta base, con el mismo nivel de
+# optimización que el transpile para el backend (el de qiskit por defecto)
+METRIC_BASIS = ['u', 'cx']
+OPTIMIZATION_LEVEL = 2
+
+# ======================================================================
+# 1. ALGORITMOS
+# ======================================================================
+# Cada adaptador devuelve (circuitos lógicos, iteraciones, clave(s) medida(s) del
+# objetivo). La clave es None cuando el algoritmo no busca un objetivo concreto.
+
+def _main_circuits(n, target):
+    from grover.builders import create_grover_diffuser, create_oracle, grover_circuit, oracle_bits
+    from grover.iterations import plan_iterations
+    num_ancillas = 2    # como en main.py
+    R = plan_iterations(n)['iterations']
+    oracle = create_oracle(n, oracle_bits(target, n), num_ancillas)
+    qc = grover_circuit(n, oracle, create_grover_diffuser(n, num_ancillas), R)
+    return [qc], R, format(target, f'0{n}b')
+
+def _gas_circuits(n, target):
+    from grover.builders import create_grover_diffuser, create_oracle, grover_circuit, oracle_bits
+    from grover.iterations import plan_iterations
+    # Estrategia de duplicación de GAS.py: R = 1, 2, 4, ... hasta pasar el óptimo
+    R_opt = plan_iterations(n)['iterations']
+    schedule = [2**k for k in range(R_opt.bit_length() + 1)]
+    oracle = create_oracle(n, oracle_bits(target, n))
+    diffuser = create_grover_diffuser(n)
+    return [grover_circuit(n, oracle, diffuser, R) for R in schedule], sum(schedule), format(target, f'0{n}b')
+
+def _gaa_circuits(n, target):
+    from GAA import gaa_circuit
+    from grover.iterations import plan_iterations
+    R = plan_iterations(n)['iterations']
+    key = format(target, f'0{n}b')
+    return [gaa_circuit(n, [key], R)], R, key
+
+def _ae_circuits(n, target):
+    from AE import ae_circuit
+    from grover.estimation import decode
+    t = n + 1   # qubits de conteo
+    # Éxito: medir un y que, redondeado, da M = 1
+    keys = [format(y, f'0{t}b') for y in range(2**t) if decode(y, n, t)['num_solutions_rounded'] == 1]
+    return [ae_circuit(n, t, [target])], 2**t - 1, keys
+
+def _qws_circuits(n, target):
+    from QWS import qws_circuit
+    from grover.walk import hitting_time, make_graph
+    # Hipercubo más grande (dimensión potencia de 2) que entra en n qubits
+    # con 2 ancillas; si no entra ninguno, ciclo de n - 1 qubits sin ancillas
+    dimensions = [d for d in (2, 4, 8, 16) if d + d.bit_length() - 1 + 2 <= n]
+    if dimensions:
+        graph, num_ancillas = make_graph('hypercube', dimensions[-1]), 2
+    else:
+        graph, num_ancillas = make_graph('cycle', n - 1), 0
+    target %= graph.num_nodes
+    steps = hitting_time(graph, target)['steps']
+    circuit = qws_circuit(graph.node_qubits, graph.coin_qubits, steps, graph, target, num_ancillas)
+    return [circuit], steps, format(target, f'0{graph.node_qubits}b')
+
+ALGORITHMS = {
+    'main': _main_circuits,
+    'gas': _gas_circuits,
+    'gaa': _gaa_circuits,
+    'ae': _ae_circuits,
+    'qws': _qws_circuits,
+}
+
+# ======================================================================
+# 2. EJECUCIÓN DE UN CASO
+# ======================================================================
+
+def run_case(case):
+    """Ejecuta un caso y devuelve su fila de resultados."""
+    from qiskit import transpile
+    from grover.noise import get_simulator, simulator_for
+    from grover.telemetry import peak_rss_mb
+
+    row = dict(case, status='ok', error=None)
+    profile = 'depolarizing' if case['noise'] else 'ideal'
+    try:
+        start = time.perf_counter()
+        circuits, row['iterations'], key = ALGORITHMS[case['algorithm']](case['n'], case['target'])
+        row['build_time'] = time.perf_counter() - start
+
+        backend = get_simulator(profile)
+        start = time.perf_counter()
+        compiled = transpile(circuits, backend, optimization_level=OPTIMIZATION_LEVEL)
+        row['transpile_time'] = time.perf_counter() - start
+        options = {}
+        if case['noise']:
+            backend, options = simulator_for(compiled, profile, case['shots'])
+
+        start = time.perf_counter()
+        result = backend.run(compiled, shots=case['shots'], seed_simulator=case['seed'], **options).result()
+        row['simulate_time'] = time.perf_counter() - start
+        row['aer_time'] = result.time_taken
+
+        # Profundidad y CX sobre una base fija: la de Aer deja mcx y las
+        # compuertas propias como una sola operación, y cambia con el ruido
+        metrics = transpile(circuits, basis_gates=METRIC_BASIS, optimization_level=OPTIMIZATION_LEVEL)
+        row['num_qubits'] = max(qc.num_qubits for qc in compiled)
+        row['depth'] = max(qc.depth() for qc in metrics)
+        row['cx'] = sum(qc.count_ops().get('cx', 0) for qc in metrics)
+        if key is not None:
+            keys = [key] if isinstance(key, str) else key
+            row['success_probability'] = max(
+                sum(result.get_counts(i).get(k, 0) for k in keys) / case['shots']
+                for i in range(len(compiled)))
+    except Exception as error:
+        row['status'] = 'error'
+        row['error'] = f"{type(error).__name__}: {error}"
+    row['peak_rss_mb'] = peak_rss_mb()
+    return row
+
+def run_isolated(case, timeout):
+    """Ejecuta el caso en un proceso nuevo; si tarda más de `timeout` s se mata."""
+    # 'spawn': proceso limpio (RSS propio) y sin heredar los hilos OpenMP de Aer
+    pool = multiprocessing.get_context('spawn').Pool(1, maxtasksperchild=1)
+    try:
+        return pool.apply_async(run_case, (case,)).get(timeout)
+    except multiprocessing.TimeoutError:
+        return dict(case, status='timeout', error=f"más de {timeout} s")
+    finally:
+        pool.terminate()
+
+# ======================================================================
+# 3. BARRIDO Y ARCHIVOS DE RESULTADOS
+# ======================================================================
+
+def make_cases(algorithms, ns, num_targets, shots_list, noise_list, seed):
+    """Casos del barrido; los objetivos de cada n son aleatorios pero reproducibles."""
+    rng = np.random.default_rng(seed)
+    cases = []
+    for n in ns:
+        targets = [int(t) for t in rng.integers(0, 2**n, size=num_targets)]
+        for algorithm, target, shots, noise in product(algorithms, targets, shots_list, noise_list):
+            cases.append({'algorithm': algorithm, 'n': n, 'target': target,
+                          'shots': shots, 'noise': noise, 'seed': seed})
+    return cases
+
+def save_results(path, rows, meta):
+    if path.endswith('.csv'):
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(path, 'w') as f:
+            json.dump({'meta': meta, 'results': rows}, f, indent=2)
+
+def load_results(path):
+    if path.endswith('.csv'):
+        with open(path, newline='') as f:
+            rows = list(csv.DictReader(f))
+        for row in rows:
+            for field in FIELDS:
+                value = row.get(field)
+                if value in ('', None):
+                    row[field] = None
+                elif field in ('n', 'target', 'shots', 'iterations', 'num_qubits', 'depth', 'cx'):
+                    row[field] = int(value)
+                elif field == 'noise':
+                    row[field] = value == 'True'
+                elif field not in ('algorithm', 'status', 'error'):
+                    row[field] = float(value)
+        return rows
+    with open(path) as f:
+        return json.load(f)['results']
+
+def case_key(row):
+    return (row['algorithm'], row['n'], row['target'], row['shots'], row['noise'])
+
+def compare(base_rows, new_rows, threshold=0.2, max_success_drop=0.05):
+    """
+    Compara dos corridas caso por caso. Es regresión que una métrica crezca
+    más de `threshold` (relativo, y por encima de MIN_DELTA), que la
+    probabilidad de éxito baje más de `max_success_drop` o que un caso que
+    andaba deje de andar.
+    """
+    base = {case_key(row): row for row in base_rows}
+    regressions = []
+    for new in new_rows:
+        old = base.get(case_key(new))
+        if old is None:
+            continue
+        if old['status'] == 'ok' and new['status'] != 'ok':
+            regressions.append((case_key(new), 'status', old['status'], new['status']))
+            continue
+        if new['status'] != 'ok' or old['status'] != 'ok':
+            continue
+        for metric in COMPARED:
+            a, b = old.get(metric), new.get(metric)
+            if a is None or b is None:
+                continue
+            if b > a * (1 + threshold) and b - a > MIN_DELTA.get(metric, 0):
+                regressions.append((case_key(new), metric, a, b))
+        a, b = old.get('success_probability'), new.get('success_probability')
+        if a is not None and b is not None and a - b > max_success_drop:
+            regressions.append((case_key(new), 'success_probability', a, b))
+    return regressions
+
+def print_row(row):
+    def fmt(value, spec):
+        return format(value, spec) if value is not None else '-'
+    print(f"{row['algorithm']:>5} n={row['n']:>2} obj={row['target']:>8} shots={row['shots']:>5} "
+          f"ruido={'sí' if row['noise'] else 'no'} | {row['status']:>7} | "
+          f"build {fmt(row.get('build_time'), '.3f')} s, transpile {fmt(row.get('transpile_time'), '.3f')} s, "
+          f"sim {fmt(row.get('simulate_time'), '.3f')} s, RSS {fmt(row.get('peak_rss_mb'), '.0f')} MB, "
+          f"prof {fmt(row.get('depth'), 'd')}, CX {fmt(row.get('cx'), 'd')}, "
+          f"P(éxito) {fmt(row.get('success_probability'), '.3f')}")
+    if row.get('error'):
+        print(f"      {row['error']}")
+
+# ======================================================================
+# 4. LÍNEA DE COMANDOS
+# ======================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = sub.add_parser('run', help='ejecuta el barrido')
+    run_parser.add_argument('--algorithms', nargs='+', default=list(ALGORITHMS), choices=list(ALGORITHMS))
+    run_parser.add_argument('--n', nargs='+', type=int, default=[4, 6, 8, 10])
+    run_parser.add_argument('--targets', type=int, default=1, help='objetivos aleatorios por n')
+    run_parser.add_argument('--shots', nargs='+', type=int, default=[1024])
+    run_parser.add_argument('--noise', nargs='+', choices=['off', 'on'], default=['off'])
+    run_parser.add_argument('--seed', type=int, default=1234)
+    run_parser.add_argument('--timeout', type=float, default=600, help='segundos por caso')
+    run_parser.add_argument('--no-isolate', action='store_true',
+                            help='todo en este proceso (más rápido; el RSS es acumulado)')
+    run_parser.add_argument('-o', '--output', default='benchmark_results.json', help='.json o .csv')
+
+    compare_parser = sub.add_parser('compare', help='compara dos corridas')
+    compare_parser.add_argument('base')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('--threshold', type=float, default=0.2)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'compare':
+        regressions = compare(load_results(args.base), load_results(args.new), args.threshold)
+        for key, metric, old, new in regressions:
+            print(f"REGRESIÓN {key}: {metric} {old} -> {new}")
+        print(f"{len(regressions)} regresiones")
+        return 1 if regressions else 0
+
+    cases = make_cases(args.algorithms, args.n, args.targets, args.shots,
+                       [noise == 'on' for noise in args.noise], args.seed)
+    meta = {
+        'argv': sys.argv[1:],
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'started': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+    rows = []
+    for case in cases:
+        row = run_case(case) if args.no_isolate else run_isolated(case, args.timeout)
+        print_row(row)
+        rows.append(row)
+        # Se guarda después de cada caso: un barrido interrumpido no se pierde
+        save_results(args.output, rows, meta)
+    print(f"\n{len(rows)} casos guardados en {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
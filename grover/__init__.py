@@ -0,0 +1,51 @@
+"""
+Utilidades compartidas para los scripts de Grover del hackatón.
+
+Importar el paquete es barato: qiskit, qiskit_aer y numpy solo se cargan
+la primera vez que se accede a alguno de los nombres de abajo.
+"""
+import importlib
+
+# nombre público -> submódulo que lo define
+_EXPORTS = {
+    'create_oracle': 'builders',
+    'create_grover_diffuser': 'builders',
+    'grover_circuit': 'builders',
+    'oracle_bits': 'builders',
+    'create_diagonal_oracle': 'builders',
+    'run': 'runner',
+    'run_batch': 'batch',
+    'print_batch_table': 'batch',
+    'plan_iterations': 'iterations',
+    'optimal_iterations': 'iterations',
+    'success_probability': 'iterations',
+    'GroverCache': 'cache',
+    'default_cache': 'cache',
+    'run_grover_analytic': 'analytic',
+    'get_noise_model': 'noise',
+    'get_simulator': 'noise',
+    'plan_method': 'noise',
+    'sequential_run': 'sequential',
+    'Reporter': 'report',
+    'VariationalSearch': 'variational',
+    'ResultStore': 'store',
+    'GroverService': 'service',
+    'Telemetry': 'telemetry',
+    'exact_run': 'exact',
+    'ExactDistribution': 'exact',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f'{__name__}.{_EXPORTS[name]}')
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,170 @@
+# grover/aggregate.py
+"""
+Agregación de resultados por tandas de shots sobre arrays de enteros.
+
+En lugar de `result.get_counts()` (un dict con una cadena de n bits por
+resultado) y `max(counts, key=counts.get)`, se leen los counts crudos de Aer
+(claves hexadecimales = el entero medido) y se acumulan con numpy.bincount.
+Las claves binarias solo se construyen si se piden con `counts()`.
+"""
+import numpy as np
+
+from grover.noise import shot_chunks
+from grover.store import default_store
+from grover.telemetry import record_result, stage
+
+# Hasta este número de bits el conteo es un array denso de 2^n enteros
+DENSE_MAX_BITS = 22
+
+
+class ShotAggregator:
+    """Conteo acumulado de resultados medidos (enteros), con top-k y probabilidad de objetivos."""
+
+    def __init__(self, num_bits, targets=(), dense_max_bits=DENSE_MAX_BITS):
+        self.num_bits = num_bits
+        self.targets = np.asarray(sorted(set(targets)), dtype=np.int64)
+        self.shots = 0
+        self._dense = num_bits <= dense_max_bits
+        if self._dense:
+            self._tally = np.zeros(2**num_bits, dtype=np.int64)
+        else:
+            # Modo disperso: índices distintos (ordenados) y sus conteos
+            self._indices = np.zeros(0, dtype=np.int64)
+            self._counts = np.zeros(0, dtype=np.int64)
+        self._target_counts = np.zeros(self.targets.size, dtype=np.int64)
+
+    # ------------------------------------------------------------------
+    # Entrada
+    # ------------------------------------------------------------------
+
+    def add_counts(self, indices, counts):
+        """Suma `counts[i]` apariciones del resultado `indices[i]`."""
+        indices = np.asarray(indices, dtype=np.int64)
+        counts = np.asarray(counts, dtype=np.int64)
+        if self._dense:
+            if indices.size * 16 < self._tally.size:
+                # Pocos resultados distintos: sin arrays temporales de 2^n
+                np.add.at(self._tally, indices, counts)
+            else:
+                self._tally += np.bincount(indices, weights=counts, minlength=self._tally.size).astype(np.int64)
+        else:
+            merged, inverse = np.unique(np.concatenate([self._indices, indices]), return_inverse=True)
+            self._counts = np.bincount(inverse, weights=np.concatenate([self._counts, counts]),
+                                       minlength=merged.size).astype(np.int64)
+            self._indices = merged
+        if self.targets.size:
+            hit = np.isin(indices, self.targets)
+            positions = np.searchsorted(self.targets, indices[hit])
+            np.add.at(self._target_counts, positions, counts[hit])
+        self.shots += int(counts.sum())
+        return self
+
+    def add_shots(self, outcomes):
+        """Suma una tanda de resultados individuales (un entero por shot, p. ej. de memory)."""
+        outcomes = np.asarray(outcomes, dtype=np.int64)
+        if self._dense:
+            tally = np.bincount(outcomes, minlength=self._tally.size)
+            self._tally += tally
+            self._target_counts += tally[self.targets]
+            self.shots += outcomes.size
+            return self
+        indices, counts = np.unique(outcomes, return_counts=True)
+        return self.add_counts(indices, counts)
+
+    def add_result(self, result, experiment=0):
+        """Suma los counts crudos (claves hex) de un experimento de un Result de Aer."""
+        return self.add_raw_counts(result.data(experiment)['counts'])
+
+    def add_raw_counts(self, raw):
+        """Suma un dict de counts crudos de Aer (claves hexadecimales, p. ej. del grover.store)."""
+        indices = np.fromiter((int(key, 16) for key in raw), dtype=np.int64, count=len(raw))
+        counts = np.fromiter(raw.values(), dtype=np.int64, count=len(raw))
+        return self.add_counts(indices, counts)
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def _nonzero(self):
+        if self._dense:
+            indices = np.flatnonzero(self._tally)
+            return indices, self._tally[indices]
+        return self._indices, self._counts
+
+    def top(self, k=5):
+        """Los k resultados más frecuentes como [(entero, conteo), ...] (orden decreciente)."""
+        indices, counts = self._nonzero()
+        if indices.size == 0:
+            return []
+        k = min(k, indices.size)
+        best = np.argpartition(counts, -k)[-k:]
+        best = best[np.lexsort((indices[best], -counts[best]))]
+        return [(int(indices[i]), int(counts[i])) for i in best]
+
+    def most_frequent(self):
+        """Resultado más frecuente (entero)."""
+        if self._dense:
+            return int(np.argmax(self._tally))
+        return int(self._indices[np.argmax(self._counts)])
+
+    def count(self, index):
+        if self._dense:
+            return int(self._tally[index])
+        position = np.searchsorted(self._indices, index)
+        if position < self._indices.size and self._indices[position] == index:
+            return int(self._counts[position])
+        return 0
+
+    def target_probabilities(self):
+        """{objetivo: probabilidad medida} de los objetivos registrados."""
+        shots = max(self.shots, 1)
+        return {int(t): int(c) / shots for t, c in zip(self.targets, self._target_counts)}
+
+    def target_probability(self):
+        """Probabilidad de medir alguno de los objetivos."""
+        return int(self._target_counts.sum()) / max(self.shots, 1)
+
+    def key(self, index):
+        """Clave binaria (como las de Qiskit) de un resultado."""
+        return format(index, f'0{self.num_bits}b')
+
+    def counts(self):
+        """Dict de counts con claves binarias (solo cuando hace falta, p. ej. para graficar)."""
+        indices, counts = self._nonzero()
+        return {self.key(int(i)): int(c) for i, c in zip(indices, counts)}
+
+
+def aggregate_run(backend, circuits, num_bits, targets=(), shots=1024, shot_batch=None,
+                  seed=None, store=None, **options):
+    """
+    Ejecuta `circuits` (en tandas de `shot_batch` shots si se pide) y devuelve
+    un ShotAggregator por circuito; `targets[i]` son los objetivos del circuito i.
+    Cada tanda se suma y se descarta: nunca se arma el dict de claves binarias.
+    Con `seed`, los counts de cada tanda (semilla seed + k) se leen del
+    almacén en disco si ya se corrió (`store`: un grover.store.ResultStore,
+    None para el de por defecto o False para ejecutar siempre). Sin semilla
+    cada tanda es una muestra nueva y no se guarda.
+    """
+    if seed is None:
+        store = False
+    elif store is None:
+        store = default_store()
+    if not targets:
+        targets = [()] * len(circuits)
+    aggregators = [ShotAggregator(num_bits, t) for t in targets]
+    for k, chunk in enumerate(shot_chunks(shots, shot_batch, backend)):
+        if seed is not None:
+            options['seed_simulator'] = seed + k
+        if store:
+            raws = store.run_counts(backend, circuits, chunk, **options)
+            with stage('counts'):
+                for aggregator, raw in zip(aggregators, raws):
+                    aggregator.add_raw_counts(raw)
+            continue
+        with stage('simulate'):
+            result = backend.run(circuits, shots=chunk, **options).result()
+        record_result(result)
+        with stage('counts'):
+            for i, aggregator in enumerate(aggregators):
+                aggregator.add_result(result, i)
+    return aggregators
@@ -0,0 +1,155 @@
+# grover/analytic.py
+"""
+Backend "analítico" de Grover sobre un vector de amplitudes de NumPy.
+
+El oráculo es solo un cambio de signo en los índices marcados y el difusor
+es la inversión alrededor de la media (psi -> 2*media - psi), así que no
+hace falta descomponerlos en compuertas X/H/MCX ni pasar por Aer.
+
+Los índices siguen la convención de Qiskit: el índice i corresponde a la
+clave medida format(i, f'0{n}b').
+"""
+import numpy as np
+
+# ======================================================================
+# 1. OPERADORES SOBRE EL VECTOR DE AMPLITUDES
+# ======================================================================
+
+def marked_indices(n, marked):
+    """
+    Normaliza `marked` (entero, iterable de enteros o máscara booleana de 2^n
+    entradas) a un array ordenado y sin repetidos.
+    """
+    marked = np.asarray(marked)
+    if marked.dtype == bool:
+        if marked.shape != (2**n,):
+            raise ValueError(f"La máscara debe tener {2**n} entradas, no {marked.shape}")
+        marked = np.flatnonzero(marked)
+    indices = np.unique(np.atleast_1d(marked.astype(np.int64)))
+    if indices.size == 0:
+        raise ValueError("Se necesita al menos un estado marcado")
+    if indices[0] < 0 or indices[-1] >= 2**n:
+        raise ValueError(f"Los estados marcados deben estar entre 0 y {2**n - 1}")
+    return indices
+
+def initial_state(n):
+    """Superposición uniforme H^n|0>. Todas las amplitudes son reales."""
+    N = 2**n
+    return np.full(N, 1 / np.sqrt(N))
+
+def apply_oracle(psi, marked):
+    """Oráculo diagonal: fase de -1 sobre los estados marcados (índices o máscara, in-place)."""
+    psi[marked] *= -1
+    return psi
+
+def apply_diffuser(psi):
+    """Difusor: inversión alrededor de la media, psi -> 2*media - psi (in-place)."""
+    np.subtract(2 * psi.mean(), psi, out=psi)
+    return psi
+
+def evolve(n, marked, iterations):
+    """Aplica `iterations` iteraciones de Grover sobre el vector completo."""
+    marked = marked_indices(n, marked)
+    psi = initial_state(n)
+    for _ in range(iterations):
+        apply_oracle(psi, marked)
+        apply_diffuser(psi)
+    return psi
+
+def reduced_amplitudes(n, num_marked, iterations):
+    """
+    Mismos operadores, pero sobre las dos únicas amplitudes distintas del estado:
+    `a` (cada estado marcado) y `b` (cada estado no marcado). Cuesta O(iterations)
+    independientemente de n.
+    """
+    N = 2**n
+    a = b = 1 / np.sqrt(N)
+    for _ in range(iterations):
+        a = -a                                  # oráculo
+        mean = (num_marked * a + (N - num_marked) * b) / N
+        a, b = 2 * mean - a, 2 * mean - b       # difusor
+    return a, b
+
+# ======================================================================
+# 2. MUESTREO
+# ======================================================================
+
+def _to_counts(n, indices, values):
+    return {format(int(i), f'0{n}b'): int(c) for i, c in zip(indices, values)}
+
+def sample_outcomes(n, marked, iterations, shots=1024, seed=None, method='reduced'):
+    """
+    Simula Grover y devuelve (índices, counts) como arrays de enteros, sin
+    cadenas binarias (se suman directo a un ShotAggregator con add_counts).
+
+    - method='statevector': evoluciona el vector completo y muestrea con
+      `Generator.multinomial` (memoria: un vector de 2^n amplitudes).
+    - method='reduced': usa las dos amplitudes del estado (O(1) en memoria);
+      los resultados no marcados se reparten uniformemente.
+    """
+    rng = np.random.default_rng(seed)
+    marked = marked_indices(n, marked)
+
+    if method == 'statevector':
+        probabilities = evolve(n, marked, iterations) ** 2
+        probabilities /= probabilities.sum()
+        counts = rng.multinomial(shots, probabilities)
+        indices = np.flatnonzero(counts)
+        return indices, counts[indices]
+
+    if method != 'reduced':
+        raise ValueError(f"Método desconocido: {method}")
+
+    N = 2**n
+    M = marked.size
+    a, _ = reduced_amplitudes(n, M, iterations)
+    p_marked = min(a * a, 1 / M)
+    hits = rng.multinomial(shots, np.append(np.full(M, p_marked), max(0.0, 1 - M * p_marked)))
+    misses = int(hits[-1])
+
+    indices, values = np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    if misses and N > M:
+        # Índices uniformes entre los N - M no marcados, saltando los marcados
+        offsets = rng.integers(0, N - M, size=misses)
+        offsets += np.searchsorted(marked - np.arange(M), offsets, side='right')
+        indices, values = np.unique(offsets, return_counts=True)
+    nonzero = np.flatnonzero(hits[:-1])
+    return np.concatenate([indices, marked[nonzero]]), np.concatenate([values, hits[:-1][nonzero]])
+
+def sample_counts(n, marked, iterations, shots=1024, seed=None, method='reduced'):
+    """Como `sample_outcomes`, pero como un diccionario de counts como el de Aer."""
+    return _to_counts(n, *sample_outcomes(n, marked, iterations, shots, seed, method))
+
+def run_grover_analytic(n, marked, iterations=None, shots=1024, seed=None, method='reduced'):
+    """Ejecución completa de Grover con el backend analítico (R óptimo por defecto)."""
+    if iterations is None:
+        from grover.iterations import optimal_iterations
+        iterations = optimal_iterations(n, marked_indices(n, marked).size)
+    return sample_counts(n, marked, iterations, shots, seed, method)
+
+# ======================================================================
+# 3. VERIFICACIÓN CRUZADA CONTRA AER
+# ======================================================================
+
+def cross_check(n, oracle, diffuser, marked, iterations):
+    """
+    Compara las probabilidades exactas del backend analítico con las del
+    statevector de Aer para el mismo oráculo/difusor. Devuelve la máxima
+    diferencia absoluta entre ambas distribuciones.
+    """
+    from qiskit import QuantumCircuit, transpile
+    from qiskit_aer import AerSimulator
+
+    qc = QuantumCircuit(n)
+    qc.h(range(n))
+    for _ in range(iterations):
+        qc.append(oracle, range(n))
+        qc.append(diffuser, range(n))
+    qc.save_statevector()
+
+    simulator = AerSimulator(method='statevector')
+    aer_state = simulator.run(transpile(qc, simulator)).result().get_statevector()
+    aer_probabilities = np.abs(np.asarray(aer_state)) ** 2
+
+    probabilities = evolve(n, marked, iterations) ** 2
+    return float(np.max(np.abs(aer_probabilities - probabilities)))
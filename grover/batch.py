@@ -0,0 +1,132 @@
+# grover/batch.py
+"""
+Búsqueda de muchas contraseñas en un único trabajo del simulador.
+
+Se construye un circuito por objetivo (con el `create_oracle` de cada script)
+y se envían todos juntos en una sola llamada `AerSimulator.run([...])`,
+dejando que Aer ejecute los experimentos en paralelo.
+"""
+from functools import partial
+
+import numpy as np
+
+from grover.aggregate import ShotAggregator, aggregate_run
+from grover.analytic import sample_outcomes
+from grover.builders import oracle_bits
+from grover.cache import default_cache, grover_iterate
+from grover.iterations import plan_iterations
+from grover.noise import get_simulator, memory_options, simulator_for
+
+
+def builder_key(builder):
+    """
+    Identidad de un constructor para la clave de la caché: módulo y nombre,
+    más los argumentos fijados si es un functools.partial. Las lambdas y
+    funciones locales no tienen un nombre único: se distinguen por objeto.
+    """
+    if isinstance(builder, partial):
+        return (builder_key(builder.func), builder.args, tuple(sorted(builder.keywords.items())))
+    name = getattr(builder, '__qualname__', None)
+    if name is None or '<' in name:
+        return ('objeto', id(builder))
+    return (builder.__module__, name)
+
+
+def iterate_key(create_oracle, create_grover_diffuser, bits, width):
+    """
+    Clave de GroverCache para la iteración de `create_oracle(n, bits)` y el
+    difusor: los constructores (con sus parámetros) y el ancho distinguen
+    variantes con los mismos bits.
+    """
+    return (builder_key(create_oracle), builder_key(create_grover_diffuser)), bits, width
+
+
+def build_batch(n, targets, create_oracle, create_grover_diffuser, iterations, backend,
+                cache=default_cache):
+    """Construye (ya compilado) un circuito de Grover por cada objetivo."""
+    diffuser = create_grover_diffuser(n)
+    circuits = []
+    for target in targets:
+        bits = oracle_bits(target, n)
+        circuits.append(cache.grover_circuit(
+            n, iterate_key(create_oracle, create_grover_diffuser, bits, diffuser.num_qubits),
+            lambda bits=bits: grover_iterate(create_oracle(n, bits), diffuser),
+            iterations, backend))
+    return circuits
+
+
+def run_batch(n, targets, create_oracle, create_grover_diffuser, shots=1024,
+              iterations=None, backend=None, max_parallel_experiments=0, seed=None,
+              engine='aer', noise=None, shot_batch=None, keep_counts=True):
+    """
+    Ejecuta Grover para todos los `targets` (enteros) en un solo trabajo.
+
+    `max_parallel_experiments=0` deja que Aer use todos los núcleos
+    disponibles. Con engine='analytic' no se construyen circuitos: cada
+    objetivo se simula con el backend de NumPy (grover.analytic).
+    `noise` es un perfil de grover.noise (p. ej. 'depolarizing'); el método
+    de Aer se elige según el tamaño de los circuitos. `shot_batch` reparte
+    los shots en varios trabajos más chicos. Con keep_counts=False las filas
+    no incluyen el dict de counts con claves binarias (solo los más frecuentes).
+    Devuelve una tabla con una fila (dict) por objetivo.
+    """
+    targets = list(targets)
+    if iterations is None:
+        iterations = plan_iterations(n)['iterations']
+
+    if engine == 'analytic':
+        if noise is not None:
+            raise ValueError("El motor analítico no simula ruido")
+        rng = np.random.default_rng(seed)
+        aggregators = [ShotAggregator(n, [target]).add_counts(*sample_outcomes(n, target, iterations, shots, rng))
+                       for target in targets]
+        return [result_row(n, target, aggregator, keep_counts)
+                for target, aggregator in zip(targets, aggregators)]
+    if engine != 'aer':
+        raise ValueError(f"Motor desconocido: {engine}")
+
+    profile = noise or 'ideal'
+    if backend is None:
+        backend = get_simulator(profile)
+
+    circuits = build_batch(n, targets, create_oracle, create_grover_diffuser, iterations, backend)
+    # Aer respeta el límite de memoria aunque el método lo haya fijado quien llama
+    options = memory_options()
+    if backend.options.method == 'automatic':
+        # Método según la estimación (grover.noise.plan_method); si no es
+        # statevector se recompila para las compuertas que soporta
+        cached = backend is get_simulator(profile)
+        backend, options = simulator_for(circuits, profile if cached else backend, shots)
+        if backend.options.method != 'statevector':
+            circuits = build_batch(n, targets, create_oracle, create_grover_diffuser, iterations, backend)
+
+    aggregators = aggregate_run(backend, circuits, n, [[target] for target in targets], shots,
+                                shot_batch, seed, max_parallel_experiments=max_parallel_experiments, **options)
+
+    return [result_row(n, target, aggregator, keep_counts)
+            for target, aggregator in zip(targets, aggregators)]
+
+
+def result_row(n, target, aggregator, keep_counts=True):
+    """Fila de la tabla de resultados para un objetivo (a partir de un ShotAggregator)."""
+    measured = aggregator.most_frequent()
+    row = {
+        'target': target,
+        'target_binary': aggregator.key(target),
+        'measured': measured,
+        'measured_binary': aggregator.key(measured),
+        'probability': aggregator.target_probability(),
+        'success': measured == target,
+        'top': aggregator.top(5),
+    }
+    if keep_counts:
+        row['counts'] = aggregator.counts()
+    return row
+
+
+def print_batch_table(rows):
+    """Imprime la tabla de resultados por objetivo."""
+    print(f"{'Objetivo':>9} {'Binario':>10} {'Medido':>7} {'P(objetivo)':>12}  Éxito")
+    for row in rows:
+        print(f"{row['target']:>9} {row['target_binary']:>10} {row['measured']:>7} "
+              f"{row['probability']*100:>11.2f}%  {'sí' if row['success'] else 'no'}")
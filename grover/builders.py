@@ -0,0 +1,191 @@
+# grover/builders.py
+"""
+Constructores puros del oráculo y el difusor de Grover.
+
+Reemplazan las copias de `create_oracle` / `create_grover_diffuser` que
+había en cada script. No ejecutan nada: solo devuelven circuitos.
+"""
+import re
+
+import numpy as np
+from qiskit import QuantumCircuit
+
+from grover.analytic import marked_indices
+from grover.mcz import mcz
+from grover.telemetry import stage
+
+# Por encima de esta cantidad de qubits la diagonal (2^n entradas) es muy grande
+DIAGONAL_MAX_QUBITS = 24
+# Con más objetivos que esto, create_multi_target_oracle usa la diagonal
+STACK_MAX_TARGETS = 8
+# La minimización Quine-McCluskey de sympy crece muy rápido con los minterms
+ESOP_MAX_MINTERMS = 128
+
+
+def oracle_bits(target_decimal, n):
+    """
+    Cadena que hay que pasar a `create_oracle(n, ...)` para marcar `target_decimal`.
+
+    `create_oracle` aplica el bit i de la cadena al qubit i, pero Qiskit
+    escribe los resultados con el qubit 0 a la derecha (little-endian), así
+    que invertimos la cadena para que la clave medida coincida con el objetivo.
+    """
+    return format(target_decimal, f'0{n}b')[::-1]
+
+
+def create_oracle(n, target_state_binary, num_ancillas=0):
+    """
+    Crea un oráculo que aplica una fase de -1 al estado objetivo.
+
+    El bit i de `target_state_binary` corresponde al qubit i. Los qubits
+    n..n+num_ancillas-1 son ancillas limpias para la MCZ.
+    """
+    qc_oracle = QuantumCircuit(n + num_ancillas)
+    ancillas = range(n, n + num_ancillas)
+
+    # Aplicar X a los qubits que son '0' en el estado objetivo.
+    zeros = [i for i, bit in enumerate(target_state_binary) if bit == '0']
+    if zeros:
+        qc_oracle.x(zeros)
+
+    # Aplicar la compuerta Z controlada por todos los qubits (MCZ)
+    mcz(qc_oracle, range(n), ancillas)
+
+    # Deshacer la aplicación de X.
+    if zeros:
+        qc_oracle.x(zeros)
+
+    return qc_oracle
+
+
+def create_multi_target_oracle(n, targets_decimal, num_ancillas=0):
+    """
+    Oráculo que marca (fase -1) todas las contraseñas de `targets_decimal`.
+
+    Es el producto de un oráculo de un objetivo por contraseña: cada uno es
+    diagonal, así que conmutan y cada estado marcado recibe una sola fase.
+    Con más de STACK_MAX_TARGETS objetivos se usa una sola compuerta diagonal.
+    """
+    targets = sorted(set(targets_decimal))
+    if len(targets) > STACK_MAX_TARGETS and n <= DIAGONAL_MAX_QUBITS:
+        return create_diagonal_oracle(n, targets, num_ancillas, method='diagonal')
+    qc_oracle = QuantumCircuit(n + num_ancillas)
+    for target in targets:
+        qc_oracle.compose(create_oracle(n, oracle_bits(target, n), num_ancillas), inplace=True)
+    return qc_oracle
+
+
+def marked_mask(n, marked):
+    """
+    Máscara booleana de 2^n entradas a partir de una máscara o de un array de
+    índices marcados (convención de Qiskit: el índice i es la clave format(i, '0nb')),
+    validados con grover.analytic.marked_indices.
+    """
+    mask = np.zeros(2**n, dtype=bool)
+    mask[marked_indices(n, marked)] = True
+    return mask
+
+
+def _esop_expression(n, indices):
+    """
+    DNF minimizada (Quine-McCluskey de sympy) de los índices marcados con
+    variables x0..x{n-1} (xq es el qubit q). None si la función es constante 1.
+    """
+    from sympy import symbols
+    from sympy.logic import SOPform
+    variables = symbols(f'x0:{n}')
+    # Cada minterm lista el valor de cada variable, en el orden de `variables`
+    minterms = [[(int(i) >> q) & 1 for q in range(n)] for i in indices]
+    expression = SOPform(variables, minterms)
+    if expression is True or not expression.free_symbols:
+        return None
+    return str(expression)
+
+
+def _append_phase_oracle(qc, expression):
+    """PhaseOracleGate de `expression` sobre los qubits de las variables que aparecen en ella."""
+    from qiskit.circuit.library import PhaseOracleGate
+    # La compuerta solo tiene qubits para las variables presentes
+    used = sorted({int(q) for q in re.findall(r'\bx(\d+)\b', expression)})
+    qc.append(PhaseOracleGate(expression, var_order=[f'x{q}' for q in used]), used)
+
+
+def create_diagonal_oracle(n, marked, num_ancillas=0, method='auto'):
+    """
+    Oráculo para muchos objetivos a partir de una máscara booleana o un array
+    de índices, sin apilar una MCZ por objetivo.
+
+    - method='diagonal': una sola compuerta diagonal (1 o -1 por estado) que
+      Aer aplica en una pasada sobre el vector de estado.
+    - method='esop': PhaseOracleGate sobre la suma de productos minimizada
+      (compuertas para hardware; conviene cuando la máscara tiene estructura).
+      `marked` también puede ser directamente una expresión booleana en las
+      variables x0..x{n-1} (xq es el qubit q), p. ej. '~x0' para los pares.
+    - method='auto': 'diagonal' hasta DIAGONAL_MAX_QUBITS, si no 'esop'.
+
+    Los qubits n..n+num_ancillas-1 no se usan; están para que el ancho
+    coincida con el del difusor.
+    """
+    from qiskit.circuit.library import DiagonalGate
+
+    qc_oracle = QuantumCircuit(n + num_ancillas)
+    if isinstance(marked, str):
+        _append_phase_oracle(qc_oracle, marked)
+        return qc_oracle
+
+    mask = marked_mask(n, marked)
+    if method == 'auto':
+        method = 'diagonal' if n <= DIAGONAL_MAX_QUBITS else 'esop'
+    if method == 'diagonal':
+        if n > DIAGONAL_MAX_QUBITS:
+            raise ValueError(f"Diagonal de 2^{n} entradas: usar method='esop'")
+        qc_oracle.append(DiagonalGate(np.where(mask, -1.0, 1.0)), range(n))
+    elif method == 'esop':
+        indices = np.flatnonzero(mask)
+        if indices.size > ESOP_MAX_MINTERMS:
+            raise ValueError(f"{indices.size} objetivos es demasiado para minimizar: usar "
+                             "method='diagonal' o pasar la expresión booleana directamente")
+        expression = _esop_expression(n, indices)
+        if expression is None:
+            qc_oracle.global_phase += np.pi     # todos marcados: fase global
+        else:
+            _append_phase_oracle(qc_oracle, expression)
+    else:
+        raise ValueError(f"Método desconocido: {method}")
+    return qc_oracle
+
+
+def create_grover_diffuser(n, num_ancillas=0):
+    """Crea el operador de difusión de Grover (inversión alrededor de la media)."""
+    qc_diffuser = QuantumCircuit(n + num_ancillas)
+    ancillas = range(n, n + num_ancillas)
+
+    # D = H^n * O_0 * H^n
+    qc_diffuser.h(range(n))
+    qc_diffuser.x(range(n)) # Prepara |00...0> para ser |11...1>
+
+    # Aplicar MCZ para el estado |11...1> (que representa O_0)
+    mcz(qc_diffuser, range(n), ancillas)
+
+    qc_diffuser.x(range(n)) # Deshace la preparación
+    qc_diffuser.h(range(n))
+
+    return qc_diffuser
+
+
+def grover_circuit(n, oracle, diffuser, iterations, measure=True):
+    """Circuito completo (sin transpilar): superposición, R iteraciones y medición."""
+    width = oracle.num_qubits
+    qc = QuantumCircuit(width, n if measure else 0)
+    qc.h(range(n))
+
+    with stage('to_instruction'):
+        oracle_inst = oracle.to_instruction()
+        diffuser_inst = diffuser.to_instruction()
+    for _ in range(iterations):
+        qc.append(oracle_inst, range(width))
+        qc.append(diffuser_inst, range(width))
+
+    if measure:
+        qc.measure(range(n), range(n))
+    return qc
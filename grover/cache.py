@@ -0,0 +1,105 @@
+# grover/cache.py
+"""
+Caché de iteraciones de Grover ya transpiladas.
+
+Se transpila UNA sola iteración (oráculo + difusor) por combinación
+(n, oráculo, backend, nivel de optimización) y luego se compone el bloque
+ya compilado R veces, en lugar de transpilar la cadena completa cada vez.
+Los bloques compilados también se guardan en disco (grover.store), así que
+otro proceso con el mismo oráculo no vuelve a transpilar.
+"""
+from collections import OrderedDict
+
+from qiskit import QuantumCircuit, transpile
+
+from grover.store import default_store
+from grover.telemetry import stage
+
+
+def backend_key(backend):
+    """
+    Identificador del backend para la clave de la caché: nombre, método y
+    compuertas base del modelo de ruido (cambian el resultado de transpile).
+    """
+    method = getattr(backend.options, 'method', None)
+    noise_model = getattr(backend.options, 'noise_model', None)
+    noise_basis = tuple(sorted(noise_model.basis_gates)) if noise_model is not None else None
+    return (backend.name, method, noise_basis)
+
+
+class GroverCache:
+    """Caché LRU de iteraciones de Grover transpiladas con contadores de aciertos/fallos."""
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._blocks = OrderedDict()
+
+    def get_iterate(self, n, oracle_key, build_iterate, backend, optimization_level=1):
+        """
+        Devuelve la iteración (oráculo + difusor) transpilada para `backend`.
+
+        `build_iterate` solo se llama si la clave no está en la caché y debe
+        devolver un QuantumCircuit de n qubits con una iteración de Grover.
+        """
+        key = (n, oracle_key, backend_key(backend), optimization_level)
+        if key in self._blocks:
+            self.hits += 1
+            self._blocks.move_to_end(key)
+            return self._blocks[key]
+
+        self.misses += 1
+        with stage('oracle'):
+            iterate = build_iterate()
+        store = default_store()
+        with stage('transpile'):
+            if store is not None:
+                block = store.transpile(iterate, backend, optimization_level)
+            else:
+                block = transpile(iterate, backend, optimization_level=optimization_level)
+        self._blocks[key] = block
+        # Política LRU: descartamos el bloque usado hace más tiempo
+        if len(self._blocks) > self.maxsize:
+            self._blocks.popitem(last=False)
+        return block
+
+    def grover_circuit(self, n, oracle_key, build_iterate, iterations, backend,
+                       optimization_level=1, measure=True):
+        """Construye el circuito completo componiendo R veces el bloque ya compilado."""
+        block = self.get_iterate(n, oracle_key, build_iterate, backend, optimization_level)
+
+        with stage('compose'):
+            qc = QuantumCircuit(block.num_qubits, n if measure else 0)
+            qc.h(range(n))
+            for _ in range(iterations):
+                qc.compose(block, range(block.num_qubits), inplace=True)
+            if measure:
+                qc.measure(range(n), range(n))
+        return qc
+
+    def stats(self):
+        """Contadores de la caché."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._blocks),
+            'maxsize': self.maxsize,
+        }
+
+    def clear(self):
+        self._blocks.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# Caché compartida por todos los scripts del proceso
+default_cache = GroverCache()
+
+
+def grover_iterate(oracle, diffuser):
+    """Circuito con una sola iteración de Grover (oráculo seguido del difusor)."""
+    qc = QuantumCircuit(oracle.num_qubits)
+    qc.append(oracle, range(oracle.num_qubits))
+    qc.append(diffuser, range(diffuser.num_qubits))
+    return qc
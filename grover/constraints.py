@@ -0,0 +1,311 @@
+# grover/constraints.py
+"""
+Compilador de restricciones sobre dígitos a oráculos de Grover.
+
+El registro de búsqueda son `num_digits` dígitos BCD de 4 qubits cada uno
+(el qubit 0 de cada grupo es el bit menos significativo), igual que en
+`main1.create_oracle_atenea`: centenas, decenas, unidades.
+
+El oráculo se arma en tres partes:
+
+- predicados con estructura aritmética (suma de dígitos): calculan un flag
+  con un registro de trabajo común que se deja limpio en seguida
+  (compute / flag / uncompute), así que todos reutilizan las mismas ancillas;
+- predicados "dígito == valor": no necesitan flag, sus qubits entran
+  directamente como controles de la fase;
+- a lo sumo un predicado por tabla de verdad (p. ej. "es primo"): se aplica
+  directamente como fase, solo sobre los patrones compatibles con los
+  dígitos ya fijados.
+
+Sin tabla de verdad, los dígitos que no quedan fijados podrían valer
+10-15 (BCD inválido): se agrega el flag "todos los dígitos <= 9"
+(ValidDigits) para que el oráculo marque lo mismo que classical_solutions.
+
+    calcular flags -> MCZ(s) de fase -> descalcular flags
+
+El difusor actúa solo sobre el registro de búsqueda.
+"""
+from itertools import product
+
+import sympy
+from qiskit import QuantumCircuit
+from qiskit.synthesis import adder_ripple_c04
+
+from grover.builders import create_grover_diffuser
+from grover.mcz import mcx, mcz
+
+BITS_PER_DIGIT = 4
+
+# ======================================================================
+# 1. PREDICADOS
+# ======================================================================
+
+def _mark_patterns(qc, qubits, values, flag, ancillas, mode):
+    """
+    flag ^= (qubits in values), con el qubit 0 como bit menos significativo.
+    Si `flag` es None se aplica una fase -1 (MCZ) en lugar de marcar un flag.
+
+    Entre dos patrones consecutivos solo se invierten los bits que cambian.
+    """
+    flipped = 0
+    for value in values:
+        toggle = [q for i, q in enumerate(qubits) if ((~value ^ flipped) >> i) & 1]
+        if toggle:
+            qc.x(toggle)
+        flipped = ~value & ((1 << len(qubits)) - 1)
+        if flag is None:
+            mcz(qc, qubits, ancillas, mode=mode)
+        else:
+            mcx(qc, qubits, flag, ancillas, mode=mode)
+    undo = [q for i, q in enumerate(qubits) if (flipped >> i) & 1]
+    if undo:
+        qc.x(undo)
+
+
+class DigitEquals:
+    """El dígito en `position` (0 = más significativo, -1 = último) vale `value`."""
+
+    def __init__(self, position, value):
+        self.position = position
+        self.value = value
+
+    def __repr__(self):
+        return f"DigitEquals({self.position}, {self.value})"
+
+    def num_work_qubits(self, num_digits):
+        return 0
+
+    def holds(self, digits):
+        return digits[self.position] == self.value
+
+    def fixed_bits(self, digit_qubits):
+        """Qubit -> bit que este predicado fija (se usa como control directo de la fase)."""
+        return {q: (self.value >> i) & 1 for i, q in enumerate(digit_qubits[self.position])}
+
+    def compute(self, qc, digit_qubits, flag, work, mode):
+        _mark_patterns(qc, digit_qubits[self.position], [self.value], flag, work, mode)
+
+
+class DigitSumEquals:
+    """La suma de todos los dígitos vale `value` (sumadores ripple-carry en el lugar)."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def __repr__(self):
+        return f"DigitSumEquals({self.value})"
+
+    def num_work_qubits(self, num_digits):
+        # un carry por suma, ceros de relleno para el sumando y un qubit auxiliar
+        return (num_digits - 1) + max(0, num_digits - 2) + 1
+
+    def holds(self, digits):
+        return sum(digits) == self.value
+
+    def _sum_circuit(self, num_qubits, digit_qubits, work):
+        """Acumula la suma sobre el primer dígito; devuelve (circuito, qubits de la suma)."""
+        num_digits = len(digit_qubits)
+        carries = work[:num_digits - 1]
+        pads = work[num_digits - 1:num_digits - 1 + max(0, num_digits - 2)]
+        helper = work[-1]
+
+        qc = QuantumCircuit(num_qubits)
+        acc = list(digit_qubits[0])
+        for k, digit in enumerate(digit_qubits[1:]):
+            width = len(acc)
+            addend = list(digit) + pads[:width - BITS_PER_DIGIT]
+            # b <- a + b, con el carry de salida en un qubit nuevo
+            qc.compose(adder_ripple_c04(width, kind='half'),
+                       addend + acc + [carries[k], helper], inplace=True)
+            acc = acc + [carries[k]]
+        return qc, acc
+
+    def compute(self, qc, digit_qubits, flag, work, mode):
+        adder, acc = self._sum_circuit(qc.num_qubits, digit_qubits, work)
+        qc.compose(adder, inplace=True)
+        _mark_patterns(qc, acc, [self.value], flag, [], mode)
+        qc.compose(adder.inverse(), inplace=True)
+
+
+class ValidDigits:
+    """Los dígitos en `positions` valen como mucho 9 (los nibbles 10-15 no son dígitos)."""
+
+    def __init__(self, positions):
+        self.positions = list(positions)
+
+    def __repr__(self):
+        return f"ValidDigits({self.positions})"
+
+    def num_work_qubits(self, num_digits):
+        # un marcador "inválido" por dígito y uno más de ancilla para la MCX final
+        return len(self.positions) + 1
+
+    def holds(self, digits):
+        return all(digits[p] <= 9 for p in self.positions)
+
+    def _invalid_markers(self, num_qubits, digit_qubits, markers, mode):
+        # inválido = 11xx (12-15) o 101x (10-11), dos casos disjuntos
+        qc = QuantumCircuit(num_qubits)
+        for position, marker in zip(self.positions, markers):
+            b0, b1, b2, b3 = digit_qubits[position]
+            qc.ccx(b3, b2, marker)
+            qc.x(b2)
+            mcx(qc, [b3, b2, b1], marker, mode=mode)
+            qc.x(b2)
+        return qc
+
+    def compute(self, qc, digit_qubits, flag, work, mode):
+        markers = work[:len(self.positions)]
+        mark = self._invalid_markers(qc.num_qubits, digit_qubits, markers, mode)
+        qc.compose(mark, inplace=True)
+        # flag ^= ningún marcador encendido
+        qc.x(markers)
+        mcx(qc, markers, flag, work[len(self.positions):], mode=mode)
+        qc.x(markers)
+        qc.compose(mark.inverse(), inplace=True)
+
+
+class NumberPredicate:
+    """
+    Predicado arbitrario sobre el número decimal (p. ej. "es primo").
+
+    No tiene estructura aritmética, así que se sintetiza por tabla de verdad:
+    una MCX por cada número válido que lo cumple, usando el registro de
+    trabajo (limpio en ese momento) como ancillas.
+    """
+
+    def __init__(self, function, name):
+        self.function = function
+        self.name = name
+
+    def __repr__(self):
+        return self.name
+
+    def num_work_qubits(self, num_digits):
+        return 0
+
+    def holds(self, digits):
+        return bool(self.function(digits_to_number(digits)))
+
+    def values(self, num_digits):
+        """Valores del registro de búsqueda que cumplen el predicado."""
+        return [digits_to_value(digits)
+                for digits in product(range(10), repeat=num_digits)
+                if self.holds(digits)]
+
+    def compute(self, qc, digit_qubits, flag, work, mode):
+        qubits = [q for digit in digit_qubits for q in digit]
+        _mark_patterns(qc, qubits, self.values(len(digit_qubits)), flag, work, mode)
+
+
+def IsPrime():
+    """El número formado por los dígitos es primo."""
+    return NumberPredicate(sympy.isprime, 'IsPrime()')
+
+# ======================================================================
+# 2. COMPILADOR
+# ======================================================================
+
+def digits_to_number(digits):
+    number = 0
+    for d in digits:
+        number = number * 10 + d
+    return number
+
+def digits_to_value(digits):
+    """Entero que codifica los dígitos en el registro de búsqueda (BCD, 4 bits por dígito)."""
+    value = 0
+    for i, d in enumerate(digits):
+        value |= d << (BITS_PER_DIGIT * i)
+    return value
+
+def decode_digits(bitstring, num_digits):
+    """Convierte una clave medida (qubit 0 a la derecha) en la lista de dígitos."""
+    value = int(bitstring[-BITS_PER_DIGIT * num_digits:], 2)
+    return [(value >> (BITS_PER_DIGIT * i)) & 0xF for i in range(num_digits)]
+
+def classical_solutions(predicates, num_digits):
+    """Números (con dígitos 0-9) que cumplen todos los predicados."""
+    return [digits_to_number(digits)
+            for digits in product(range(10), repeat=num_digits)
+            if all(p.holds(digits) for p in predicates)]
+
+def compile_oracle(predicates, num_digits=3, name="OráculoCuántico", mcx_mode='native'):
+    """
+    Compila la conjunción de `predicates` en un oráculo de fase.
+
+    Devuelve un diccionario con el oráculo, el difusor restringido al
+    registro de búsqueda y la distribución de qubits:
+    [búsqueda | un flag por predicado aritmético | registro de trabajo común].
+
+    `mcx_mode` se pasa a grover.mcz.mcx: 'native' (por defecto) deja las MCX
+    para que Aer las aplique directamente; 'auto' las descompone con la
+    síntesis más barata (conteos de CX realistas para hardware o ruido).
+    """
+    predicates = list(predicates)
+    inline = [p for p in predicates if hasattr(p, 'fixed_bits')]
+    tables = [p for p in predicates if isinstance(p, NumberPredicate)]
+    phase_predicate = tables[0] if tables else None
+    flagged = [p for p in predicates if p not in inline and p is not phase_predicate]
+
+    num_search = BITS_PER_DIGIT * num_digits
+    digit_qubits = [list(range(BITS_PER_DIGIT * i, BITS_PER_DIGIT * (i + 1))) for i in range(num_digits)]
+    if phase_predicate is None:
+        # La tabla de verdad solo admite dígitos 0-9; sin ella, los dígitos que
+        # ningún DigitEquals fija necesitan la condición "<= 9"
+        fixed_qubits = {q for p in inline for q in p.fixed_bits(digit_qubits)}
+        free = [i for i, digit in enumerate(digit_qubits) if not set(digit) <= fixed_qubits]
+        if free:
+            flagged.append(ValidDigits(free))
+
+    num_flags = len(flagged)
+    num_work = max([p.num_work_qubits(num_digits) for p in flagged] + [0])
+    num_qubits = num_search + num_flags + num_work
+
+    search = list(range(num_search))
+    flags = list(range(num_search, num_search + num_flags))
+    work = list(range(num_search + num_flags, num_qubits))
+
+    # Bits fijados por los predicados "dígito == valor"
+    fixed = {}
+    for predicate in inline:
+        for q, bit in predicate.fixed_bits(digit_qubits).items():
+            if fixed.setdefault(q, bit) != bit:
+                raise ValueError(f"Los predicados {inline} se contradicen: no hay soluciones")
+
+    # Patrones de fase sobre [qubits de búsqueda involucrados | flags]
+    if phase_predicate is not None:
+        phase_search = search
+        candidates = [v for v in phase_predicate.values(num_digits)
+                      if all((v >> q) & 1 == bit for q, bit in fixed.items())]
+    else:
+        phase_search = sorted(fixed)
+        candidates = [sum(fixed[q] << i for i, q in enumerate(phase_search))]
+    all_flags = ((1 << num_flags) - 1) << len(phase_search)
+    phase_values = [v | all_flags for v in candidates]
+    if not phase_values:
+        raise ValueError("Los predicados no tienen soluciones")
+
+    compute_flags = QuantumCircuit(num_qubits)
+    for predicate, flag in zip(flagged, flags):
+        predicate.compute(compute_flags, digit_qubits, flag, work, mcx_mode)
+
+    oracle = QuantumCircuit(num_qubits, name=name)
+    oracle.compose(compute_flags, inplace=True)
+    # Fase -1 sobre cada patrón válido (las ancillas de trabajo están limpias)
+    _mark_patterns(oracle, phase_search + flags, phase_values, None, work, mcx_mode)
+    oracle.compose(compute_flags.inverse(), inplace=True)
+
+    # Los flags y el registro de trabajo vuelven a |0>: sirven de ancillas del difusor
+    diffuser = create_grover_diffuser(num_search, num_qubits - num_search)
+    diffuser.name = "Difusor"
+
+    return {
+        'oracle': oracle,
+        'diffuser': diffuser,
+        'num_qubits': num_qubits,
+        'search_qubits': search,
+        'flag_qubits': flags,
+        'work_qubits': work,
+        'predicates': predicates,
+    }
@@ -0,0 +1,284 @@
+# grover/estimation.py
+"""
+Estimación de amplitud (AE) / conteo cuántico con el operador de Grover real.
+
+Q = -D·O, con O el oráculo y D = I - 2|s><s| el difusor de grover.builders
+(de ahí la fase global pi). Sobre el subespacio {|buenos>, |malos>} Q es una
+rotación de ángulo 2*theta con sin^2(theta) = M/N, así que la estimación de
+fase sobre Q da y ≈ 2^t * theta/pi (o 2^t - y) y
+
+    a = sin^2(pi * y / 2^t),    M ≈ N * a.
+
+Las potencias controladas Q^(2^k) se construyen:
+
+- 'unitary': elevando al cuadrado la matriz de Q k veces (una sola compuerta
+  controlada por qubit de conteo: el circuito crece O(t), no O(2^t));
+- 'gates': Q controlado se sintetiza una sola vez y se repite 2^k veces
+  (para oráculos demasiado anchos para una matriz). El circuito crece
+  O(2^t), así que se acepta hasta GATES_MAX_COUNTING_QUBITS qubits de
+  conteo; para más precisión con Q ancho conviene `mlae`.
+
+`mlae` es la alternativa sin registro de conteo ni QFT (máxima verosimilitud
+sobre los circuitos de Grover normales de n qubits).
+"""
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit.circuit.library import UnitaryGate
+from qiskit.quantum_info import Operator
+from qiskit.synthesis import synth_qft_full
+
+# Ancho máximo (qubits de Q) para construir las potencias como matrices
+UNITARY_MAX_QUBITS = 8
+# Qubits de conteo máximos cuando las potencias se arman repitiendo Q
+# (2^t - 1 copias de Q controlado)
+GATES_MAX_COUNTING_QUBITS = 6
+
+# ======================================================================
+# 1. OPERADOR DE GROVER Y POTENCIAS CONTROLADAS
+# ======================================================================
+
+def grover_operator(oracle, diffuser):
+    """Q = -D·O sobre el ancho del oráculo (búsqueda + ancillas)."""
+    qc = QuantumCircuit(oracle.num_qubits, name="Q")
+    qc.compose(oracle, inplace=True)
+    qc.compose(diffuser, range(diffuser.num_qubits), inplace=True)
+    qc.global_phase += np.pi
+    return qc
+
+def _controlled_unitary(U):
+    """I ⊗ |0><0| + U ⊗ |1><1|: el control es el primer qubit (como en ControlledGate)."""
+    P0 = np.diag([1, 0])
+    P1 = np.diag([0, 1])
+    return UnitaryGate(np.kron(np.eye(U.shape[0]), P0) + np.kron(U, P1), check_input=False)
+
+def controlled_powers(Q, t, method='auto'):
+    """
+    Lista [C-Q^(2^0), ..., C-Q^(2^(t-1))] como (compuerta, repeticiones),
+    con el qubit de control primero.
+    """
+    if method == 'auto':
+        method = 'unitary' if Q.num_qubits <= UNITARY_MAX_QUBITS else 'gates'
+    if method == 'unitary':
+        powers = []
+        U = Operator(Q).data
+        for k in range(t):
+            gate = _controlled_unitary(U)
+            gate.label = f"c-Q^{2**k}"
+            powers.append((gate, 1))
+            U = U @ U
+        return powers
+    if method == 'gates':
+        if t > GATES_MAX_COUNTING_QUBITS:
+            raise ValueError(
+                f"Q de {Q.num_qubits} qubits con {t} qubits de conteo son {2**t - 1} copias de Q "
+                f"controlado (máximo {GATES_MAX_COUNTING_QUBITS} qubits de conteo con method='gates'). "
+                f"Usar menos qubits de conteo, method='unitary' si la matriz entra, o mlae.")
+        controlled_Q = Q.to_gate().control(1)
+        return [(controlled_Q, 2**k) for k in range(t)]
+    raise ValueError(f"Método desconocido: {method}")
+
+# ======================================================================
+# 2. CIRCUITO DE ESTIMACIÓN DE FASE
+# ======================================================================
+
+def ae_circuit(Q, n, t, method='auto'):
+    """
+    Estimación de fase de Q con t qubits de conteo.
+
+    Qubits: [búsqueda (n) | ancillas de Q | conteo (t)]. Se mide solo el
+    registro de conteo; el entero medido es y.
+    """
+    width = Q.num_qubits
+    counting = list(range(width, width + t))
+    qc = QuantumCircuit(width + t, t)
+
+    qc.h(range(n))          # |s> en el registro de búsqueda
+    qc.h(counting)
+    for k, (gate, repetitions) in enumerate(controlled_powers(Q, t, method)):
+        for _ in range(repetitions):
+            qc.append(gate, [counting[k]] + list(range(width)))
+
+    qc.compose(synth_qft_full(t, inverse=True), counting, inplace=True)
+    qc.measure(counting, range(t))
+    return qc
+
+# ======================================================================
+# 3. DECODIFICACIÓN
+# ======================================================================
+
+def decode(y, n, t):
+    """Convierte el entero medido y en la amplitud y el número de soluciones estimados."""
+    N = 2**n
+    amplitude = float(np.sin(np.pi * y / 2**t) ** 2)
+    M = N * amplitude
+    # Cota de error estándar del conteo cuántico (Brassard-Høyer-Mosca-Tapp)
+    error = 2 * np.pi * np.sqrt(M * (N - M)) / 2**t + np.pi**2 * N / 4**t
+    return {
+        'y': int(y),
+        'amplitude': amplitude,
+        'num_solutions': M,
+        'num_solutions_rounded': int(round(M)),
+        'error_bound': float(error),
+    }
+
+def decode_counts(counts, n, t):
+    """Estimación a partir de los counts del registro de conteo (el y más frecuente)."""
+    y = int(max(counts, key=counts.get), 2)
+    estimate = decode(y, n, t)
+    shots = sum(counts.values())
+    # Distribución del número de soluciones redondeado
+    distribution = {}
+    for key, count in counts.items():
+        M = decode(int(key, 2), n, t)['num_solutions_rounded']
+        distribution[M] = distribution.get(M, 0) + count / shots
+    estimate['distribution'] = dict(sorted(distribution.items()))
+    return estimate
+
+# ======================================================================
+# 4. BACKEND ANALÍTICO
+# ======================================================================
+
+def ae_distribution(n, num_marked, t):
+    """
+    Distribución exacta de y sin simular el circuito: |s> es la suma de los
+    dos autovectores de Q con fases ±theta/pi, y cada uno da un núcleo de Fejér.
+    """
+    theta = np.arcsin(np.sqrt(num_marked / 2**n))
+    T = 2**t
+    y = np.arange(T)
+    probabilities = np.zeros(T)
+    for phase in (theta / np.pi, 1 - theta / np.pi):
+        delta = y - T * phase
+        numerator = np.sin(np.pi * delta)
+        denominator = T * np.sin(np.pi * delta / T)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            kernel = np.where(np.abs(denominator) < 1e-12, 1.0, (numerator / denominator) ** 2)
+        probabilities += kernel / 2
+    return probabilities / probabilities.sum()
+
+def sample_ae_counts(n, num_marked, t, shots=1024, seed=None):
+    """Counts de y (claves de t bits) muestreados de la distribución analítica."""
+    rng = np.random.default_rng(seed)
+    counts = rng.multinomial(shots, ae_distribution(n, num_marked, t))
+    return {format(int(y), f'0{t}b'): int(c) for y, c in enumerate(counts) if c}
+
+# ======================================================================
+# 5. MLAE: ESTIMACIÓN POR MÁXIMA VEROSIMILITUD (SIN REGISTRO DE CONTEO)
+# ======================================================================
+# Con m iteraciones de Grover, P(medir una solución) = sin^2((2m+1)*theta).
+# Se corren los circuitos normales de n qubits para varios m (un solo
+# trabajo), se cuenta cuántos shots dieron una solución (se verifica
+# clásicamente) y se ajusta theta. Sin qubits de conteo ni QFT.
+
+def mlae_schedule(num_powers):
+    """Esquema exponencial de iteraciones: 0, 1, 2, 4, ..., 2^(num_powers-2)."""
+    return [0] + [2**k for k in range(num_powers - 1)]
+
+def mlae_fit(schedule, hits, shots):
+    """
+    theta de máxima verosimilitud para `hits[k]` soluciones en `shots`
+    mediciones con `schedule[k]` iteraciones (búsqueda en grilla + refinamiento).
+    """
+    schedule = np.asarray(schedule)
+    hits = np.asarray(hits, dtype=float)
+    factors = 2 * schedule + 1
+
+    def log_likelihood(thetas):
+        p = np.clip(np.sin(np.outer(thetas, factors)) ** 2, 1e-12, 1 - 1e-12)
+        return (hits * np.log(p) + (shots - hits) * np.log(1 - p)).sum(axis=1)
+
+    # La verosimilitud oscila con período ~ pi/(2*max factor): grilla bien fina
+    grid = np.linspace(0, np.pi / 2, 200 * int(factors.max()) + 1)
+    best = grid[np.argmax(log_likelihood(grid))]
+    step = grid[1] - grid[0]
+    fine = np.linspace(max(0, best - step), min(np.pi / 2, best + step), 201)
+    theta = float(fine[np.argmax(log_likelihood(fine))])
+
+    # Información de Fisher de cada punto: 4 * shots * (2m+1)^2
+    theta_std = 1 / np.sqrt(4 * shots * np.sum(factors ** 2))
+    return theta, float(theta_std)
+
+def mlae_circuits(oracle, diffuser, n, schedule, backend):
+    """Circuitos de Grover ya compilados, uno por punto del esquema."""
+    from grover.cache import GroverCache, grover_iterate
+    # La iteración se transpila una sola vez para todo el esquema
+    cache = GroverCache(maxsize=1)
+    return [cache.grover_circuit(n, 'mlae', lambda: grover_iterate(oracle, diffuser), m, backend)
+            for m in schedule]
+
+def mlae(n, is_good, oracle=None, diffuser=None, schedule=None, shots=256,
+         backend=None, engine='aer', num_marked=None, seed=None):
+    """
+    Estima el número de soluciones M con MLAE.
+
+    `is_good(clave)` verifica clásicamente si una clave medida es solución.
+    Con engine='analytic' no se simula ningún circuito: los aciertos se
+    muestrean de sin^2((2m+1)*theta) usando `num_marked`.
+    """
+    if schedule is None:
+        schedule = mlae_schedule(max(2, n // 2 + 1))
+    N = 2**n
+
+    if engine == 'analytic':
+        rng = np.random.default_rng(seed)
+        true_theta = np.arcsin(np.sqrt(num_marked / N))
+        hits = [int(rng.binomial(shots, np.sin((2 * m + 1) * true_theta) ** 2)) for m in schedule]
+    elif engine == 'aer':
+        if backend is None:
+            from grover.noise import get_simulator
+            backend = get_simulator('ideal')
+        circuits = mlae_circuits(oracle, diffuser, n, schedule, backend)
+        run_options = {'shots': shots}
+        if seed is not None:
+            run_options['seed_simulator'] = seed
+        # Todos los puntos del esquema en un solo trabajo
+        result = backend.run(circuits, **run_options).result()
+        hits = [sum(count for key, count in result.get_counts(i).items() if is_good(key))
+                for i in range(len(schedule))]
+    else:
+        raise ValueError(f"Motor desconocido: {engine}")
+
+    theta, theta_std = mlae_fit(schedule, hits, shots)
+    amplitude = np.sin(theta) ** 2
+    return {
+        'schedule': list(schedule),
+        'hits': hits,
+        'shots': shots,
+        'theta': theta,
+        'amplitude': float(amplitude),
+        'num_solutions': float(N * amplitude),
+        'num_solutions_rounded': int(round(N * amplitude)),
+        # Propagación del error de theta: dM/dtheta = N * sin(2*theta)
+        'num_solutions_std': float(N * abs(np.sin(2 * theta)) * theta_std),
+    }
+
+# ======================================================================
+# 6. CONTEO PREVIO PARA ELEGIR EL NÚMERO DE ITERACIONES
+# ======================================================================
+
+def count_solutions(oracle, diffuser, n, t=None, shots=256, backend=None, seed=None):
+    """
+    Conteo cuántico (estimación de fase de Q): estima M sin conocer las
+    soluciones. Por defecto t = n/2 + 4 qubits de conteo, lo que deja el
+    error de M por debajo de 0.5 para M chico y el redondeo lo da exacto.
+    """
+    from qiskit import transpile
+    if t is None:
+        t = n // 2 + 4
+    if backend is None:
+        from grover.noise import get_simulator
+        backend = get_simulator('ideal')
+    qc = transpile(ae_circuit(grover_operator(oracle, diffuser), n, t), backend)
+    run_options = {'shots': shots}
+    if seed is not None:
+        run_options['seed_simulator'] = seed
+    counts = backend.run(qc, **run_options).result().get_counts()
+    estimate = decode_counts(counts, n, t)
+    estimate['t'] = t
+    return estimate
+
+def counted_iterations(n, estimate):
+    """R óptimo para el M estimado (0 si el conteo no encontró soluciones)."""
+    from grover.iterations import optimal_iterations
+    M = min(estimate['num_solutions_rounded'], 2**n)
+    return optimal_iterations(n, M) if M >= 1 else 0
@@ -0,0 +1,95 @@
+# grover/exact.py
+"""
+Modo exacto: probabilidades de una sola evolución, sin shots.
+
+En lugar de muestrear y estimar P(objetivo) con los counts (con ruido
+estadístico), se quitan las mediciones finales, se guarda la distribución
+del registro de búsqueda con `save_probabilities` de Aer (marginal: las
+ancillas quedan fuera) y se responde con los valores exactos. Para el
+oráculo de índices marcados alcanza el backend analítico (grover.analytic).
+
+ExactDistribution tiene las mismas consultas que grover.aggregate.ShotAggregator
+(top, most_frequent, target_probability, ...), así que los scripts pueden
+usar uno u otro sin cambios.
+"""
+import numpy as np
+
+from grover.telemetry import record_result, stage
+
+
+class ExactDistribution:
+    """Distribución exacta sobre num_bits bits, con top-k y probabilidad de objetivos."""
+
+    def __init__(self, num_bits, probabilities, targets=()):
+        self.num_bits = num_bits
+        self.probabilities = np.asarray(probabilities, dtype=float)
+        if self.probabilities.shape != (2**num_bits,):
+            raise ValueError(f"Se esperaban {2**num_bits} probabilidades, no {self.probabilities.shape}")
+        self.targets = np.asarray(sorted(set(targets)), dtype=np.int64)
+        # Ninguna muestra: las probabilidades salen de una sola evolución
+        self.shots = 0
+
+    def top(self, k=5):
+        """Los k resultados más probables como [(entero, probabilidad), ...] (orden decreciente)."""
+        k = min(k, self.probabilities.size)
+        best = np.argpartition(self.probabilities, -k)[-k:]
+        best = best[np.lexsort((best, -self.probabilities[best]))]
+        return [(int(i), float(self.probabilities[i])) for i in best]
+
+    def most_frequent(self):
+        """Resultado más probable (entero); mismo nombre que en ShotAggregator."""
+        return int(np.argmax(self.probabilities))
+
+    def probability(self, index):
+        return float(self.probabilities[index])
+
+    def target_probabilities(self):
+        """{objetivo: probabilidad exacta} de los objetivos registrados."""
+        return {int(t): float(self.probabilities[t]) for t in self.targets}
+
+    def target_probability(self):
+        """Probabilidad exacta de medir alguno de los objetivos."""
+        return float(self.probabilities[self.targets].sum())
+
+    def key(self, index):
+        """Clave binaria (como las de Qiskit) de un resultado."""
+        return format(index, f'0{self.num_bits}b')
+
+    def counts(self, shots=1024):
+        """Counts esperados (redondeados) con claves binarias, p. ej. para graficar."""
+        expected = np.rint(self.probabilities * shots).astype(np.int64)
+        indices = np.flatnonzero(expected)
+        return {self.key(int(i)): int(expected[i]) for i in indices}
+
+
+def probability_circuit(circuit, num_bits):
+    """Copia sin mediciones finales que guarda las probabilidades de los qubits 0..num_bits-1."""
+    import qiskit_aer  # noqa: F401  (registra save_probabilities en QuantumCircuit)
+    qc = circuit.remove_final_measurements(inplace=False)
+    qc.save_probabilities(range(num_bits))
+    return qc
+
+def exact_run(backend, circuits, num_bits, targets=(), **options):
+    """
+    Una evolución por circuito (ya transpilado, con o sin mediciones) en un
+    solo trabajo de Aer; devuelve una ExactDistribution por circuito.
+    `targets[i]` son los objetivos del circuito i.
+    """
+    noise_model = getattr(backend.options, 'noise_model', None)
+    if noise_model is not None and backend.options.method != 'density_matrix':
+        # Con ruido y statevector cada evolución sería una sola trayectoria
+        raise ValueError("Con ruido el modo exacto necesita method='density_matrix'")
+    if not targets:
+        targets = [()] * len(circuits)
+    probes = [probability_circuit(qc, num_bits) for qc in circuits]
+    with stage('simulate'):
+        result = backend.run(probes, shots=1, **options).result()
+    record_result(result)
+    return [ExactDistribution(num_bits, result.data(i)['probabilities'], t)
+            for i, t in enumerate(targets)]
+
+def exact_analytic(n, marked, iterations, targets=None):
+    """Distribución exacta del backend analítico (oráculo de índices marcados)."""
+    from grover.analytic import evolve
+    probabilities = evolve(n, marked, iterations) ** 2
+    return ExactDistribution(n, probabilities, np.atleast_1d(marked) if targets is None else targets)
@@ -0,0 +1,55 @@
+# grover/iterations.py
+"""
+Planificador analítico del número de iteraciones de Grover.
+
+Con M estados marcados en un espacio de N = 2^n estados, después de k
+iteraciones la probabilidad de medir un estado marcado es
+
+    P(k) = sin^2((2k + 1) * θ),   con sin(θ) = sqrt(M / N)
+
+así que el R óptimo se obtiene en forma cerrada sin simular nada.
+"""
+from math import asin, floor, ceil, pi, sin, sqrt
+
+# ======================================================================
+# 1. FORMA CERRADA
+# ======================================================================
+
+def grover_angle(n, num_marked=1):
+    """Devuelve θ tal que sin(θ) = sqrt(M / N)."""
+    N = 2**n
+    if not 0 < num_marked <= N:
+        raise ValueError(f"num_marked debe estar entre 1 y {N}, no {num_marked}")
+    return asin(sqrt(num_marked / N))
+
+def success_probability(n, iterations, num_marked=1):
+    """Probabilidad de medir un estado marcado tras `iterations` iteraciones."""
+    theta = grover_angle(n, num_marked)
+    return sin((2 * iterations + 1) * theta) ** 2
+
+def success_curve(n, num_marked=1, max_iterations=None):
+    """Lista con P(k) para k = 0..max_iterations (por defecto hasta 2*R óptimo)."""
+    theta = grover_angle(n, num_marked)
+    if max_iterations is None:
+        max_iterations = 2 * optimal_iterations(n, num_marked)
+    return [sin((2 * k + 1) * theta) ** 2 for k in range(max_iterations + 1)]
+
+def optimal_iterations(n, num_marked=1):
+    """R que maximiza P(k): el entero más cercano a π/(4θ) - 1/2."""
+    theta = grover_angle(n, num_marked)
+    r = pi / (4 * theta) - 0.5
+    candidates = {max(0, floor(r)), max(0, ceil(r))}
+    return max(sorted(candidates), key=lambda k: sin((2 * k + 1) * theta) ** 2)
+
+def plan_iterations(n, num_marked=1, with_curve=False):
+    """Calcula el R óptimo y su probabilidad de éxito (y la curva si se pide)."""
+    R = optimal_iterations(n, num_marked)
+    plan = {
+        'n': n,
+        'num_marked': num_marked,
+        'iterations': R,
+        'probability': success_probability(n, R, num_marked),
+    }
+    if with_curve:
+        plan['curve'] = success_curve(n, num_marked)
+    return plan
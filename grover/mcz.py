@@ -0,0 +1,125 @@
+# grover/mcz.py
+"""
+Constructor compartido de MCX/MCZ con ancillas.
+
+Sin ancillas, una MCX de k controles se descompone en un número de CX que
+crece rápidamente con k. Con ancillas limpias (V-chain con Toffolis de fase
+relativa) o sucias el costo pasa a ser lineal. Este módulo elige la
+descomposición más barata para el presupuesto de qubits disponible.
+"""
+from functools import lru_cache
+
+from qiskit import transpile
+from qiskit.synthesis import (
+    synth_mcx_1_clean_kg24,
+    synth_mcx_1_dirty_kg24,
+    synth_mcx_2_clean_kg24,
+    synth_mcx_2_dirty_kg24,
+    synth_mcx_n_clean_m15,
+    synth_mcx_n_dirty_i15,
+    synth_mcx_noaux_v24,
+)
+
+# Descomposiciones: modo -> (síntesis, requiere ancillas limpias)
+# Todas devuelven un circuito con los qubits ordenados como [controles, objetivo, ancillas].
+MCX_MODES = {
+    'noancilla': (synth_mcx_noaux_v24, False),
+    '1-dirty': (synth_mcx_1_dirty_kg24, False),
+    '2-dirty': (synth_mcx_2_dirty_kg24, False),
+    'v-chain-dirty': (synth_mcx_n_dirty_i15, False),
+    '1-clean': (synth_mcx_1_clean_kg24, True),
+    '2-clean': (synth_mcx_2_clean_kg24, True),
+    'v-chain': (synth_mcx_n_clean_m15, True),
+}
+
+# Por debajo de este número de controles usamos directamente CX/CCX/mcx
+MIN_SYNTH_CONTROLS = 3
+
+# ======================================================================
+# 1. COSTOS Y SELECCIÓN
+# ======================================================================
+
+@lru_cache(maxsize=None)
+def _synthesize(mode, num_controls):
+    synth, _ = MCX_MODES[mode]
+    return synth(num_controls)
+
+def ancillas_needed(mode, num_controls):
+    """Ancillas que usa la síntesis (p. ej. la V-chain sucia no usa ninguna con 3 controles)."""
+    return _synthesize(mode, num_controls).num_qubits - num_controls - 1
+
+@lru_cache(maxsize=None)
+def mcx_cost(mode, num_controls):
+    """(CX, profundidad) de una MCX de `num_controls` controles con el modo dado."""
+    qc = transpile(_synthesize(mode, num_controls), basis_gates=['u', 'cx'], optimization_level=1)
+    return qc.count_ops().get('cx', 0), qc.depth()
+
+def feasible_modes(num_controls, num_ancillas, clean=True):
+    """Modos que caben en `num_ancillas` (las sucias solo admiten modos 'dirty')."""
+    modes = []
+    for mode, (_, needs_clean) in MCX_MODES.items():
+        if ancillas_needed(mode, num_controls) <= num_ancillas and (clean or not needs_clean):
+            modes.append(mode)
+    return modes
+
+def select_mcx_mode(num_controls, num_ancillas=0, clean=True):
+    """Modo con menos CX (y luego menor profundidad) para el presupuesto de ancillas."""
+    if num_controls < MIN_SYNTH_CONTROLS:
+        return 'noancilla'
+    return min(feasible_modes(num_controls, num_ancillas, clean),
+               key=lambda mode: mcx_cost(mode, num_controls))
+
+def mcz_report(num_qubits, num_ancillas=0, clean=True):
+    """Costo (CX y profundidad) de cada descomposición posible para una MCZ de `num_qubits`."""
+    num_controls = num_qubits - 1
+    report = []
+    for mode in feasible_modes(num_controls, num_ancillas, clean):
+        cx, depth = mcx_cost(mode, num_controls)
+        report.append({
+            'mode': mode,
+            'ancillas': ancillas_needed(mode, num_controls),
+            'clean': MCX_MODES[mode][1],
+            'cx': cx,
+            'depth': depth,
+        })
+    return sorted(report, key=lambda row: (row['cx'], row['depth']))
+
+def print_mcz_report(num_qubits, num_ancillas=0, clean=True):
+    print(f"MCZ de {num_qubits} qubits con {num_ancillas} ancillas {'limpias' if clean else 'sucias'}:")
+    for row in mcz_report(num_qubits, num_ancillas, clean):
+        print(f"  {row['mode']:>14}: {row['ancillas']:>2} ancillas, {row['cx']:>5} CX, profundidad {row['depth']}")
+
+# ======================================================================
+# 2. CONSTRUCCIÓN
+# ======================================================================
+
+def mcx(qc, controls, target, ancillas=(), clean=True, mode='auto'):
+    """
+    Agrega a `qc` una MCX usando la descomposición más barata que quepa en
+    `ancillas`. Con mode='native' no se descompone (lo más rápido en Aer).
+    """
+    controls = list(controls)
+    ancillas = list(ancillas)
+    if mode == 'auto':
+        mode = select_mcx_mode(len(controls), len(ancillas), clean)
+    # 'native': se deja la MCX sin descomponer; Aer la aplica como una sola operación
+    if mode == 'native' or len(controls) < MIN_SYNTH_CONTROLS:
+        qc.mcx(controls, target)
+        return qc
+
+    needed = ancillas_needed(mode, len(controls))
+    if needed > len(ancillas):
+        raise ValueError(f"El modo {mode} necesita {needed} ancillas y solo hay {len(ancillas)}")
+    qc.compose(_synthesize(mode, len(controls)), controls + [target] + ancillas[:needed], inplace=True)
+    return qc
+
+def mcz(qc, qubits, ancillas=(), clean=True, mode='auto'):
+    """Agrega una MCZ (fase -1 sobre |11...1> de `qubits`) implementada como H + MCX + H."""
+    qubits = list(qubits)
+    if len(qubits) == 1:
+        qc.z(qubits[0])
+        return qc
+    qc.h(qubits[-1])
+    mcx(qc, qubits[:-1], qubits[-1], ancillas, clean, mode)
+    qc.h(qubits[-1])
+    return qc
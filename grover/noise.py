@@ -0,0 +1,268 @@
+# grover/noise.py
+"""
+Simulación con ruido: perfiles de ruido con nombre, elección del método de
+Aer y reparto de los shots en tandas (grover.aggregate las ejecuta).
+
+Cada perfil se construye una sola vez (NoiseModel y AerSimulator quedan en
+caché), y el método se elige según el tamaño del circuito:
+
+- matriz densidad: exacta y sin trayectorias, pero ocupa 16 * 4^n bytes;
+  conviene si cabe en memoria y 2^n <= shots;
+- statevector: con ruido Aer simula una trayectoria por shot (16 * 2^n bytes);
+- matrix_product_state: cuando el statevector no cabe, o para circuitos
+  ruidosos grandes y poco profundos (poco entrelazamiento);
+- extended_stabilizer: circuitos sin ruido casi Clifford (pocas T).
+
+`plan_method` estima la memoria de cada método antes de simular (la del MPS
+con una cota de la dimensión de enlace según las compuertas que cruzan cada
+corte) y elige el que cabe en el límite configurable (GROVER_MEMORY_LIMIT),
+o se niega con una explicación en lugar de dejar que el proceso muera por OOM.
+"""
+import os
+import re
+from functools import lru_cache
+
+import numpy as np
+
+from qiskit_aer import AerSimulator
+from qiskit_aer.noise import NoiseModel
+from qiskit_aer.noise.errors import depolarizing_error
+
+# perfil -> {número de qubits: (probabilidad de error despolarizante, compuertas)}
+NOISE_PROFILES = {
+    'ideal': {},
+    # El modelo que usaban main1.py y ArchivoCon-SinRuido.py
+    'depolarizing': {1: (0.02, ('x', 'h')), 2: (0.03, ('cx',))},
+    'depolarizing-low': {1: (0.001, ('x', 'h', 'sx')), 2: (0.01, ('cx',))},
+}
+
+# Memoria máxima para el estado simulado (bytes); se puede cambiar con
+# GROVER_MEMORY_LIMIT (p. ej. "512M" o "4G") para meter varios trabajos por nodo
+MEMORY_BUDGET = 2 * 1024**3
+MEMORY_LIMIT_ENV = 'GROVER_MEMORY_LIMIT'
+# Con ruido, a partir de este tamaño un circuito poco profundo va a MPS
+MPS_MIN_QUBITS = 20
+MPS_MAX_DEPTH_PER_QUBIT = 4
+# Estabilizador extendido: ~2^(0.23 t) estados para t compuertas no Clifford
+STABILIZER_RANK_EXPONENT = 0.23
+CLIFFORD_GATES = {
+    'id', 'x', 'y', 'z', 'h', 's', 'sdg', 'sx', 'sxdg', 'cx', 'cy', 'cz', 'swap',
+    'measure', 'barrier', 'reset',
+}
+# Compuertas de dos qubits con rango de Schmidt 2 (como las controladas)
+RANK_TWO_GATES = {'rzz', 'rxx', 'ryy', 'rzx'}
+
+# ======================================================================
+# 1. PERFILES Y SIMULADORES EN CACHÉ
+# ======================================================================
+
+@lru_cache(maxsize=None)
+def get_noise_model(profile='depolarizing'):
+    """NoiseModel del perfil (None para 'ideal'). Es compartido: no modificarlo."""
+    if profile not in NOISE_PROFILES:
+        raise ValueError(f"Perfil de ruido desconocido: {profile}. Opciones: {list(NOISE_PROFILES)}")
+    spec = NOISE_PROFILES[profile]
+    if not spec:
+        return None
+    noise_model = NoiseModel()
+    for num_qubits, (probability, gates) in spec.items():
+        noise_model.add_all_qubit_quantum_error(depolarizing_error(probability, num_qubits), list(gates))
+    return noise_model
+
+@lru_cache(maxsize=None)
+def get_simulator(profile='ideal', method='automatic'):
+    """AerSimulator compartido para (perfil, método)."""
+    return AerSimulator(method=method, noise_model=get_noise_model(profile))
+
+# ======================================================================
+# 2. MEMORIA Y MÉTODO DE SIMULACIÓN
+# ======================================================================
+
+def parse_memory(value):
+    """Bytes de un tamaño como 512M, 4G, 1.5GiB o un entero."""
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = re.fullmatch(r'\s*([\d.]+)\s*([KMGT]?)(i?B)?\s*', str(value), re.IGNORECASE)
+    if match is None:
+        raise ValueError(f"Tamaño de memoria inválido: {value!r}")
+    number, unit = float(match.group(1)), match.group(2).upper()
+    return int(number * 1024**' KMGT'.index(unit or ' '))
+
+def memory_limit(limit=None):
+    """Límite de memoria en bytes: `limit`, GROVER_MEMORY_LIMIT o MEMORY_BUDGET."""
+    if limit is None:
+        limit = os.environ.get(MEMORY_LIMIT_ENV) or MEMORY_BUDGET
+    return parse_memory(limit)
+
+def format_memory(num_bytes):
+    for unit in ('B', 'KiB', 'MiB', 'GiB', 'TiB'):
+        if num_bytes < 1024 or unit == 'TiB':
+            return f"{num_bytes:.0f} {unit}" if unit == 'B' else f"{num_bytes:.3g} {unit}"
+        num_bytes /= 1024
+
+@lru_cache(maxsize=1)
+def _standard_gate_names():
+    from qiskit.circuit.library import get_standard_gate_name_mapping
+    return frozenset(get_standard_gate_name_mapping()) | {'mcx', 'mcphase', 'unitary', 'diagonal'}
+
+def _flat_instructions(circuit, qubits=None):
+    """(operación, posiciones de sus qubits), expandiendo las compuertas compuestas (oráculo, difusor)."""
+    if qubits is None:
+        qubits = range(circuit.num_qubits)
+    qubits = list(qubits)
+    for instruction in circuit.data:
+        operation = instruction.operation
+        positions = [qubits[circuit.find_bit(q).index] for q in instruction.qubits]
+        if operation.name not in _standard_gate_names() and getattr(operation, 'definition', None) is not None:
+            yield from _flat_instructions(operation.definition, positions)
+        else:
+            yield operation, positions
+
+def bond_dimensions(circuit):
+    """
+    Cota de la dimensión de enlace del MPS en cada corte (entre el qubit i y
+    el i+1): cada compuerta que cruza el corte la multiplica a lo sumo por su
+    rango de Schmidt (2 para las controladas, 4^k en general), y nunca pasa
+    de 2^(qubits del lado más chico).
+    """
+    from qiskit.circuit import ControlledGate
+
+    n = circuit.num_qubits
+    growth = np.zeros(max(n - 1, 0))     # log2 del factor acumulado por corte
+    for operation, positions in _flat_instructions(circuit):
+        if len(positions) < 2 or operation.name == 'barrier':
+            continue
+        positions = sorted(positions)
+        rank_two = isinstance(operation, ControlledGate) or operation.name in RANK_TWO_GATES
+        for cut in range(positions[0], positions[-1]):
+            left = sum(1 for position in positions if position <= cut)
+            growth[cut] += 1 if rank_two else 2 * min(left, len(positions) - left)
+    sides = np.minimum(np.arange(1, n), n - np.arange(1, n))
+    return 2.0 ** np.minimum(growth, sides)
+
+def non_clifford_count(circuit):
+    """
+    Compuertas no Clifford: una Toffoli cuenta 7 T y una compuerta con k >= 2
+    controles (MCX, MCZ/mcphase) 7(2k - 3).
+    """
+    count = 0
+    for operation, _ in _flat_instructions(circuit):
+        num_controls = getattr(operation, 'num_ctrl_qubits', 0)
+        if num_controls >= 2:
+            count += 7 * (2 * num_controls - 3)
+        elif operation.name not in CLIFFORD_GATES:
+            count += 1
+    return count
+
+def estimate_memory(circuit, max_bond_dimension=None):
+    """Bytes del estado de cada método de Aer para `circuit` (cotas, no mediciones)."""
+    n = circuit.num_qubits
+    bonds = bond_dimensions(circuit)
+    if max_bond_dimension is not None:
+        bonds = np.minimum(bonds, max_bond_dimension)
+    # Un tensor por qubit: 2 x chi_izq x chi_der amplitudes complejas
+    chi = np.concatenate([[1.0], bonds, [1.0]])
+    mps = float(np.sum(16 * 2 * chi[:-1] * chi[1:]))
+    # Cada estado del estabilizador: tableau de ~2n^2 bits más la fase
+    exponent = STABILIZER_RANK_EXPONENT * non_clifford_count(circuit)
+    stabilizer = 2**exponent * (2 * n * n / 8 + 16) if exponent < 512 else float('inf')
+    return {
+        'statevector': 16 * 2**n,
+        'density_matrix': 16 * 4**n,
+        'matrix_product_state': mps,
+        'extended_stabilizer': stabilizer,
+    }
+
+def plan_method(circuits, noisy=False, shots=1024, limit=None, max_bond_dimension=None):
+    """
+    Elige el método de Aer con la memoria estimada del circuito más grande:
+
+    - con ruido, matriz densidad si cabe y 2^n <= shots;
+    - statevector si cabe (salvo circuitos ruidosos grandes y poco profundos,
+      que van a MPS si su cota cabe);
+    - MPS si la cota de su memoria cabe (`max_bond_dimension` la acota,
+      truncando: el resultado pasa a ser aproximado);
+    - estabilizador extendido (sin ruido) si hay pocas compuertas no Clifford.
+
+    Si nada cabe lanza MemoryError con las estimaciones. Devuelve el método,
+    las estimaciones y las opciones para backend.run (incluye max_memory_mb,
+    así Aer también se niega en lugar de pasar el límite).
+    """
+    if not isinstance(circuits, (list, tuple)):
+        circuits = [circuits]
+    limit = memory_limit(limit)
+    widest = max(circuits, key=lambda qc: qc.num_qubits)
+    n = widest.num_qubits
+    depth = max(qc.depth() for qc in circuits)
+    estimates = {}
+    for qc in circuits:
+        for method, size in estimate_memory(qc, max_bond_dimension).items():
+            estimates[method] = max(estimates.get(method, 0), size)
+
+    fits = {method: size <= limit for method, size in estimates.items()}
+    shallow = n >= MPS_MIN_QUBITS and depth <= MPS_MAX_DEPTH_PER_QUBIT * n
+    if noisy and fits['density_matrix'] and 2**n <= shots:
+        method = 'density_matrix'
+    elif fits['statevector'] and not (noisy and shallow and fits['matrix_product_state']):
+        method = 'statevector'
+    elif fits['matrix_product_state']:
+        method = 'matrix_product_state'
+    elif not noisy and fits['extended_stabilizer']:
+        method = 'extended_stabilizer'
+    else:
+        detail = ", ".join(f"{name} {format_memory(size)}" for name, size in estimates.items())
+        raise MemoryError(
+            f"El circuito de {n} qubits (profundidad {depth}) no entra en {format_memory(limit)}: "
+            f"{detail}. Opciones: subir {MEMORY_LIMIT_ENV}, acotar la dimensión de enlace del MPS "
+            f"(max_bond_dimension, resultado aproximado) o achicar el circuito.")
+
+    options = memory_options(limit)
+    if method == 'matrix_product_state' and max_bond_dimension is not None:
+        options['matrix_product_state_max_bond_dimension'] = int(max_bond_dimension)
+    return {
+        'method': method,
+        'num_qubits': n,
+        'depth': depth,
+        'memory': estimates[method],
+        'limit': limit,
+        'estimates': estimates,
+        'options': options,
+    }
+
+def memory_options(limit=None):
+    """Opciones de backend.run para que Aer respete el límite de memoria (max_memory_mb)."""
+    return {'max_memory_mb': max(1, int(memory_limit(limit) // 1024**2))}
+
+def simulator_for(circuits, profile='depolarizing', shots=1024, limit=None):
+    """
+    Simulador en caché con el método que `plan_method` elige para `circuits`
+    y las opciones de ejecución del plan (p. ej. max_memory_mb), que se pasan
+    a `backend.run` para que Aer respete el mismo límite.
+
+    `profile` también puede ser un AerSimulator (con method='automatic'): se
+    planifica con su modelo de ruido y se devuelve un simulador con ese ruido.
+    """
+    if isinstance(profile, str):
+        plan = plan_method(circuits, get_noise_model(profile) is not None, shots, limit)
+        return get_simulator(profile, plan['method']), plan['options']
+    noise_model = profile.options.noise_model
+    plan = plan_method(circuits, noise_model is not None, shots, limit)
+    return AerSimulator(method=plan['method'], noise_model=noise_model), plan['options']
+
+# ======================================================================
+# 3. EJECUCIÓN POR TANDAS DE SHOTS
+# ======================================================================
+
+def shot_chunks(shots, shot_batch=None, backend=None):
+    """
+    Reparte `shots` en tandas de a lo sumo `shot_batch`. Con trayectorias
+    ruidosas cada tanda es un trabajo acotado en tiempo; con matriz densidad
+    no se divide (la evolución es la misma y el muestreo es gratis).
+    """
+    method = getattr(backend.options, 'method', None) if backend is not None else None
+    if not shot_batch or shot_batch >= shots or method == 'density_matrix':
+        return [shots]
+    chunks = [shot_batch] * (shots // shot_batch)
+    if shots % shot_batch:
+        chunks.append(shots % shot_batch)
+    return chunks
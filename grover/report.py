@@ -0,0 +1,204 @@
+# grover/report.py
+"""
+Gráficos fuera del camino crítico.
+
+Los histogramas y dibujos de circuitos se guardan como PNG/SVG (backend
+Agg, sin ventanas) en un proceso aparte, y el script sigue sin esperar.
+Está apagado por defecto: se activa con la variable de entorno
+GROVER_REPORT=<directorio> o pasando `directory` a Reporter.
+
+    with Reporter() as report:             # no hace nada si GROVER_REPORT no está
+        report.histogram('grover', counts)
+        report.circuit('grover_circuito', qc)
+    # al salir del with se espera a que terminen los archivos
+
+Con deferred=True los trabajos se juntan y se dibujan todos en `flush()`
+(p. ej. después de un barrido completo).
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Directorio de salida; sin esta variable los reportes están apagados
+REPORT_ENV = 'GROVER_REPORT'
+# Resultados más frecuentes que se dibujan en un histograma (el resto se agrupa)
+HISTOGRAM_MAX_BARS = 32
+# Largo máximo (en instrucciones) de un bloque repetido que se resume
+SUMMARY_MAX_PERIOD = 8
+
+
+def report_dir():
+    """Directorio de GROVER_REPORT, o None si los reportes están apagados."""
+    return os.environ.get(REPORT_ENV) or None
+
+# ======================================================================
+# 1. RESUMEN DE BLOQUES REPETIDOS
+# ======================================================================
+
+def _signature(instruction):
+    return (instruction.operation.name, tuple(instruction.qubits), tuple(instruction.clbits))
+
+def summarize_circuit(circuit, max_period=SUMMARY_MAX_PERIOD):
+    """
+    Copia del circuito para dibujar: cada secuencia de instrucciones que se
+    repite seguida (p. ej. oráculo + difusor R veces) queda como una sola
+    caja "bloque ×R" sobre los mismos qubits.
+    """
+    from qiskit import QuantumCircuit
+    from qiskit.circuit import Gate
+
+    data = circuit.data
+    signatures = [_signature(instruction) for instruction in data]
+    summary = QuantumCircuit(*circuit.qregs, *circuit.cregs, name=circuit.name)
+    i = 0
+    while i < len(data):
+        best_period, best_repetitions = 1, 1
+        for period in range(1, max_period + 1):
+            block = signatures[i:i + period]
+            if len(block) < period:
+                break
+            repetitions = 1
+            while signatures[i + repetitions * period:i + (repetitions + 1) * period] == block:
+                repetitions += 1
+            if repetitions > 1 and period * repetitions > best_period * best_repetitions:
+                best_period, best_repetitions = period, repetitions
+        if best_repetitions == 1:
+            summary.append(data[i])
+            i += 1
+            continue
+        block = data[i:i + best_period]
+        qubits = sorted({q for instruction in block for q in instruction.qubits}, key=lambda q: circuit.find_bit(q).index)
+        label = " + ".join(instruction.operation.label or instruction.operation.name
+                           for instruction in block)
+        # Compuerta opaca solo para el dibujo
+        box = Gate("bloque", len(qubits), [], label=f"{label} ×{best_repetitions}")
+        summary.append(box, qubits)
+        i += best_period * best_repetitions
+    return summary
+
+# ======================================================================
+# 2. DIBUJO (DENTRO DEL PROCESO DE REPORTES)
+# ======================================================================
+
+def _save(figure, stem, formats):
+    paths = []
+    for fmt in formats:
+        path = f"{stem}.{fmt}"
+        figure.savefig(path, bbox_inches='tight')
+        paths.append(path)
+    return paths
+
+def _render_histogram(stem, formats, data, legend, title, number_to_keep):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from qiskit.visualization import plot_histogram
+
+    figure = plot_histogram(data, legend=legend, title=title, number_to_keep=number_to_keep)
+    try:
+        return _save(figure, stem, formats)
+    finally:
+        plt.close(figure)
+
+def _render_circuit(stem, formats, circuit, max_period):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from qiskit.exceptions import MissingOptionalLibraryError
+
+    summary = summarize_circuit(circuit, max_period)
+    try:
+        figure = summary.draw('mpl', fold=-1)
+    except MissingOptionalLibraryError:
+        # Sin pylatexenc no hay dibujo 'mpl': se guarda el dibujo de texto
+        path = f"{stem}.txt"
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write(str(summary.draw('text', fold=-1)))
+        return [path]
+    try:
+        return _save(figure, stem, formats)
+    finally:
+        plt.close(figure)
+
+# ======================================================================
+# 3. REPORTER
+# ======================================================================
+
+class Reporter:
+    """Cola de gráficos que se dibujan en segundo plano (o todos juntos con deferred=True)."""
+
+    def __init__(self, directory=None, formats=('png',), deferred=False, workers=1):
+        self.directory = directory or report_dir()
+        self.enabled = self.directory is not None
+        self.formats = tuple(formats)
+        self.deferred = deferred
+        self.workers = workers
+        self._pool = None
+        self._pending = []      # trabajos sin enviar (modo diferido)
+        self._futures = []
+
+    def _stem(self, name):
+        return os.path.join(self.directory, name)
+
+    def _submit(self, function, *args):
+        if self.deferred:
+            self._pending.append((function, args))
+            return
+        if self._pool is None:
+            os.makedirs(self.directory, exist_ok=True)
+            # 'spawn': hacer fork de un proceso que ya usó Aer (OpenMP) puede bloquearse
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context('spawn'))
+        self._futures.append(self._pool.submit(function, *args))
+
+    def histogram(self, name, data, legend=None, title=None, number_to_keep=HISTOGRAM_MAX_BARS):
+        """
+        Histograma de `data`: dict de counts, lista de dicts o ShotAggregator
+        (sus claves binarias solo se arman si el reporte está activo).
+        """
+        if not self.enabled:
+            return
+        if hasattr(data, 'counts'):
+            data = data.counts()
+        self._submit(_render_histogram, self._stem(name), self.formats, data, legend, title, number_to_keep)
+
+    def circuit(self, name, circuit, max_period=SUMMARY_MAX_PERIOD):
+        """Dibujo del circuito con los bloques repetidos resumidos."""
+        if not self.enabled:
+            return
+        self._submit(_render_circuit, self._stem(name), self.formats, circuit, max_period)
+
+    def flush(self):
+        """Dibuja lo pendiente, espera a que terminen todos los trabajos y devuelve las rutas."""
+        pending, self._pending = self._pending, []
+        deferred, self.deferred = self.deferred, False
+        for function, args in pending:
+            self._submit(function, *args)
+        self.deferred = deferred
+        futures, self._futures = self._futures, []
+        paths = []
+        for future in futures:
+            try:
+                paths.extend(future.result())
+            except Exception as error:
+                # Un gráfico que falla no debe tumbar la corrida
+                print(f"⚠️ No se pudo generar un reporte: {error!r}")
+        return paths
+
+    def close(self):
+        try:
+            paths = self.flush()
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+        if paths:
+            print(f"Reportes guardados: {', '.join(paths)}")
+        return paths
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
@@ -0,0 +1,42 @@
+# grover/runner.py
+"""
+API `run()` para ejecutar Grover sin efectos secundarios: sin prints, sin
+gráficos y reutilizando un mismo simulador y la caché de iteraciones
+compiladas entre llamadas.
+"""
+from functools import partial
+
+from grover.batch import run_batch
+from grover.builders import create_grover_diffuser, create_oracle
+from grover.iterations import plan_iterations
+from grover.telemetry import Telemetry
+
+def run(n, target, shots=1024, iterations=None, engine='aer', backend=None,
+        num_ancillas=0, seed=None, noise=None, telemetry=None):
+    """
+    Busca la contraseña `target` (entero) con Grover sobre n qubits.
+
+    Devuelve un diccionario con las iteraciones usadas, los counts, la clave
+    más probable y la probabilidad medida del objetivo. `noise` es un perfil
+    de grover.noise (p. ej. 'depolarizing'). Con telemetry=True (o un
+    grover.telemetry.Telemetry, p. ej. con perfilador) la fila incluye el
+    registro de tiempos y memoria por etapa en 'telemetry'.
+    """
+    if telemetry:
+        if telemetry is True:
+            telemetry = Telemetry()
+        with telemetry:
+            row = run(n, target, shots, iterations, engine, backend, num_ancillas, seed, noise)
+        row['telemetry'] = telemetry.record()
+        return row
+
+    if iterations is None:
+        iterations = plan_iterations(n)['iterations']
+    row, = run_batch(
+        n, [target],
+        partial(create_oracle, num_ancillas=num_ancillas),
+        partial(create_grover_diffuser, num_ancillas=num_ancillas),
+        shots=shots, iterations=iterations, backend=backend, seed=seed, engine=engine,
+        noise=noise)
+    row['iterations'] = iterations
+    return row
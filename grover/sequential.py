@@ -0,0 +1,93 @@
+# grover/sequential.py
+"""
+Muestreo secuencial: se piden shots en tandas crecientes (8, 8, 16, 32, ...)
+y se corta en cuanto una cota de confianza decide la pregunta:
+
+- rule='top': el resultado más frecuente es el verdadero más probable;
+- rule='threshold': la probabilidad del objetivo es mayor (o menor) que un umbral
+  (la condición "P(objetivo) > 0.5" de GAS).
+
+Las cotas son de Hoeffding con gasto de alfa alpha/(k(k+1)) en la mirada k,
+así que siguen siendo válidas aunque se mire después de cada tanda.
+Útil cuando cada shot cuesta (trayectorias con ruido, hardware real).
+"""
+from math import log, sqrt
+
+from grover.aggregate import ShotAggregator
+
+
+def confidence_radius(shots, alpha, look):
+    """Radio de Hoeffding para una proporción estimada con `shots` en la mirada `look` (1, 2, ...)."""
+    alpha_look = alpha / (look * (look + 1))
+    return sqrt(log(2 / alpha_look) / (2 * shots))
+
+
+def backend_draw(backend, circuit, seed=None):
+    """Fuente de shots: cada tanda es un backend.run del circuito (ya transpilado)."""
+    def draw(aggregator, shots, look):
+        options = {'shots': shots}
+        if seed is not None:
+            options['seed_simulator'] = seed + look
+        aggregator.add_result(backend.run(circuit, **options).result())
+    return draw
+
+
+class SequentialSampler:
+    """Pide shots por tandas a `draw(aggregator, shots, look)` hasta decidir o agotar `max_shots`."""
+
+    def __init__(self, draw, num_bits, targets=(), confidence=0.99, first_batch=8, max_shots=1024):
+        self.draw = draw
+        self.num_bits = num_bits
+        self.targets = targets
+        self.alpha = 1 - confidence
+        self.first_batch = first_batch
+        self.max_shots = max_shots
+
+    def _decide(self, aggregator, rule, threshold, radius):
+        if rule == 'top':
+            top = aggregator.top(2)
+            first = top[0][1] / aggregator.shots
+            second = top[1][1] / aggregator.shots if len(top) > 1 else 0.0
+            # El primero le gana al segundo (y a todos los demás, que tienen menos)
+            return top[0][0] if first - radius > second + radius else None
+        if rule == 'threshold':
+            p = aggregator.target_probability()
+            if p - radius > threshold:
+                return True
+            if p + radius < threshold:
+                return False
+            return None
+        raise ValueError(f"Regla desconocida: {rule}")
+
+    def run(self, rule='top', threshold=0.5):
+        """
+        Devuelve un diccionario con la decisión (None si no se llegó a decidir),
+        los shots usados, la cantidad de tandas y el ShotAggregator acumulado.
+        """
+        aggregator = ShotAggregator(self.num_bits, self.targets)
+        batch, look, decision, radius = self.first_batch, 0, None, 1.0
+        while aggregator.shots < self.max_shots:
+            look += 1
+            self.draw(aggregator, min(batch, self.max_shots - aggregator.shots), look)
+            radius = confidence_radius(aggregator.shots, self.alpha, look)
+            decision = self._decide(aggregator, rule, threshold, radius)
+            if decision is not None:
+                break
+            # Tandas que duplican lo acumulado: O(log shots) trabajos
+            batch = aggregator.shots
+        return {
+            'decision': decision,
+            'decided': decision is not None,
+            'shots': aggregator.shots,
+            'looks': look,
+            'radius': radius,
+            'aggregator': aggregator,
+        }
+
+
+def sequential_run(backend, circuit, num_bits, targets=(), rule='top', threshold=0.5,
+                   confidence=0.99, first_batch=8, max_shots=1024, seed=None):
+    """Atajo: SequentialSampler sobre un circuito ya transpilado para `backend`."""
+    sampler = SequentialSampler(backend_draw(backend, circuit, seed), num_bits, targets,
+                                confidence, first_batch, max_shots)
+    return sampler.run(rule, threshold)
@@ -0,0 +1,241 @@
+# grover/service.py
+"""
+Servicio local de búsquedas de Grover: un proceso de larga vida con una
+cola de trabajos y un pool de workers ya calientes.
+
+Cada worker (proceso 'spawn') importa qiskit y arma sus simuladores UNA
+sola vez al arrancar (grover.noise.get_simulator está en caché) y conserva
+entre trabajos la caché de iteraciones compiladas (grover.cache), así que un
+trabajo solo paga construir, simular y contar.
+
+El frente es asyncio con un protocolo de líneas JSON sobre TCP:
+
+    -> {"id": 1, "n": 7, "targets": [85, 42], "shots": 1024, "noise": null}
+    <- {"id": 1, "status": "ok", "rows": [...], "elapsed": 0.12, "worker": 4242}
+
+Las respuestas salen a medida que terminan (no en orden: usar "id"). Campos
+opcionales del trabajo: "target" (en vez de "targets"), "iterations",
+"seed", "num_ancillas", "engine" y "keep_counts". Con `max_pending`
+trabajos en curso el servidor deja de leer pedidos (contrapresión: el
+cliente queda bloqueado en TCP en lugar de llenar la memoria).
+
+    python -m grover.service --port 8765 --workers 4
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+HOST = '127.0.0.1'
+PORT = 8765
+# Trabajos en curso (en cola del pool o ejecutándose) por worker
+PENDING_PER_WORKER = 4
+# Perfiles cuyos simuladores se arman al arrancar cada worker
+WARM_PROFILES = ('ideal', 'depolarizing')
+# Métodos de Aer que puede elegir grover.noise.plan_method
+SIMULATION_METHODS = ('automatic', 'statevector', 'density_matrix', 'matrix_product_state',
+                      'extended_stabilizer')
+
+# ======================================================================
+# 1. WORKERS
+# ======================================================================
+
+def _init_worker(threads, profiles):
+    """Arranque del worker: reparte los núcleos y calienta qiskit y los simuladores."""
+    # Antes de importar Aer: cada worker usa su parte de los núcleos (OpenMP)
+    os.environ['OMP_NUM_THREADS'] = str(threads)
+    from grover.batch import run_batch
+    from grover.builders import create_grover_diffuser, create_oracle
+    from grover.noise import get_simulator
+    # run_batch elige el método según la memoria: cada variante del perfil usa los mismos hilos
+    for profile, method in product(profiles, SIMULATION_METHODS):
+        get_simulator(profile, method).set_options(max_parallel_threads=threads)
+    # Un trabajo mínimo carga la biblioteca de Aer y el transpilador
+    run_batch(2, [0], create_oracle, create_grover_diffuser, shots=1,
+              backend=get_simulator('ideal'), keep_counts=False)
+
+def run_job(job):
+    """Ejecuta un trabajo (dict) en el worker y devuelve su respuesta (dict serializable)."""
+    from functools import partial
+
+    from grover.batch import run_batch
+    from grover.builders import create_grover_diffuser, create_oracle
+    from grover.noise import get_simulator
+
+    start = time.perf_counter()
+    n = int(job['n'])
+    targets = job['targets'] if 'targets' in job else [job['target']]
+    noise = job.get('noise')
+    num_ancillas = job.get('num_ancillas', 0)
+    engine = job.get('engine', 'aer')
+    # Sin ruido se usa el simulador caliente del worker; run_batch elige el
+    # método (y el límite de memoria) según la memoria estimada
+    backend = get_simulator('ideal') if noise is None and engine == 'aer' else None
+    rows = run_batch(
+        n, [int(t) for t in targets],
+        partial(create_oracle, num_ancillas=num_ancillas),
+        partial(create_grover_diffuser, num_ancillas=num_ancillas),
+        shots=int(job.get('shots', 1024)), iterations=job.get('iterations'), backend=backend,
+        seed=job.get('seed'), engine=engine, noise=noise, keep_counts=job.get('keep_counts', True))
+    return {
+        'id': job.get('id'),
+        'status': 'ok',
+        'rows': rows,
+        'elapsed': time.perf_counter() - start,
+        'worker': os.getpid(),
+    }
+
+# ======================================================================
+# 2. FRENTE ASYNCIO
+# ======================================================================
+
+class GroverService:
+    """Pool de workers calientes con un límite de trabajos en curso."""
+
+    def __init__(self, workers=None, max_pending=None, profiles=WARM_PROFILES):
+        self.workers = workers or max(1, (os.cpu_count() or 1) // 2)
+        self.max_pending = max_pending or PENDING_PER_WORKER * self.workers
+        threads = max(1, (os.cpu_count() or 1) // self.workers)
+        # 'spawn': hacer fork de un proceso que ya usó Aer (OpenMP) puede bloquearse
+        self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                         mp_context=multiprocessing.get_context('spawn'),
+                                         initializer=_init_worker, initargs=(threads, tuple(profiles)))
+        self._slots = None
+        self.completed = 0
+        self.failed = 0
+
+    async def submit(self, job):
+        """Ejecuta un trabajo; espera si ya hay `max_pending` en curso."""
+        async with self._acquire():
+            return await self._execute(job)
+
+    def _acquire(self):
+        # El semáforo se crea dentro del loop que lo usa
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        return self._slots
+
+    async def _execute(self, job):
+        # El id se lee antes: el manejo del error no debe poder fallar
+        job_id = job.get('id') if isinstance(job, dict) else None
+        loop = asyncio.get_running_loop()
+        try:
+            if not isinstance(job, dict):
+                raise TypeError(f"el trabajo debe ser un objeto JSON, no {type(job).__name__}")
+            response = await loop.run_in_executor(self._pool, run_job, job)
+            self.completed += 1
+        except Exception as error:
+            self.failed += 1
+            response = {'id': job_id, 'status': 'error', 'error': f"{type(error).__name__}: {error}"}
+        return response
+
+    async def as_completed(self, jobs):
+        """Ejecuta `jobs` y entrega las respuestas a medida que terminan."""
+        slots = self._acquire()
+        tasks = []
+        for job in jobs:
+            # Contrapresión: no se encola un trabajo más hasta que haya lugar
+            await slots.acquire()
+            task = asyncio.create_task(self._execute(job))
+            task.add_done_callback(lambda _: slots.release())
+            tasks.append(task)
+        for task in asyncio.as_completed(tasks):
+            yield await task
+
+    async def handle_connection(self, reader, writer):
+        """Una conexión: una línea JSON por trabajo, una línea JSON por respuesta."""
+        slots = self._acquire()
+        lock = asyncio.Lock()
+        tasks = set()
+
+        async def reply(response):
+            async with lock:
+                writer.write((json.dumps(response) + '\n').encode())
+                await writer.drain()
+
+        async def answer(job):
+            try:
+                response = await self._execute(job)
+            finally:
+                slots.release()
+            await reply(response)
+
+        while line := await reader.readline():
+            if not line.strip():
+                continue
+            try:
+                job = json.loads(line)
+            except json.JSONDecodeError as error:
+                await reply({'id': None, 'status': 'error', 'error': f"JSON inválido: {error}"})
+                continue
+            if not isinstance(job, dict):
+                await reply({'id': None, 'status': 'error',
+                             'error': f"El trabajo debe ser un objeto JSON, no {type(job).__name__}"})
+                continue
+            # Con el pool lleno no se lee el siguiente pedido
+            await slots.acquire()
+            task = asyncio.create_task(answer(job))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            # Una respuesta que falla (p. ej. el cliente cerró) no descarta las demás
+            await asyncio.gather(*tasks, return_exceptions=True)
+        writer.close()
+        await writer.wait_closed()
+
+    async def serve(self, host=HOST, port=PORT):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"Servicio de Grover en {host}:{port} ({self.workers} workers, "
+              f"hasta {self.max_pending} trabajos en curso)")
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self._pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# ======================================================================
+# 3. CLIENTE
+# ======================================================================
+
+async def request_jobs(jobs, host=HOST, port=PORT):
+    """Envía `jobs` al servicio y entrega las respuestas a medida que llegan."""
+    reader, writer = await asyncio.open_connection(host, port)
+
+    async def send():
+        for job in jobs:
+            writer.write((json.dumps(job) + '\n').encode())
+            await writer.drain()
+        writer.write_eof()
+
+    sender = asyncio.create_task(send())
+    while line := await reader.readline():
+        yield json.loads(line)
+    await sender
+    writer.close()
+    await writer.wait_closed()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--workers', type=int, default=None, help='procesos (por defecto, la mitad de los núcleos)')
+    parser.add_argument('--max-pending', type=int, default=None, help='trabajos en curso antes de dejar de leer')
+    args = parser.parse_args(argv)
+    with GroverService(args.workers, args.max_pending) as service:
+        try:
+            asyncio.run(service.serve(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+# grover/store.py
+"""
+Almacén en disco de circuitos transpilados y counts, direccionado por contenido.
+
+La clave de cada entrada es el SHA-256 de:
+
+- la forma canónica de los circuitos (circuit_digest: sin nombres
+  generados, estable entre procesos),
+- el backend (nombre, método y modelo de ruido completo),
+- las opciones de ejecución (shots, semilla, ...) o de transpilación,
+- las versiones de qiskit y qiskit-aer.
+
+Así, correr dos veces el mismo experimento devuelve el resultado guardado
+sin simular. Los counts solo se guardan para corridas con semilla (cada
+tanda de shots con la suya): sin semilla cada corrida debe ser una muestra
+nueva, no la repetición de una anterior.
+
+El directorio es .grover_store (o GROVER_STORE_DIR), acotado a
+STORE_MAX_BYTES (o GROVER_STORE_MAX): al pasarse se borran las entradas
+usadas hace más tiempo. Se desactiva con GROVER_NO_CACHE=1; los scripts
+aceptan además --no-cache y llaman a disable_store.
+"""
+import hashlib
+import io
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from grover.telemetry import record_result, stage
+
+STORE_DIR = '.grover_store'
+STORE_DIR_ENV = 'GROVER_STORE_DIR'
+STORE_MAX_BYTES = 512 * 1024**2
+STORE_MAX_ENV = 'GROVER_STORE_MAX'
+NO_CACHE_ENV = 'GROVER_NO_CACHE'
+NO_CACHE_FLAG = '--no-cache'
+
+
+def store_disabled():
+    """True si se pidió GROVER_NO_CACHE."""
+    return os.environ.get(NO_CACHE_ENV, '') not in ('', '0')
+
+
+def disable_store():
+    """Desactiva el almacén en este proceso y en los que lance (p. ej. por --no-cache)."""
+    os.environ[NO_CACHE_ENV] = '1'
+
+
+def _versions():
+    import qiskit
+    import qiskit_aer
+    return qiskit.__version__, qiskit_aer.__version__
+
+
+def backend_fingerprint(backend):
+    """Todo lo del backend que cambia el resultado: nombre, método y modelo de ruido."""
+    noise_model = getattr(backend.options, 'noise_model', None)
+    noise = None
+    if noise_model is not None:
+        noise = noise_model.to_dict(serializable=True)
+        # Cada QuantumError lleva un id aleatorio (uuid) que no cambia el resultado
+        noise['errors'] = [{k: v for k, v in error.items() if k != 'id'} for error in noise['errors']]
+    return {
+        'name': backend.name,
+        'method': getattr(backend.options, 'method', None),
+        'noise': noise,
+    }
+
+
+def _canonical_param(param):
+    from qiskit import QuantumCircuit
+    if isinstance(param, float):
+        return repr(param)
+    if isinstance(param, QuantumCircuit):
+        return circuit_digest(param)
+    if isinstance(param, np.ndarray):
+        data = np.ascontiguousarray(param)
+        return [str(data.dtype), data.shape, hashlib.sha256(data.tobytes()).hexdigest()]
+    if isinstance(param, (list, tuple)):
+        return [_canonical_param(p) for p in param]
+    if isinstance(param, (int, complex, np.number)):
+        return repr(complex(param)) if np.iscomplexobj(param) else repr(float(param))
+    return str(param)
+
+
+def _canonical_operation(operation):
+    from qiskit.circuit import ControlledGate, Gate, Instruction
+    # Las compuertas armadas con to_gate/to_instruction solo valen por su
+    # definición: el nombre es elegido por el usuario (y QPY le agrega un uuid)
+    if type(operation) in (Gate, Instruction, ControlledGate) and operation.definition is not None:
+        return ['definición', circuit_digest(operation.definition)]
+    return [type(operation).__qualname__, operation.name, operation.num_qubits, operation.num_clbits,
+            [_canonical_param(p) for p in operation.params],
+            getattr(operation, 'ctrl_state', None), getattr(operation, 'label', None)]
+
+
+def circuit_digest(circuit):
+    """
+    SHA-256 de la forma canónica de un circuito: cada operación con sus
+    parámetros y los índices de sus qubits y bits, y las compuertas propias
+    reemplazadas por su definición. No depende del nombre del circuito
+    (circuit-N según cuántos se crearon antes) ni de los de sus compuertas,
+    así que es el mismo en cualquier proceso.
+    """
+    qubits = {qubit: index for index, qubit in enumerate(circuit.qubits)}
+    clbits = {clbit: index for index, clbit in enumerate(circuit.clbits)}
+    # Cada compuerta propia se repite R veces: su definición se resume una sola vez
+    operations = {}
+    data = [circuit.num_qubits, circuit.num_clbits, _canonical_param(circuit.global_phase)]
+    for instruction in circuit.data:
+        if instruction.is_standard_gate():
+            # Compuertas estándar: basta el nombre y los parámetros (sin crear la operación)
+            canonical = [instruction.name, [_canonical_param(p) for p in instruction.params]]
+        else:
+            operation = instruction.operation
+            entry = operations.get(id(operation))
+            if entry is None:
+                # Se guarda la operación para que su id no se reutilice
+                entry = operations[id(operation)] = (operation, _canonical_operation(operation))
+            canonical = entry[1]
+        data.append([canonical,
+                     [qubits[qubit] for qubit in instruction.qubits],
+                     [clbits[clbit] for clbit in instruction.clbits]])
+    return hashlib.sha256(json.dumps(data, default=str).encode()).hexdigest()
+
+
+def circuits_digest(circuits):
+    """SHA-256 de la forma canónica (circuit_digest) de una lista de circuitos."""
+    return hashlib.sha256(''.join(circuit_digest(c) for c in circuits).encode()).hexdigest()
+
+
+class ResultStore:
+    """Circuitos transpilados (QPY) y counts (JSON) en disco, con desalojo LRU por tamaño."""
+
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = directory or os.environ.get(STORE_DIR_ENV) or STORE_DIR
+        if max_bytes is None:
+            from grover.noise import parse_memory
+            max_bytes = parse_memory(os.environ.get(STORE_MAX_ENV) or STORE_MAX_BYTES)
+        self.max_bytes = max_bytes
+        # Tamaño total conocido (se recorre el directorio solo la primera vez
+        # y al desalojar); otros procesos pueden desviarlo hasta el próximo recorrido
+        self._size = None
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # Claves y archivos
+    # ------------------------------------------------------------------
+
+    def key(self, kind, circuits, backend, **options):
+        payload = json.dumps({
+            'kind': kind,
+            'circuits': circuits_digest(circuits),
+            'backend': backend_fingerprint(backend),
+            'options': options,
+            'versions': _versions(),
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key, suffix):
+        return os.path.join(self.directory, key[:2], f"{key}.{suffix}")
+
+    def _read(self, key, suffix):
+        path = self._path(key, suffix)
+        try:
+            with open(path, 'rb') as handle:
+                data = handle.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        # La fecha de modificación marca el último uso (para el desalojo LRU)
+        os.utime(path)
+        self.hits += 1
+        return data
+
+    def _write(self, key, suffix, data):
+        path = self._path(key, suffix)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Escritura atómica: otro proceso nunca ve un archivo a medias
+        try:
+            replaced = os.stat(path).st_size
+        except FileNotFoundError:
+            replaced = 0
+        descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(descriptor, 'wb') as handle:
+            handle.write(data)
+        os.replace(temporary, path)
+        if self._size is None:
+            self._size = self.size()
+        else:
+            self._size += len(data) - replaced
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def entries(self):
+        """[(ruta, bytes, último uso)] de todas las entradas."""
+        entries = []
+        if not os.path.isdir(self.directory):
+            return entries
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith('.tmp'):
+                    continue
+                stat = entry.stat()
+                entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """Borra las entradas usadas hace más tiempo hasta quedar bajo max_bytes."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in sorted(entries, key=lambda entry: entry[2]):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._size = total
+
+    def clear(self):
+        for path, _, _ in self.entries():
+            os.remove(path)
+        self._size = 0
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'bytes': self.size(), 'max_bytes': self.max_bytes}
+
+    # ------------------------------------------------------------------
+    # Circuitos transpilados
+    # ------------------------------------------------------------------
+
+    def transpile(self, circuits, backend, optimization_level=1):
+        """Como qiskit.transpile, pero reutiliza el resultado guardado si existe."""
+        from qiskit import qpy, transpile
+        single = not isinstance(circuits, (list, tuple))
+        circuits = [circuits] if single else list(circuits)
+        key = self.key('transpile', circuits, backend, optimization_level=optimization_level)
+        data = self._read(key, 'qpy')
+        if data is not None:
+            compiled = qpy.load(io.BytesIO(data))
+        else:
+            compiled = transpile(circuits, backend, optimization_level=optimization_level)
+            buffer = io.BytesIO()
+            qpy.dump(compiled, buffer)
+            self._write(key, 'qpy', buffer.getvalue())
+        return compiled[0] if single else compiled
+
+    # ------------------------------------------------------------------
+    # Counts
+    # ------------------------------------------------------------------
+
+    def run_counts(self, backend, circuits, shots, **options):
+        """
+        Counts crudos de Aer (claves hexadecimales), uno por circuito: del
+        disco si el mismo trabajo ya se corrió, si no se ejecuta y se guarda.
+        Necesita `seed_simulator`: sin semilla la clave no distingue dos
+        muestras distintas del mismo trabajo.
+        """
+        if options.get('seed_simulator') is None:
+            raise ValueError("run_counts necesita seed_simulator")
+        with stage('store'):
+            key = self.key('counts', circuits, backend, shots=shots, **options)
+            data = self._read(key, 'json')
+        if data is not None:
+            return json.loads(data)['counts']
+        with stage('simulate'):
+            result = backend.run(circuits, shots=shots, **options).result()
+        record_result(result)
+        counts = [dict(result.data(i)['counts']) for i in range(len(circuits))]
+        with stage('store'):
+            self._write(key, 'json', json.dumps({'counts': counts}).encode())
+        return counts
+
+
+_default_store = None
+
+def default_store():
+    """Almacén compartido del proceso, o None si está desactivado (GROVER_NO_CACHE)."""
+    global _default_store
+    if store_disabled():
+        return None
+    if _default_store is None:
+        _default_store = ResultStore()
+    return _default_store
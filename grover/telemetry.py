@@ -0,0 +1,230 @@
+# grover/telemetry.py
+"""
+Telemetría por etapa del pipeline de Grover (oráculo, to_instruction,
+transpile, composición, simulación, conteo, almacén).
+
+El código del pipeline marca sus etapas con `stage(nombre)`; solo se mide
+algo si hay un Telemetry activo (`with Telemetry() as telemetry:`), si no
+`stage` no hace nada. Por etapa se acumula:
+
+- wall: tiempo real (perf_counter) y cpu: tiempo de CPU del proceso,
+- rss_delta_mb: cuánto creció la memoria residente y peak_rss_mb: el pico
+  del proceso al terminar (RSS y no tracemalloc: la memoria de Aer es nativa).
+
+Cada Result de Aer suma su `time_taken` y los metadatos por experimento
+(método, memoria requerida, paralelismo). Opcionalmente se perfila todo el
+bloque con cProfile o pyinstrument. `summarize` agrega los registros de
+muchas corridas (percentiles e histogramas por etapa).
+
+Con GROVER_TELEMETRY=1 los scripts imprimen el registro al terminar
+(GROVER_TELEMETRY=cprofile o pyinstrument agrega el perfil).
+"""
+import contextvars
+import os
+import resource
+import sys
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+TELEMETRY_ENV = 'GROVER_TELEMETRY'
+PROFILERS = ('cprofile', 'pyinstrument')
+# Funciones del perfil que se muestran en el registro
+PROFILE_TOP = 15
+# Intervalos de los histogramas de `summarize`
+HISTOGRAM_BINS = 10
+
+# Telemetría activa en este contexto (None: las etapas no miden nada)
+_active = contextvars.ContextVar('grover_telemetry', default=None)
+
+# ======================================================================
+# 1. MEMORIA
+# ======================================================================
+
+def _rss_mb():
+    """Memoria residente actual (Linux: /proc; si no, el pico de getrusage)."""
+    try:
+        with open('/proc/self/statm') as handle:
+            return int(handle.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024**2
+    except (OSError, ValueError):
+        return peak_rss_mb()
+
+def peak_rss_mb():
+    """Pico de memoria residente del proceso (getrusage), en MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux lo reporta en KiB y macOS en bytes
+    return peak / 1024**2 if sys.platform == 'darwin' else peak / 1024
+
+# ======================================================================
+# 2. REGISTRO
+# ======================================================================
+
+@contextmanager
+def stage(name):
+    """Mide el bloque como la etapa `name` de la telemetría activa (si hay una)."""
+    telemetry = _active.get()
+    if telemetry is None:
+        yield
+        return
+    rss = _rss_mb()
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    try:
+        yield
+    finally:
+        telemetry.add(name, time.perf_counter() - wall, time.process_time() - cpu, _rss_mb() - rss)
+
+def record_result(result):
+    """Registra el tiempo y los metadatos de un Result de Aer en la telemetría activa."""
+    telemetry = _active.get()
+    if telemetry is not None:
+        telemetry.add_result(result)
+
+
+class Telemetry:
+    """Etapas medidas, resultados de Aer y perfil opcional de un bloque de código."""
+
+    def __init__(self, profiler=None, enabled=True):
+        if profiler is not None and profiler not in PROFILERS:
+            raise ValueError(f"Perfilador desconocido: {profiler}. Opciones: {list(PROFILERS)}")
+        self.enabled = enabled
+        self.profiler = profiler
+        self.stages = {}
+        self.aer = []
+        self.wall = 0.0
+        self.profile = None
+        self._token = None
+        self._profiler = None
+
+    @classmethod
+    def from_env(cls):
+        """Según GROVER_TELEMETRY: apagada, '1' (solo etapas), 'cprofile' o 'pyinstrument'."""
+        value = os.environ.get(TELEMETRY_ENV, '').strip().lower()
+        if value in ('', '0'):
+            return cls(enabled=False)
+        return cls(profiler=value if value in PROFILERS else None)
+
+    def add(self, name, wall, cpu, rss_delta_mb):
+        entry = self.stages.setdefault(name, {'calls': 0, 'wall': 0.0, 'cpu': 0.0, 'rss_delta_mb': 0.0})
+        entry['calls'] += 1
+        entry['wall'] += wall
+        entry['cpu'] += cpu
+        entry['rss_delta_mb'] += rss_delta_mb
+        entry['peak_rss_mb'] = peak_rss_mb()
+
+    def add_result(self, result):
+        self.aer.append({
+            'time_taken': result.time_taken,
+            'time_taken_execute': result.metadata.get('time_taken_execute'),
+            'parallel_experiments': result.metadata.get('parallel_experiments'),
+            'experiments': [{
+                'time_taken': experiment.time_taken,
+                'method': experiment.metadata.get('method'),
+                'num_qubits': experiment.metadata.get('num_qubits'),
+                'required_memory_mb': experiment.metadata.get('required_memory_mb'),
+                'parallel_shots': experiment.metadata.get('parallel_shots'),
+                'parallel_state_update': experiment.metadata.get('parallel_state_update'),
+                'measure_sampling': experiment.metadata.get('measure_sampling'),
+            } for experiment in result.results],
+        })
+
+    # ------------------------------------------------------------------
+    # Bloque medido
+    # ------------------------------------------------------------------
+
+    def __enter__(self):
+        if not self.enabled:
+            return self
+        self._token = _active.set(self)
+        if self.profiler == 'cprofile':
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        elif self.profiler == 'pyinstrument':
+            from pyinstrument import Profiler
+            self._profiler = Profiler()
+            self._profiler.start()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if not self.enabled:
+            return
+        self.wall += time.perf_counter() - self._start
+        if self.profiler == 'cprofile':
+            import io
+            import pstats
+            self._profiler.disable()
+            stream = io.StringIO()
+            pstats.Stats(self._profiler, stream=stream).sort_stats('cumulative').print_stats(PROFILE_TOP)
+            self.profile = stream.getvalue()
+        elif self.profiler == 'pyinstrument':
+            self._profiler.stop()
+            self.profile = self._profiler.output_text()
+        self._profiler = None
+        _active.reset(self._token)
+
+    def record(self):
+        """Registro estructurado (dict) de la corrida."""
+        record = {
+            'wall': self.wall,
+            'stages': {name: dict(entry) for name, entry in self.stages.items()},
+            'aer_time': sum(entry['time_taken'] for entry in self.aer),
+            'aer': list(self.aer),
+            'peak_rss_mb': peak_rss_mb(),
+        }
+        if self.profile is not None:
+            record['profile'] = self.profile
+        return record
+
+# ======================================================================
+# 3. AGREGADO DE MUCHAS CORRIDAS
+# ======================================================================
+
+def summarize(records, metric='wall', bins=HISTOGRAM_BINS):
+    """
+    Por etapa (y 'total', 'aer'): corridas, media, p50, p90, máximo e
+    histograma (conteos, bordes) de `metric` sobre los registros.
+    """
+    values = {}
+    for record in records:
+        for name, entry in record['stages'].items():
+            values.setdefault(name, []).append(entry[metric])
+        if metric == 'wall':
+            values.setdefault('total', []).append(record['wall'])
+            values.setdefault('aer', []).append(record['aer_time'])
+    summary = {}
+    for name, series in values.items():
+        series = np.asarray(series, dtype=float)
+        counts, edges = np.histogram(series, bins=bins)
+        summary[name] = {
+            'runs': int(series.size),
+            'mean': float(series.mean()),
+            'p50': float(np.percentile(series, 50)),
+            'p90': float(np.percentile(series, 90)),
+            'max': float(series.max()),
+            'histogram': (counts.tolist(), edges.tolist()),
+        }
+    return summary
+
+def print_record(record):
+    """Imprime el registro de una corrida: una línea por etapa."""
+    print(f"{'Etapa':>14} {'llamadas':>8} {'wall (s)':>9} {'cpu (s)':>9} {'ΔRSS (MB)':>10}")
+    for name, entry in record['stages'].items():
+        print(f"{name:>14} {entry['calls']:>8} {entry['wall']:>9.3f} {entry['cpu']:>9.3f} "
+              f"{entry['rss_delta_mb']:>10.1f}")
+    print(f"Total {record['wall']:.3f} s, Aer {record['aer_time']:.3f} s, "
+          f"pico de RSS {record['peak_rss_mb']:.0f} MB")
+    if 'profile' in record:
+        print(record['profile'])
+
+def print_summary(summary, width=30):
+    """Imprime `summarize` con un histograma de barras por etapa."""
+    for name, entry in summary.items():
+        print(f"{name}: {entry['runs']} corridas, media {entry['mean']:.4f}, p50 {entry['p50']:.4f}, "
+              f"p90 {entry['p90']:.4f}, máx {entry['max']:.4f}")
+        counts, edges = entry['histogram']
+        top = max(counts) or 1
+        for count, low, high in zip(counts, edges, edges[1:]):
+            print(f"  {low:>9.4f} - {high:<9.4f} {'#' * round(width * count / top)} {count}")
@@ -0,0 +1,140 @@
+# grover/variational.py
+"""
+Búsqueda variacional (QVS): se ajustan los ángulos de un ansatz para que
+mida la contraseña objetivo.
+
+    costo(θ) = 1 - P(objetivo | θ) = 1 - <ψ(θ)|Π|ψ(θ)>,   Π = |t><t|
+
+El ansatz (con sus Parameter libres) se transpila UNA sola vez. Cada
+evaluación solo asigna valores (parameter_binds de Aer): el costo y los
+2p puntos de la regla de desplazamiento de parámetros (θ ± π/2 e_j) se
+ejecutan juntos en un único trabajo.
+
+El optimizador es intercambiable: cualquier función
+`optimizer(cost_and_gradient, x0) -> dict` con las claves 'x', 'fun' y 'nit'.
+"""
+from functools import reduce
+
+import numpy as np
+from qiskit import transpile
+from qiskit.quantum_info import SparsePauliOp
+
+from grover.aggregate import ShotAggregator
+
+# Desplazamiento de la regla de parameter-shift para rotaciones de Pauli
+SHIFT = np.pi / 2
+
+# ======================================================================
+# 1. OBSERVABLE
+# ======================================================================
+
+def target_projector(n, target):
+    """Π = |t><t| como SparsePauliOp: producto de (I ± Z)/2 por qubit (qubit 0 a la derecha)."""
+    zero = SparsePauliOp(['I', 'Z'], coeffs=[0.5, 0.5])    # |0><0|
+    one = SparsePauliOp(['I', 'Z'], coeffs=[0.5, -0.5])    # |1><1|
+    factors = [one if (target >> q) & 1 else zero for q in reversed(range(n))]
+    return reduce(lambda left, right: left.tensor(right), factors).simplify()
+
+# ======================================================================
+# 2. OPTIMIZADORES
+# ======================================================================
+
+def gradient_descent(cost_and_gradient, x0, learning_rate=0.3, maxiter=100, tol=1e-3):
+    """Descenso por gradiente simple; corta cuando el costo baja de `tol`."""
+    x = np.array(x0, dtype=float)
+    for iteration in range(1, maxiter + 1):
+        value, gradient = cost_and_gradient(x)
+        if value < tol:
+            break
+        x = x - learning_rate * gradient
+    return {'x': x, 'fun': value, 'nit': iteration}
+
+def adam(cost_and_gradient, x0, learning_rate=0.1, maxiter=100, tol=1e-3,
+         beta1=0.9, beta2=0.999, epsilon=1e-8):
+    """Adam: tolera bien el ruido de muestreo del gradiente."""
+    x = np.array(x0, dtype=float)
+    m = np.zeros_like(x)
+    v = np.zeros_like(x)
+    for iteration in range(1, maxiter + 1):
+        value, gradient = cost_and_gradient(x)
+        if value < tol:
+            break
+        m = beta1 * m + (1 - beta1) * gradient
+        v = beta2 * v + (1 - beta2) * gradient**2
+        m_hat = m / (1 - beta1**iteration)
+        v_hat = v / (1 - beta2**iteration)
+        x = x - learning_rate * m_hat / (np.sqrt(v_hat) + epsilon)
+    return {'x': x, 'fun': value, 'nit': iteration}
+
+def scipy_optimizer(method='BFGS', **options):
+    """
+    Adaptador para scipy.optimize.minimize (con jac=True: costo y gradiente
+    juntos). Las búsquedas de línea de BFGS sufren con el ruido de muestreo:
+    conviene subir los shots o usar adam.
+    """
+    def optimize(cost_and_gradient, x0):
+        from scipy.optimize import minimize
+        result = minimize(cost_and_gradient, x0, jac=True, method=method, options=options)
+        return {'x': result.x, 'fun': float(result.fun), 'nit': int(result.nit)}
+    return optimize
+
+# ======================================================================
+# 3. MOTOR VARIACIONAL
+# ======================================================================
+
+class VariationalSearch:
+    """Costo 1 - P(objetivo) y su gradiente sobre un ansatz transpilado una sola vez."""
+
+    def __init__(self, ansatz, target, backend=None, shots=1024, seed=None):
+        if backend is None:
+            from grover.noise import get_simulator
+            backend = get_simulator('ideal')
+        self.backend = backend
+        self.n = ansatz.num_qubits
+        self.target = target
+        self.shots = shots
+        self.seed = seed
+        self.parameters = list(ansatz.parameters)
+        measured = ansatz.copy()
+        measured.measure_all()
+        self.circuit = transpile(measured, backend)
+        self.jobs = 0
+        self.circuit_evaluations = 0
+        self.history = []
+
+    def probabilities(self, points):
+        """P(objetivo) en cada fila de `points` (un solo trabajo, un experimento por fila)."""
+        points = np.atleast_2d(points)
+        binds = {parameter: points[:, j].tolist() for j, parameter in enumerate(self.parameters)}
+        options = {'shots': self.shots, 'parameter_binds': [binds]}
+        if self.seed is not None:
+            options['seed_simulator'] = self.seed + self.jobs
+        result = self.backend.run(self.circuit, **options).result()
+        self.jobs += 1
+        self.circuit_evaluations += len(points)
+        return np.array([ShotAggregator(self.n, [self.target]).add_result(result, i).target_probability()
+                         for i in range(len(points))])
+
+    def cost(self, theta):
+        return 1 - float(self.probabilities(theta)[0])
+
+    def cost_and_gradient(self, theta):
+        """Costo en θ y gradiente por parameter-shift: 2p + 1 puntos en un trabajo."""
+        theta = np.asarray(theta, dtype=float)
+        shifts = SHIFT * np.eye(theta.size)
+        points = np.vstack([theta, theta + shifts, theta - shifts])
+        costs = 1 - self.probabilities(points)
+        gradient = (costs[1:theta.size + 1] - costs[theta.size + 1:]) / 2
+        self.history.append(float(costs[0]))
+        return float(costs[0]), gradient
+
+    def run(self, x0=None, optimizer=adam):
+        """Optimiza desde x0 (aleatorio si no se da) y devuelve el mejor θ y las estadísticas."""
+        if x0 is None:
+            x0 = np.random.default_rng(self.seed).uniform(0, 2 * np.pi, len(self.parameters))
+        result = optimizer(self.cost_and_gradient, x0)
+        result['probability'] = 1 - result['fun']
+        result['jobs'] = self.jobs
+        result['circuit_evaluations'] = self.circuit_evaluations
+        result['history'] = list(self.history)
+        return result
@@ -0,0 +1,229 @@
+# grover/walk.py
+"""
+Búsqueda por caminata cuántica con moneda (Shenvi-Kempe-Whaley) en el
+hipercubo y en el ciclo.
+
+Un paso es U = S · C':
+
+- C' aplica la moneda C0 = 2|v><v| - I en los nodos no marcados y -I en el
+  marcado. En el hipercubo C0 es la moneda de Grover (|v> uniforme); en el
+  ciclo, con |v> = Ry(π/4)|0>, C0 es Hadamard.
+- S mueve el nodo según la dirección de la moneda: en el hipercubo invierte
+  el bit c del nodo, en el ciclo suma o resta 1 (módulo 2^n).
+
+Qubits del circuito: [nodos (n) | moneda (k) | ancillas]. Las MCX del paso
+(incremento/decremento en el ciclo, control del nodo marcado) usan
+grover.mcz con las ancillas limpias.
+
+El backend analítico evoluciona el vector de estado con S como matriz
+dispersa (scipy.sparse) y la moneda vectorizada: O(N·d) por paso, sin
+circuito, para grafos grandes.
+"""
+from abc import ABC, abstractmethod
+from math import ceil, log2, pi, sqrt
+
+import numpy as np
+from qiskit import QuantumCircuit
+
+from grover.mcz import mcx, mcz
+
+# ======================================================================
+# 1. GRAFOS
+# ======================================================================
+
+class WalkGraph(ABC):
+    """Grafo regular de 2^node_qubits nodos y grado `degree` (una dirección de moneda por vecino)."""
+
+    def __init__(self, name, node_qubits, degree, coin_qubits, max_steps):
+        self.name = name
+        self.node_qubits = node_qubits
+        self.num_nodes = 2**node_qubits
+        self.degree = degree
+        self.coin_qubits = coin_qubits
+        # Ventana de pasos en la que se busca el pico de P(marcado)
+        self.max_steps = max_steps
+
+    def __repr__(self):
+        return f"{self.name}(nodos={self.num_nodes}, grado={self.degree})"
+
+    @abstractmethod
+    def coin_state(self):
+        """|v>: C0 = 2|v><v| - I."""
+
+    @abstractmethod
+    def neighbours(self):
+        """Array (N, d): vecino de cada nodo en cada dirección."""
+
+    @abstractmethod
+    def prepare_coin(self, qc, coin, inverse=False):
+        """P con P|0> = |v> (o P† con inverse=True)."""
+
+    @abstractmethod
+    def shift(self, qc, nodes, coin, ancillas):
+        """S: mueve los nodos según la dirección de la moneda."""
+
+
+class Hypercube(WalkGraph):
+    """Hipercubo de dimensión d: nodos de d bits, vecinos a distancia de Hamming 1."""
+
+    def __init__(self, dimension):
+        coin_qubits = max(1, ceil(log2(dimension)))
+        super().__init__('hipercubo', dimension, dimension, coin_qubits,
+                         max_steps=int(pi * sqrt(2**dimension)) + 1)
+
+    def coin_state(self):
+        return np.full(self.degree, 1 / sqrt(self.degree))
+
+    def neighbours(self):
+        nodes = np.arange(self.num_nodes)[:, None]
+        return nodes ^ (1 << np.arange(self.degree))[None, :]
+
+    def prepare_coin(self, qc, coin, inverse=False):
+        if self.degree != 2**self.coin_qubits:
+            raise ValueError(f"El circuito necesita una dimensión potencia de 2 (dimensión {self.degree})")
+        qc.h(coin)      # H es su propia inversa
+
+    def shift(self, qc, nodes, coin, ancillas):
+        # Dirección c: X sobre el bit c del nodo, controlada por moneda == c
+        for c in range(self.degree):
+            zeros = [coin[j] for j in range(self.coin_qubits) if not (c >> j) & 1]
+            if zeros:
+                qc.x(zeros)
+            mcx(qc, coin, nodes[c], ancillas)
+            if zeros:
+                qc.x(zeros)
+
+
+class Cycle(WalkGraph):
+    """Ciclo de 2^n nodos: moneda 1 -> x + 1, moneda 0 -> x - 1."""
+
+    def __init__(self, node_qubits):
+        super().__init__('ciclo', node_qubits, 2, 1, max_steps=2 * 2**node_qubits)
+
+    def coin_state(self):
+        return np.array([np.cos(pi / 8), np.sin(pi / 8)])
+
+    def neighbours(self):
+        nodes = np.arange(self.num_nodes)
+        return np.stack([(nodes - 1) % self.num_nodes, (nodes + 1) % self.num_nodes], axis=1)
+
+    def prepare_coin(self, qc, coin, inverse=False):
+        qc.ry(-pi / 4 if inverse else pi / 4, coin[0])
+
+    def shift(self, qc, nodes, coin, ancillas):
+        # Incremento controlado por la moneda: el bit i cambia si los de abajo son todos 1
+        def increment():
+            for i in reversed(range(len(nodes))):
+                mcx(qc, [coin[0]] + nodes[:i], nodes[i], ancillas)
+        increment()
+        # Decremento con moneda 0: x - 1 = ~(~x + 1)
+        qc.x(coin[0])
+        qc.x(nodes)
+        increment()
+        qc.x(nodes)
+        qc.x(coin[0])
+
+
+GRAPHS = {'hypercube': Hypercube, 'cycle': Cycle}
+
+def make_graph(graph, node_qubits):
+    """'hypercube' o 'cycle' (o un WalkGraph ya armado)."""
+    if isinstance(graph, WalkGraph):
+        return graph
+    if graph not in GRAPHS:
+        raise ValueError(f"Grafo desconocido: {graph}")
+    return GRAPHS[graph](node_qubits)
+
+# ======================================================================
+# 2. CIRCUITO
+# ======================================================================
+
+def _control_on_node(qc, nodes, target, operation):
+    """Ejecuta `operation()` con los nodos conjugados por X para que |target> sea |11...1>."""
+    zeros = [q for i, q in enumerate(nodes) if not (target >> i) & 1]
+    if zeros:
+        qc.x(zeros)
+    operation()
+    if zeros:
+        qc.x(zeros)
+
+def coin_step(qc, graph, nodes, coin, target, ancillas):
+    """
+    C': C0 en los no marcados, -I en el marcado. Con R_v = I - 2|v><v|,
+    C0 = -R_v y -I = C0 · R_v, así que basta R_v sin control (con fase π)
+    y otra R_v controlada por el nodo marcado.
+    """
+    graph.prepare_coin(qc, coin, inverse=True)
+    qc.x(coin)
+    mcz(qc, coin, ancillas)
+    _control_on_node(qc, nodes, target, lambda: mcz(qc, coin + nodes, ancillas))
+    qc.x(coin)
+    graph.prepare_coin(qc, coin)
+    qc.global_phase += pi
+
+def walk_circuit(graph, target, steps, num_ancillas=2, measure=True):
+    """Circuito de búsqueda: |s> en los nodos, |v> en la moneda y `steps` pasos S · C'."""
+    n, k = graph.node_qubits, graph.coin_qubits
+    nodes = list(range(n))
+    coin = list(range(n, n + k))
+    ancillas = list(range(n + k, n + k + num_ancillas))
+    qc = QuantumCircuit(n + k + num_ancillas, n if measure else 0)
+
+    qc.h(nodes)
+    graph.prepare_coin(qc, coin)
+    for _ in range(steps):
+        coin_step(qc, graph, nodes, coin, target, ancillas)
+        graph.shift(qc, nodes, coin, ancillas)
+
+    if measure:
+        qc.measure(nodes, range(n))
+    return qc
+
+# ======================================================================
+# 3. BACKEND ANALÍTICO (SCIPY.SPARSE)
+# ======================================================================
+
+def shift_matrix(graph):
+    """S como matriz de permutación dispersa sobre los índices nodo * d + dirección."""
+    from scipy.sparse import csr_matrix
+    N, d = graph.num_nodes, graph.degree
+    source = np.arange(N * d)
+    destination = graph.neighbours().ravel() * d + source % d
+    return csr_matrix((np.ones(N * d), (destination, source)), shape=(N * d, N * d))
+
+def walk_probabilities(graph, target, steps):
+    """P(medir el nodo marcado) después de 0, 1, ..., `steps` pasos (sin circuito)."""
+    N, d = graph.num_nodes, graph.degree
+    v = graph.coin_state()
+    S = shift_matrix(graph)
+    # Moneda, desplazamiento y estado inicial son reales: alcanza con float64
+    psi = np.outer(np.full(N, 1 / sqrt(N)), v)
+    probabilities = np.empty(steps + 1)
+    probabilities[0] = np.sum(psi[target]**2)
+    for step in range(1, steps + 1):
+        # Moneda vectorizada: C0 psi = 2 <v|psi> |v> - psi por nodo; -psi en el marcado
+        marked = -psi[target]
+        projection = psi @ (2 * v)
+        np.negative(psi, out=psi)
+        psi += projection[:, None] * v[None, :]
+        psi[target] = marked
+        psi = (S @ psi.ravel()).reshape(N, d)
+        probabilities[step] = np.sum(psi[target]**2)
+    return probabilities
+
+def hitting_time(graph, target=0, max_steps=None, tolerance=0.9):
+    """
+    Primer máximo local de P(marcado) que llega al `tolerance` del máximo de la
+    ventana del grafo (los picos siguientes apenas suben), con su probabilidad.
+    """
+    if max_steps is None:
+        max_steps = graph.max_steps
+    probabilities = walk_probabilities(graph, target, max_steps)
+    best = probabilities.max()
+    for steps in range(1, max_steps):
+        p = probabilities[steps]
+        if p >= tolerance * best and p >= probabilities[steps - 1] and p >= probabilities[steps + 1]:
+            break
+    else:
+        steps = int(np.argmax(probabilities))
+    return {'steps': steps, 'probability': float(probabilities[steps])}
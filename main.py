@@ -1,10 +1,16 @@
-from qiskit import QuantumCircuit, transpile
 from qiskit_aer import AerSimulator
-from qiskit.visualization import plot_histogram
-import matplotlib.pyplot as plt
-import numpy as np
-from math import floor, pi
 import math
+import sys
+
+from grover import builders
+from grover.batch import iterate_key
+from grover.builders import oracle_bits
+from grover.cache import default_cache, grover_iterate
+from grover.exact import exact_run
+from grover.iterations import plan_iterations
+from grover.mcz import print_mcz_report
+from grover.sequential import sequential_run
+from grover.store import NO_CACHE_FLAG, disable_store
 
 def get_bits(number):
     return 7
@@ -13,110 +19,86 @@ def get_bits(number):
 target_state_decimal = 80
 target_statte_digits = get_bits(target_state_decimal)
 target_state_binary = format(target_state_decimal, f'0{target_statte_digits}b')
-print(f"numero en binario: {target_state_binary}")
+
+# Ancillas limpias para las MCZ del oráculo y el difusor (se comparten).
+# Con 2 ancillas la MCZ ya es lineal en CX (ver grover.mcz.mcz_report).
+num_ancillas = 2
 
 def create_oracle():
     """Crea un oráculo que aplica una fase de -1 al estado objetivo."""
-    qc_oracle = QuantumCircuit(target_statte_digits)
-   
-    # Aplicar X a los qubits que son '0' en el estado objetivo.
-    # El estado 73 es '1001001'. Qubits 1, 2, 4, 5 son '0'.
-    for i, bit in enumerate(target_state_binary):
-        if bit == '0':
-            qc_oracle.x(i)
-
-    # Aplicar la compuerta Z controlada por todos los qubits (MCZ)
-    control_qubits = list(range(target_statte_digits))
-    qc_oracle.h(target_statte_digits-1)
-    qc_oracle.mcx(control_qubits[:-1], target_statte_digits-1)
-    qc_oracle.h(target_statte_digits-1)
-
-    # Deshacer la aplicación de X.
-    for i, bit in enumerate(target_state_binary):
-        if bit == '0':
-            qc_oracle.x(i)
-
-    return qc_oracle
+    # oracle_bits invierte la cadena: Qiskit mide con el qubit 0 a la derecha
+    bits = oracle_bits(target_state_decimal, target_statte_digits)
+    return builders.create_oracle(target_statte_digits, bits, num_ancillas)
 
 def create_diffuser(n):
     """Crea el operador de difusión de Grover (inversión alrededor de la media)."""
-    qc_diffuser = QuantumCircuit(n)
-   
-    qc_diffuser.h(range(n))
-    qc_diffuser.x(range(n))
-   
-    # Aplicar MCZ para el estado |11...1>
-    qc_diffuser.h(n-1)
-    qc_diffuser.mcx(list(range(n-1)), n-1)
-    qc_diffuser.h(n-1)
-   
-    qc_diffuser.x(range(n))
-    qc_diffuser.h(range(n))
-   
-    return qc_diffuser
-
-def get_iterations(target_statte_digits, target_decimal, oracle_gate, diff_gate):
-    sim = AerSimulator()
-    best_iter = 1
-    best_prob = 0.0
-    best_state = None
-    
-    for k in range(1, 12):
-        qc = QuantumCircuit(target_statte_digits, target_statte_digits)
-        qc.h(range(target_statte_digits))
-        
-        for _ in range(k):
-            qc.append(oracle_gate, range(target_statte_digits))
-            qc.append(diff_gate, range(target_statte_digits))
-        
-        qc.measure(range(target_statte_digits), range(target_statte_digits))
-
-        tqc = transpile(qc, sim)
-        result = sim.run(tqc, shots=1024).result()
-        counts = result.get_counts()
-        
-        most = max(counts, key=counts.get)
-        prob = counts[most] / 1024
-
-        # si este resultado tiene mayor probabilidad del target
-        if int(most, 2) == target_decimal and prob > best_prob:
-            best_iter = k
-            best_prob = prob
-            best_state = most
-
+    return builders.create_grover_diffuser(n, num_ancillas)
+
+def oracle_key(target_decimal, width):
+    """Clave de la iteración en la caché: constructores, bits marcados y ancho."""
+    bits = oracle_bits(target_decimal, target_statte_digits)
+    return iterate_key(create_oracle, create_diffuser, bits, width)
+
+def get_iterations(target_statte_digits, target_decimal, oracle_gate, diff_gate, sim=None, spread=1):
+    # R óptimo en forma cerrada (un solo estado marcado), sin simular cada k
+    plan = plan_iterations(target_statte_digits, num_marked=1)
+    best_iter = plan['iterations']
+    print(f"Probabilidad de éxito esperada con R={best_iter}: {plan['probability']:.4f}")
+    if sim is None:
+        return best_iter
+
+    # Ajuste exacto con el circuito real: R ± spread en un solo trabajo, una
+    # evolución por R (save_probabilities, sin shots ni ruido estadístico)
+    candidates = list(range(max(0, best_iter - spread), best_iter + spread + 1))
+    circuits = [default_cache.grover_circuit(
+                    target_statte_digits, oracle_key(target_decimal, oracle_gate.num_qubits),
+                    lambda: grover_iterate(oracle_gate, diff_gate), R, sim, measure=False)
+                for R in candidates]
+    exact = exact_run(sim, circuits, target_statte_digits, [[target_decimal]] * len(circuits))
+    for R, distribution in zip(candidates, exact):
+        print(f"   R={R}: P(objetivo) = {distribution.target_probability():.6f}, "
+              f"más probable {distribution.most_frequent()}")
+    best_iter, best = max(zip(candidates, exact), key=lambda pair: pair[1].target_probability())
+    if best.most_frequent() != target_decimal:
+        print("   ⚠️ El estado más probable no coincide con el objetivo.")
     return best_iter
 
 def run_grover():
+    print(f"numero en binario: {target_state_binary}")
     oracle_gate = create_oracle().to_gate(label="Oracle")
     diff_gate   = create_diffuser(target_statte_digits).to_gate(label="Diffuser")
+    print_mcz_report(target_statte_digits, num_ancillas)
 
-    grover_circuit = QuantumCircuit(target_statte_digits, target_statte_digits)
-
-    # Paso 1: superposición inicial
-    grover_circuit.h(range(target_statte_digits))
-
-    # Paso 2: cantidad óptima de iteraciones
+    # Paso 1: cantidad óptima de iteraciones
     # N = 2**target_statte_digits
     # iterations = int(np.floor(np.pi/4 * np.sqrt(N)))
-    iterations = get_iterations(target_statte_digits, target_state_decimal, oracle_gate, diff_gate)
+    sim = AerSimulator()
+    iterations = get_iterations(target_statte_digits, target_state_decimal, oracle_gate, diff_gate, sim)
     print(f"Iteraciones de Grover: {iterations}")
 
-    # Paso 3: aplicar Grover varias veces
-    for _ in range(iterations):
-        grover_circuit.append(oracle_gate, range(target_statte_digits))
-        grover_circuit.append(diff_gate, range(target_statte_digits))
-
-    # Paso 4: medir
-    grover_circuit.measure(range(target_statte_digits), range(target_statte_digits))
+    # Paso 2: superposición inicial + Grover varias veces + medición.
+    # La iteración se transpila una sola vez y se compone R veces.
+    tqc = default_cache.grover_circuit(
+        target_statte_digits, oracle_key(target_state_decimal, oracle_gate.num_qubits),
+        lambda: grover_iterate(oracle_gate, diff_gate),
+        iterations, sim)
 
     # --- Simulación ---
-    sim = AerSimulator()
-    tqc = transpile(grover_circuit, sim)
-    result = sim.run(tqc, shots=2048).result()
-    counts = result.get_counts()
-
-    most_probable = max(counts, key=counts.get)
-    print(f"\n🔐 El código encontrado por Grover es: {most_probable} (binario)")
-    print(f"   Valor decimal: {int(most_probable, 2)}")
-
-run_grover()
\ No newline at end of file
+    # Muestreo secuencial: tandas crecientes hasta que el resultado más
+    # frecuente queda decidido con 99% de confianza (como mucho 2048 shots).
+    # Conteo sobre enteros (sin armar el dict de cadenas binarias)
+    run = sequential_run(sim, tqc, target_statte_digits, [target_state_decimal],
+                         rule='top', max_shots=2048)
+    shots = run['aggregator']
+
+    most_probable = shots.most_frequent()
+    print(f"\n🔐 El código encontrado por Grover es: {shots.key(most_probable)} (binario)")
+    print(f"   Valor decimal: {most_probable}")
+    print(f"   Probabilidad medida del objetivo: {shots.target_probability():.4f}")
+    print(f"   Shots usados: {run['shots']} de 2048 ({run['looks']} tandas)")
+
+if __name__ == "__main__":
+    # --no-cache: simular de nuevo en lugar de usar el almacén en disco (grover.store)
+    if NO_CACHE_FLAG in sys.argv[1:]:
+        disable_store()
+    run_grover()
@@ -1,21 +1,32 @@
-from qiskit import QuantumCircuit, transpile
-from qiskit_aer import AerSimulator
-from qiskit.visualization import plot_histogram
-import matplotlib.pyplot as plt
-import numpy as np
-import os
-from qiskit_aer.noise import NoiseModel
-from qiskit_aer.noise.errors import depolarizing_error
-from qiskit_aer.noise import NoiseModel
-import sympy
-from qiskit.circuit.library import CDKMRippleCarryAdder
-from qiskit.circuit.library import PhaseOracle
+from qiskit import QuantumCircuit
+import sys
+
+from grover.constraints import (
+    DigitEquals, DigitSumEquals, IsPrime, classical_solutions, compile_oracle,
+    decode_digits, digits_to_number,
+)
+from grover.iterations import plan_iterations
+from grover.mcz import mcz
+from grover.aggregate import aggregate_run
+from grover.cache import default_cache, grover_iterate
+from grover.noise import format_memory, get_simulator, plan_method
+from grover.report import Reporter
+from grover.store import NO_CACHE_FLAG, circuit_digest, disable_store
+from grover.telemetry import Telemetry, print_record, stage
 
 N_QUBITS = 0
+SEARCH_QUBITS = 0   # registro de búsqueda; el resto (hasta N_QUBITS) son ancillas
+NUM_SOLUTIONS = 1
+NUM_DIGITS = 0      # > 0 cuando el oráculo es de dígitos (Atenea)
+
+# Atenea: número de 3 cifras que termina en 7, cuyas cifras suman 10 y que es primo
+ATENEA_PREDICATES = [DigitEquals(-1, 7), DigitSumEquals(10), IsPrime()]
+ATENEA_DIGITS = 3
 
 def create_oracle():
-    global N_QUBITS
+    global N_QUBITS, SEARCH_QUBITS
     N_QUBITS = 8
+    SEARCH_QUBITS = N_QUBITS
     TARGET_DECIMAL = 255
     TARGET_PASSWORD = format(TARGET_DECIMAL, f'0{N_QUBITS}b')    
     num_qubits = len(TARGET_PASSWORD)
@@ -27,9 +38,7 @@ def create_oracle():
             qc.x(i)
     
     # 2. Phase Flip (MCZ)
-    qc.h(num_qubits-1)
-    qc.mcx(list(range(num_qubits-1)), num_qubits-1)
-    qc.h(num_qubits-1)
+    mcz(qc, range(num_qubits))
     
     # 3. Uncomputation (Deshacer X)
     for i, bit in enumerate(reversed(TARGET_PASSWORD)):
@@ -44,108 +53,105 @@ def create_oracle():
 
     return oracle_gate
 
-def comparator_equals_7(qc, qubits_in, flag):
-    qc.x(qubits_in[3]) # Invertimos el BMS
-    qc.mcx(qubits_in, flag) # el flag se pone en 1 si los 4 bits = 1
-    qc.x(qubits_in[3]) # Deshacemos el X del inicio (restauramos el estado original)
-
-def comparator_equals_10(qc, sum_bits, flag):
-    pattern = '01010'
-    
-    # invertimos los bits que son 0
-    for i, bit in enumerate(reversed(pattern)):
-        if bit == '0':
-            qc.x(sum_bits[i])
-    
-    # aplicamos multi-controlled X (solo se activa si todos los bits = 1)
-    qc.mcx(sum_bits, flag)
-    
-    # deshacemos las X
-    for i, bit in enumerate(reversed(pattern)):
-        if bit == '0':
-            qc.x(sum_bits[i])
-
 def create_oracle_atenea():
-    global N_QUBITS
-    N_QUBITS = 25
-    qc = QuantumCircuit(N_QUBITS, name="OráculoCuántico")
-
-    centenas = [0,1,2,3]
-    decenas  = [4,5,6,7]
-    unidades = [8,9,10,11]
-    flag7 = 12
-    flagSum10 = 13
-    flagPrime = 14
-    phase = 15
-
-    # Condición 1: termina en 7
-    comparator_equals_7(qc, unidades, flag7)
-
-    # Condición 2: suma de dígitos = 10
-    qc.append(CDKMRippleCarryAdder(4).to_gate(), centenas + decenas + [16,17])
-    qc.append(CDKMRippleCarryAdder(5).to_gate(), [16,17,18,19,20] + unidades + [21,22,23])
-    comparator_equals_10(qc,[16,17,18,19,20], flagSum10)
-
-
-    qc.h(phase)
-    qc.mcx([flag7, flagSum10], phase)
-    qc.h(phase)
-
-    return qc
+    """
+    Oráculo compilado a partir de las restricciones (grover.constraints):
+    calcula los flags, aplica la fase y los descalcula, así que las ancillas
+    vuelven a |0> y se reutilizan en el difusor.
+    """
+    global N_QUBITS, SEARCH_QUBITS, NUM_SOLUTIONS, NUM_DIGITS
+    compiled = compile_oracle(ATENEA_PREDICATES, ATENEA_DIGITS)
+    N_QUBITS = compiled['num_qubits']
+    SEARCH_QUBITS = len(compiled['search_qubits'])
+    NUM_DIGITS = ATENEA_DIGITS
+    # Se conocen las soluciones clásicamente solo para elegir el número de iteraciones
+    NUM_SOLUTIONS = len(classical_solutions(ATENEA_PREDICATES, ATENEA_DIGITS))
+
+    print(f"Restricciones: {ATENEA_PREDICATES}")
+    print(f"Qbits a utilizar: {N_QUBITS} ({SEARCH_QUBITS} de búsqueda)")
+
+    return compiled['oracle']
 
 def create_diffuser():
     qc = QuantumCircuit(N_QUBITS)
+    search = range(SEARCH_QUBITS)
+    ancillas = range(SEARCH_QUBITS, N_QUBITS)
+
+    # Solo sobre el registro de búsqueda
+    qc.h(search)
+    qc.x(search)
     
-    qc.h(range(N_QUBITS))
-    qc.x(range(N_QUBITS))
-    
-    qc.h(N_QUBITS-1)
-    qc.mcx(list(range(N_QUBITS-1)), N_QUBITS-1)
-    qc.h(N_QUBITS-1)
+    # MCZ sobre |11...1>: grover.mcz elige la descomposición más barata
+    # con las ancillas (limpias) que deja libres el oráculo
+    mcz(qc, search, ancillas)
     
-    qc.x(range(N_QUBITS))
-    qc.h(range(N_QUBITS))
+    qc.x(search)
+    qc.h(search)
     
     diffuser_gate = qc.to_gate()
     diffuser_gate.name = "Difusor"
     return diffuser_gate
 
-def run_grover(addNoise, oracle, diffuser):
-    grover_circuit = QuantumCircuit(N_QUBITS, N_QUBITS)
-    grover_circuit.h(range(N_QUBITS))
+def run_grover(addNoise, oracle, diffuser, shots=1024, shot_batch=None, report=None):
+    # Solo el registro de búsqueda tiene bits clásicos: las ancillas vuelven a
+    # |0> y no se miden, así que Aer muestrea y devuelve claves más cortas
+    grover_circuit = QuantumCircuit(N_QUBITS, SEARCH_QUBITS)
+    grover_circuit.h(range(SEARCH_QUBITS))
 
-    num_iterations = int(np.floor(np.pi/4 * np.sqrt(2**N_QUBITS)))
+    num_iterations = plan_iterations(SEARCH_QUBITS, NUM_SOLUTIONS)['iterations']
     print(f"Se realizarán {num_iterations} iteraciones.")
 
-    for _ in range(num_iterations):
-        grover_circuit.append(oracle, range(N_QUBITS))
-        grover_circuit.append(diffuser, range(N_QUBITS))
-
-    # 3. Medición
-    grover_circuit.measure(range(N_QUBITS), range(N_QUBITS))
-
-    simulator = AerSimulator()
-
-    if addNoise == True:
-        noise_model = NoiseModel()
-        noise_model.add_all_qubit_quantum_error(depolarizing_error(0.02, 1), ['x','h'])
-        noise_model.add_all_qubit_quantum_error(depolarizing_error(0.03, 2), ['cx'])
-        simulator = AerSimulator(noise_model=noise_model)
-  
-    compiled_circuit = transpile(grover_circuit, simulator)
-    result = simulator.run(compiled_circuit, shots=1024).result()
-    counts = result.get_counts()
+    with stage('compose'):
+        for _ in range(num_iterations):
+            grover_circuit.append(oracle, range(N_QUBITS))
+            grover_circuit.append(diffuser, range(N_QUBITS))
+
+        # 3. Medición (registro de búsqueda)
+        grover_circuit.measure(range(SEARCH_QUBITS), range(SEARCH_QUBITS))
+
+    # Memoria estimada antes de simular: statevector, MPS o estabilizador
+    # extendido según lo que entre en GROVER_MEMORY_LIMIT (o MemoryError)
+    profile = 'depolarizing' if addNoise else 'ideal'
+    with stage('plan'):
+        plan = plan_method([grover_circuit], addNoise, shots)
+    print(f"Simulación: método {plan['method']}, memoria estimada {format_memory(plan['memory'])} "
+          f"(límite {format_memory(plan['limit'])})")
+    # Simuladores y modelo de ruido en caché (grover.noise)
+    simulator = get_simulator(profile, plan['method'])
+    # Se transpila una sola iteración (caché en memoria y en disco, grover.store)
+    # y se compone num_iterations veces; --no-cache evita el almacén
+    iterate = grover_iterate(oracle, diffuser)
+    compiled_circuit = default_cache.grover_circuit(SEARCH_QUBITS, ('main1', circuit_digest(iterate)),
+                                                    lambda: iterate, num_iterations, simulator)
+    # shot_batch reparte los shots en trabajos más chicos; cada tanda se suma
+    # sobre enteros (grover.aggregate), sin armar el dict de cadenas binarias
+    shots_tally, = aggregate_run(simulator, [compiled_circuit], SEARCH_QUBITS, shots=shots, shot_batch=shot_batch,
+                                 **plan['options'])
 
     # --- RESULTADOS ---
-    most_frequent_binary = max(counts, key=counts.get)
-    recovered_decimal = int(most_frequent_binary, 2)
+    recovered_decimal = shots_tally.most_frequent()
+    most_frequent_binary = shots_tally.key(recovered_decimal)
 
     print(f"Cadena binaria más frecuente: {most_frequent_binary} ({recovered_decimal})")
-
-    grover_circuit.draw('mpl')
-    plt.show()
-
-    plot_histogram(counts)
-    plt.show()
-
-run_grover(False, create_oracle_atenea(), create_diffuser())
\ No newline at end of file
+    if NUM_DIGITS:
+        digits = decode_digits(most_frequent_binary, NUM_DIGITS)
+        print(f"Número encontrado: {digits_to_number(digits)} (dígitos {digits})")
+
+    # Gráficos opcionales (GROVER_REPORT): se guardan en segundo plano, con
+    # las iteraciones repetidas resumidas en una sola caja
+    if report is not None:
+        report.circuit('main1_circuito', grover_circuit)
+        report.histogram('main1_histograma', shots_tally)
+
+if __name__ == "__main__":
+    # --no-cache: simular de nuevo en lugar de usar el almacén en disco (grover.store)
+    if NO_CACHE_FLAG in sys.argv[1:]:
+        disable_store()
+    # GROVER_TELEMETRY=1 imprime tiempo, CPU y memoria por etapa (cprofile o
+    # pyinstrument agregan el perfil)
+    with Reporter() as report, Telemetry.from_env() as telemetry:
+        with stage('oracle'):
+            oracle, diffuser = create_oracle_atenea(), create_diffuser()
+        run_grover(False, oracle, diffuser, report=report)
+    if telemetry.enabled:
+        print_record(telemetry.record())
@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+
+from grover.analytic import cross_check, evolve, reduced_amplitudes
+from grover.builders import create_grover_diffuser, create_multi_target_oracle
+
+
+@pytest.mark.parametrize('n, marked, iterations', [(4, [6], 3), (5, [1, 17, 30], 2), (6, [45], 5)])
+def test_analytic_probabilities_match_aer(n, marked, iterations):
+    oracle = create_multi_target_oracle(n, marked)
+    assert cross_check(n, oracle, create_grover_diffuser(n), marked, iterations) < 1e-9
+
+
+def test_reduced_amplitudes_match_full_evolution():
+    n, marked, iterations = 6, [3, 40], 4
+    psi = evolve(n, marked, iterations)
+    a, b = reduced_amplitudes(n, len(marked), iterations)
+    assert np.allclose(psi[marked], a)
+    assert np.allclose(np.delete(psi, marked), b)
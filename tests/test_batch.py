@@ -0,0 +1,31 @@
+from functools import partial
+
+from grover.batch import build_batch, builder_key
+from grover.builders import create_grover_diffuser, create_oracle
+from grover.cache import GroverCache
+from grover.noise import get_simulator
+from grover.store import STORE_DIR_ENV
+
+
+def reversed_oracle(n, bits, num_ancillas=0):
+    """Mismo ancho que create_oracle, pero marca otro estado."""
+    return create_oracle(n, bits[::-1], num_ancillas)
+
+
+def test_builders_with_same_width_do_not_share_cache_entries(tmp_path, monkeypatch):
+    # build_batch transpila a través del almacén por defecto: fuera del árbol de trabajo
+    monkeypatch.setenv(STORE_DIR_ENV, str(tmp_path))
+    monkeypatch.setattr('grover.store._default_store', None)
+    backend = get_simulator('ideal')
+    cache = GroverCache()
+    build_batch(4, [1], create_oracle, create_grover_diffuser, 2, backend, cache)
+    build_batch(4, [1], reversed_oracle, create_grover_diffuser, 2, backend, cache)
+    assert cache.misses == 2
+
+    build_batch(4, [1], create_oracle, create_grover_diffuser, 2, backend, cache)
+    assert cache.hits == 1
+
+
+def test_builder_key_includes_partial_arguments():
+    assert builder_key(partial(create_oracle, num_ancillas=1)) != builder_key(partial(create_oracle, num_ancillas=2))
+    assert builder_key(partial(create_oracle, num_ancillas=1)) == builder_key(partial(create_oracle, num_ancillas=1))
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from qiskit import QuantumCircuit
+from qiskit.quantum_info import Statevector
+
+from grover.constraints import (
+    DigitEquals, DigitSumEquals, IsPrime, classical_solutions, compile_oracle, decode_digits,
+    digits_to_number,
+)
+
+
+def _marked_numbers(compiled, num_digits):
+    """Números que el oráculo marca con fase -1 (las ancillas deben volver a |0>)."""
+    num_search = len(compiled['search_qubits'])
+    qc = QuantumCircuit(compiled['num_qubits'])
+    qc.h(compiled['search_qubits'])
+    qc.compose(compiled['oracle'], inplace=True)
+    amplitudes = Statevector(qc).data[:2**num_search]
+    assert np.isclose(np.sum(np.abs(amplitudes)**2), 1)
+    marked = []
+    for value in np.flatnonzero(amplitudes.real < 0):
+        digits = decode_digits(format(int(value), f'0{num_search}b'), num_digits)
+        # Un nibble 10-15 no es un dígito: se cuenta como -1 para que el test falle
+        marked.append(digits_to_number(digits) if max(digits) <= 9 else -1)
+    return sorted(marked)
+
+
+@pytest.mark.parametrize('predicates', [
+    [DigitSumEquals(12)],
+    [DigitSumEquals(5), DigitEquals(0, 1)],
+    [DigitEquals(-1, 3)],
+    [DigitSumEquals(10), IsPrime()],
+])
+def test_oracle_marks_classical_solutions(predicates):
+    compiled = compile_oracle(predicates, num_digits=2)
+    assert _marked_numbers(compiled, 2) == sorted(classical_solutions(predicates, 2))
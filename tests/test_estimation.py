@@ -0,0 +1,21 @@
+import pytest
+
+from grover.builders import create_grover_diffuser, create_multi_target_oracle
+from grover.estimation import GATES_MAX_COUNTING_QUBITS, ae_circuit, grover_operator
+
+
+def _grover_operator(n=3):
+    return grover_operator(create_multi_target_oracle(n, [1, 6]), create_grover_diffuser(n))
+
+
+def test_gates_method_rejects_counting_registers_past_the_cap():
+    Q = _grover_operator()
+    with pytest.raises(ValueError):
+        ae_circuit(Q, 3, GATES_MAX_COUNTING_QUBITS + 1, method='gates')
+
+
+def test_unitary_method_grows_linearly_with_counting_qubits():
+    Q = _grover_operator()
+    t = GATES_MAX_COUNTING_QUBITS + 2
+    # Una compuerta controlada por qubit de conteo (más QFT y mediciones)
+    assert ae_circuit(Q, 3, t, method='unitary').count_ops()['unitary'] == t
@@ -0,0 +1,42 @@
+import pytest
+from qiskit import QuantumCircuit, transpile
+
+from grover.builders import create_grover_diffuser, create_multi_target_oracle
+from grover.exact import exact_analytic, exact_run
+from grover.noise import get_simulator
+
+
+def grover_circuit(n, marked, iterations):
+    oracle = create_multi_target_oracle(n, marked)
+    diffuser = create_grover_diffuser(n)
+    qc = QuantumCircuit(n, n)
+    qc.h(range(n))
+    for _ in range(iterations):
+        qc.compose(oracle, inplace=True)
+        qc.compose(diffuser, inplace=True)
+    qc.measure(range(n), range(n))
+    return qc
+
+
+@pytest.mark.parametrize('n, marked, iterations', [(4, [6], 3), (5, [1, 17, 30], 2)])
+def test_exact_run_matches_the_analytic_distribution(n, marked, iterations):
+    backend = get_simulator('ideal')
+    qc = transpile(grover_circuit(n, marked, iterations), backend)
+    tally, = exact_run(backend, [qc], n, [marked])
+    expected = exact_analytic(n, marked, iterations)
+    assert tally.shots == 0
+    assert abs(tally.target_probability() - expected.target_probability()) < 1e-9
+    assert abs(tally.probabilities - expected.probabilities).max() < 1e-9
+
+
+def test_noisy_exact_run_needs_density_matrix():
+    qc = grover_circuit(3, [5], 1)
+    backend = get_simulator('depolarizing', 'statevector')
+    with pytest.raises(ValueError):
+        exact_run(backend, [transpile(qc, backend)], 3, [[5]])
+
+    backend = get_simulator('depolarizing', 'density_matrix')
+    tally, = exact_run(backend, [transpile(qc, backend)], 3, [[5]])
+    # El ruido baja la probabilidad del objetivo pero la distribución sigue normalizada
+    assert abs(tally.probabilities.sum() - 1) < 1e-9
+    assert tally.target_probability() < exact_analytic(3, [5], 1).target_probability()
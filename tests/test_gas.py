@@ -0,0 +1,8 @@
+from GAS import grover_adaptive_search
+from grover.store import NO_CACHE_ENV
+
+
+def test_exact_search_finds_a_non_palindromic_target(monkeypatch):
+    monkeypatch.setenv(NO_CACHE_ENV, '1')
+    # 10100 al revés es 00101: un oráculo con la cadena sin invertir marca 5, no 20
+    assert grover_adaptive_search(5, '10100', exact=True) == '10100'
@@ -0,0 +1,17 @@
+import numpy as np
+import pytest
+
+from grover.analytic import evolve
+from grover.iterations import optimal_iterations, plan_iterations, success_probability
+
+
+@pytest.mark.parametrize('n, num_marked', [(3, 1), (5, 1), (6, 3), (7, 1), (8, 10)])
+def test_closed_form_matches_the_simulated_sweep(n, num_marked):
+    marked = np.arange(num_marked) * 3
+    # P(k) simulando cada k, como hacía el barrido original de main.get_iterations
+    sweep = [float(np.sum(evolve(n, marked, k)[marked] ** 2))
+             for k in range(2 * optimal_iterations(n, num_marked) + 2)]
+    plan = plan_iterations(n, num_marked)
+    assert plan['iterations'] == int(np.argmax(sweep))
+    assert plan['probability'] == pytest.approx(max(sweep), abs=1e-12)
+    assert success_probability(n, 1, num_marked) == pytest.approx(sweep[1], abs=1e-12)
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+from qiskit import QuantumCircuit
+from qiskit.quantum_info import Operator
+
+from grover.mcz import MCX_MODES, ancillas_needed, mcx, mcz_report
+
+
+@pytest.mark.parametrize('num_controls', [3, 4, 5])
+@pytest.mark.parametrize('mode', list(MCX_MODES))
+def test_mcx_modes_flip_the_target(mode, num_controls):
+    num_ancillas = ancillas_needed(mode, num_controls)
+    qc = QuantumCircuit(num_controls + 1 + num_ancillas)
+    mcx(qc, range(num_controls), num_controls, range(num_controls + 1, qc.num_qubits), mode=mode)
+
+    expected = QuantumCircuit(qc.num_qubits)
+    expected.mcx(list(range(num_controls)), num_controls)
+    if MCX_MODES[mode][1]:
+        # Con ancillas limpias solo importa la acción sobre ancillas en |0>
+        columns = np.arange(2**(num_controls + 1))
+        assert np.allclose(Operator(qc).data[:, columns], Operator(expected).data[:, columns])
+    else:
+        assert Operator(qc).equiv(Operator(expected))
+
+
+def test_report_lists_the_synthesized_ancillas():
+    rows = {row['mode']: row['ancillas'] for row in mcz_report(4, num_ancillas=2, clean=False)}
+    assert rows['v-chain-dirty'] == 0
@@ -0,0 +1,70 @@
+import pytest
+from qiskit import QuantumCircuit
+
+from grover.noise import MEMORY_LIMIT_ENV, estimate_memory, parse_memory, plan_method
+from grover.runner import run
+from grover.store import NO_CACHE_ENV
+
+
+def test_run_checks_the_memory_limit(monkeypatch):
+    monkeypatch.setenv(NO_CACHE_ENV, '1')
+    monkeypatch.setenv(MEMORY_LIMIT_ENV, '64K')
+    # 14 qubits: el statevector (256 KiB) no entra y el circuito no es casi Clifford
+    with pytest.raises(MemoryError):
+        run(14, 5)
+
+
+def _ghz_chain(n):
+    """Poco entrelazamiento: dimensión de enlace 2 en cada corte."""
+    qc = QuantumCircuit(n)
+    qc.h(0)
+    for i in range(n - 1):
+        qc.cx(i, i + 1)
+    return qc
+
+
+def _clifford_with_two_t(n):
+    """Entrelazamiento máximo en el corte del medio, pero casi Clifford."""
+    qc = QuantumCircuit(n)
+    qc.h(range(n))
+    for _ in range(3):
+        for i in range(n // 2):
+            qc.cx(i, n - 1 - i)
+        qc.h(range(n))
+    qc.t([0, 1])
+    return qc
+
+
+def test_estimate_memory_of_dense_methods():
+    estimates = estimate_memory(_ghz_chain(10))
+    assert estimates['statevector'] == 16 * 2**10
+    assert estimates['density_matrix'] == 16 * 4**10
+
+
+@pytest.mark.parametrize('limit, noisy, method', [
+    ('1G', True, 'density_matrix'),     # 16 MiB y 2^10 <= shots
+    ('8M', True, 'statevector'),        # la matriz densidad ya no entra
+    ('8M', False, 'statevector'),
+])
+def test_plan_method_under_the_memory_limit(monkeypatch, limit, noisy, method):
+    monkeypatch.setenv(MEMORY_LIMIT_ENV, limit)
+    plan = plan_method(_ghz_chain(10), noisy, shots=1024)
+    assert plan['method'] == method
+    assert plan['options']['max_memory_mb'] == parse_memory(limit) // 1024**2
+
+
+@pytest.mark.parametrize('circuit, method', [
+    (_ghz_chain(30), 'matrix_product_state'),
+    (_clifford_with_two_t(30), 'extended_stabilizer'),
+])
+def test_wide_circuits_avoid_the_statevector(monkeypatch, circuit, method):
+    # El statevector de 30 qubits ocupa 16 GiB
+    monkeypatch.setenv(MEMORY_LIMIT_ENV, '2G')
+    assert plan_method(circuit)['method'] == method
+
+
+def test_plan_method_refuses_when_nothing_fits(monkeypatch):
+    # Con ruido no hay estabilizador extendido; los demás ocupan más de 64 bytes
+    monkeypatch.setenv(MEMORY_LIMIT_ENV, '64')
+    with pytest.raises(MemoryError, match=MEMORY_LIMIT_ENV):
+        plan_method(_ghz_chain(10), noisy=True)
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from grover.sequential import SequentialSampler, confidence_radius
+
+
+def bernoulli_draw(p_target, target=5, num_bits=4, seed=0):
+    """Fuente de shots sin simulador: el objetivo sale con probabilidad p_target."""
+    rng = np.random.default_rng(seed)
+
+    def draw(aggregator, shots, look):
+        hits = rng.random(shots) < p_target
+        others = rng.choice([i for i in range(2**num_bits) if i != target], size=shots)
+        aggregator.add_shots(np.where(hits, target, others))
+    return draw
+
+
+@pytest.mark.parametrize('p_target, decision', [(0.95, True), (0.05, False)])
+def test_threshold_stops_early_on_a_clear_target(p_target, decision):
+    sampler = SequentialSampler(bernoulli_draw(p_target), 4, [5], max_shots=4096)
+    run = sampler.run(rule='threshold', threshold=0.5)
+    assert run['decision'] is decision
+    assert run['shots'] <= 128
+    # La decisión respeta la cota de Hoeffding de la última mirada
+    p = run['aggregator'].target_probability()
+    assert abs(p - 0.5) > confidence_radius(run['shots'], 0.01, run['looks'])
+
+
+def test_undecidable_target_uses_the_whole_budget():
+    sampler = SequentialSampler(bernoulli_draw(0.5), 4, [5], max_shots=512)
+    run = sampler.run(rule='threshold', threshold=0.5)
+    assert run['decision'] is None
+    assert run['shots'] == 512
+
+
+def test_top_rule_finds_the_dominant_outcome():
+    run = SequentialSampler(bernoulli_draw(0.9), 4, [5], max_shots=4096).run(rule='top')
+    assert run['decision'] == 5
+    assert run['shots'] < 4096
@@ -0,0 +1,87 @@
+import json
+import subprocess
+import sys
+
+from qiskit import QuantumCircuit, transpile
+
+from grover.aggregate import aggregate_run
+from grover.noise import get_simulator
+from grover.store import NO_CACHE_ENV, STORE_DIR_ENV, ResultStore, default_store, disable_store
+
+
+def _uniform_circuit(backend, num_qubits=3):
+    qc = QuantumCircuit(num_qubits, num_qubits)
+    qc.h(range(num_qubits))
+    qc.measure(range(num_qubits), range(num_qubits))
+    return transpile(qc, backend)
+
+
+def test_unseeded_chunks_are_not_stored(tmp_path):
+    backend = get_simulator('ideal')
+    store = ResultStore(str(tmp_path))
+    tally, = aggregate_run(backend, [_uniform_circuit(backend)], 3, shots=400, shot_batch=100, store=store)
+    assert tally.shots == 400
+    assert store.hits == store.misses == 0
+    assert store.entries() == []
+
+
+def test_seeded_chunks_are_independent_and_replayed(tmp_path):
+    backend = get_simulator('ideal')
+    store = ResultStore(str(tmp_path))
+    circuit = _uniform_circuit(backend)
+
+    first, = aggregate_run(backend, [circuit], 3, shots=400, shot_batch=100, seed=11, store=store)
+    # Una entrada por tanda (semilla seed + k): ninguna tanda repite otra
+    assert store.misses == 4 and store.hits == 0
+    assert len(store.entries()) == 4
+    assert not all(count % 4 == 0 for _, count in first.top(8))
+
+    second, = aggregate_run(backend, [circuit], 3, shots=400, shot_batch=100, seed=11, store=store)
+    assert store.hits == 4
+    assert second.counts() == first.counts()
+
+
+def test_eviction_keeps_store_under_limit(tmp_path):
+    backend = get_simulator('ideal')
+    store = ResultStore(str(tmp_path), max_bytes=600)
+    circuit = _uniform_circuit(backend)
+    for seed in range(10):
+        aggregate_run(backend, [circuit], 3, shots=64, seed=seed, store=store)
+    assert 0 < store.size() <= 600
+    # El total que se lleva en memoria coincide con el directorio
+    assert store._size == store.size()
+
+
+def test_store_is_disabled_only_by_environment(monkeypatch):
+    # setenv deja registrado el valor original: disable_store no se filtra a otros tests
+    monkeypatch.setenv(NO_CACHE_ENV, '0')
+    monkeypatch.setattr('sys.argv', ['host_program', '--no-cache'])
+    assert default_store() is not None
+    disable_store()
+    assert default_store() is None
+
+
+_RUN_IN_SUBPROCESS = """
+import json
+from grover.runner import run
+from grover.store import default_store
+run(5, 19, shots=128, seed=1)
+print(json.dumps(default_store().stats()))
+"""
+
+
+def test_store_is_shared_between_processes(tmp_path, monkeypatch):
+    # Cada proceso arma sus circuitos (nombres y uuids distintos): la clave no debe depender de eso
+    monkeypatch.setenv(STORE_DIR_ENV, str(tmp_path))
+    monkeypatch.setenv(NO_CACHE_ENV, '0')
+
+    def run_once():
+        output = subprocess.run([sys.executable, '-c', _RUN_IN_SUBPROCESS], check=True,
+                                capture_output=True, text=True).stdout
+        return json.loads(output.splitlines()[-1])
+
+    first = run_once()
+    assert first['hits'] == 0 and first['misses'] > 0
+    second = run_once()
+    assert second['misses'] == 0 and second['hits'] == first['misses']
+    assert second['bytes'] == first['bytes']
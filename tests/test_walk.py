@@ -0,0 +1,23 @@
+import pytest
+
+from grover.walk import WalkGraph, make_graph
+
+
+def test_incomplete_graph_fails_on_instantiation():
+    class NoShift(WalkGraph):
+        def coin_state(self):
+            return None
+
+        def neighbours(self):
+            return None
+
+        def prepare_coin(self, qc, coin, inverse=False):
+            pass
+
+    with pytest.raises(TypeError):
+        NoShift('incompleto', 2, 2, 1, max_steps=4)
+
+
+@pytest.mark.parametrize('kind, size', [('hypercube', 4), ('cycle', 3)])
+def test_builtin_graphs_are_complete(kind, size):
+    assert make_graph(kind, size).neighbours().shape[0] == 2**size